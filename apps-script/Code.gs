@@ -52,26 +52,30 @@ function doGet(e) {
  * 수동 실행용 함수
  */
 function sendDailyReport() {
-  const data = getSpreadsheetData();
-  const yesterday = getYesterdayString();
-
-  // 어제 수집된 공고 필터링 (09시에 발송하므로 어제 신규가 더 의미있음)
-  const newJobs = data.filter(job => {
-    const collectDateStr = String(job.collectDate || '');
-    return collectDateStr.startsWith(yesterday);
-  });
-
-  // 최근 7일 이내 등록된 공고
-  const recentJobs = getRecentJobs(data);
-
-  // 마감 임박 공고 (7일 이내)
-  const urgentJobs = getUrgentJobs(data);
-
-  // 회사별 통계
-  const stats = getCompanyStats(data);
+  // 최근 24시간 동안 처음 수집된 공고 (크롤러가 기록하는 Delta 시트 기준)
+  const delta = getDeltaJobs(24);
+
+  // 크롤러가 미리 집계한 Summary 시트 — 없으면(이전 버전 크롤러) 회사 시트 전체를 읽어 직접 집계
+  let summary = getSummary();
+  if (!summary) {
+    const data = getSpreadsheetData();
+    const urgent = getUrgentJobs(data);
+    summary = {
+      totalCount: data.length,
+      recentJobs: getRecentJobs(data),  // 최근 7일 이내 등록된 공고
+      urgentJobs: urgent,               // 마감 임박 공고 (7일 이내)
+      urgentCount: urgent.length,
+      stats: getCompanyStats(data),     // 회사별 통계
+      newJobs: delta ? null : getNewJobsByCollectDate(data)
+    };
+  }
+  const newJobs = delta ? delta.newJobs : (summary.newJobs || []);
+  const recentJobs = summary.recentJobs;
+  const urgentJobs = summary.urgentJobs;
 
   // 이메일 HTML 생성
-  const html = generateEmailHTML(newJobs, urgentJobs, stats, data.length, recentJobs);
+  const html = generateEmailHTML(newJobs, urgentJobs, summary.stats, summary.totalCount, recentJobs,
+                                 summary.urgentCount);
 
   // 이메일 발송
   const today = getTodayString();
@@ -82,7 +86,8 @@ function sendDailyReport() {
     htmlBody: html
   });
 
-  return `이메일 발송 완료: 신규 ${newJobs.length}건, 최근7일 ${recentJobs.length}건, 마감임박 ${urgentJobs.length}건`;
+  const closedCount = delta ? delta.closedJobs.length : 0;
+  return `이메일 발송 완료: 신규 ${newJobs.length}건, 마감 ${closedCount}건, 최근7일 ${recentJobs.length}건, 마감임박 ${summary.urgentCount}건`;
 }
 
 // 회사별 시트 이름
@@ -129,6 +134,114 @@ function getSpreadsheetData() {
   return data;
 }
 
+/**
+ * Delta 시트에서 최근 N시간의 신규·마감 공고 읽기
+ * 크롤러가 실행마다 신규/재게시/마감 공고만 기록하므로 회사 시트 전체를 훑지 않아도 됨
+ * 컬럼 순서: 실행일시, 구분, 회사, 직무명, 등록일, 마감일, URL, 직군, 근무지, 고용형태, 공고ID
+ * Delta 시트가 없으면 null
+ */
+function getDeltaJobs(hours) {
+  const ss = SpreadsheetApp.openById(CONFIG.SPREADSHEET_ID);
+  const sheet = ss.getSheetByName('Delta');
+  if (!sheet) return null;
+
+  const since = new Date(Date.now() - hours * 60 * 60 * 1000);
+  const newJobs = [];
+  const closedJobs = [];
+  const values = sheet.getDataRange().getValues();
+
+  // 오래된 실행부터 기록되므로 뒤에서부터 읽다가 기준 시각 이전이면 중단
+  for (let i = values.length - 1; i >= 1; i--) {
+    const row = values[i];
+    if (!row[10]) continue;  // 공고ID가 없으면 건너뛰기
+    const runAt = row[0] instanceof Date ? row[0] : new Date(String(row[0]).replace(' ', 'T'));
+    if (isNaN(runAt.getTime())) continue;
+    if (runAt < since) break;
+
+    const job = {
+      company: String(row[2] || ''),
+      title: String(row[3] || ''),
+      openDate: String(row[4] || ''),
+      closeDate: String(row[5] || ''),
+      url: String(row[6] || ''),
+      category: String(row[7] || ''),
+      location: String(row[8] || ''),
+      employmentType: String(row[9] || ''),
+      id: String(row[10] || ''),
+      collectDate: String(row[0] || '')
+    };
+    if (row[1] === '마감') {
+      closedJobs.push(job);
+    } else {
+      newJobs.push(job);  // 신규 또는 재게시
+    }
+  }
+
+  return { newJobs: newJobs.reverse(), closedJobs: closedJobs.reverse() };
+}
+
+/**
+ * Summary 시트 읽기 — 크롤러가 실행마다 전체 회사 시트를 집계해 다시 씀 (base.sync_summary)
+ * 행 구성: [집계, 항목, 값] (기준일·전체·신규·최근7일·마감임박), [그룹, 그룹명, 공고 수],
+ *          [최근7일 | 마감임박, 그룹, 회사, 직무명, 등록일, 마감일, URL, 직군, 근무지, 고용형태, 공고ID]
+ * 마감 임박 공고는 마감이 가까운 10건만 행으로 기록되고, 건수는 '마감임박' 집계 행에 있음
+ * Summary 시트가 없으면 null
+ */
+function getSummary() {
+  const ss = SpreadsheetApp.openById(CONFIG.SPREADSHEET_ID);
+  const sheet = ss.getSheetByName('Summary');
+  if (!sheet) return null;
+
+  const counts = {};
+  const stats = {};
+  const recentJobs = [];
+  const urgentJobs = [];
+  const values = sheet.getDataRange().getValues();
+
+  for (let i = 1; i < values.length; i++) {
+    const row = values[i];
+    const kind = String(row[0] || '');
+    if (kind === '집계') {
+      counts[String(row[1])] = row[2];
+    } else if (kind === '그룹') {
+      stats[String(row[1])] = Number(row[2]) || 0;
+    } else if (kind && row[10]) {
+      const job = {
+        group: String(row[1] || ''),
+        company: String(row[2] || ''),
+        title: String(row[3] || ''),
+        openDate: String(row[4] || ''),
+        closeDate: String(row[5] || ''),
+        url: String(row[6] || ''),
+        category: String(row[7] || ''),
+        location: String(row[8] || ''),
+        employmentType: String(row[9] || ''),
+        id: String(row[10] || '')
+      };
+      (kind === '마감임박' ? urgentJobs : recentJobs).push(job);
+    }
+  }
+
+  // 어느 그룹에도 속하지 않는 공고가 없으면 '기타'는 표시하지 않음
+  if (!stats['기타']) delete stats['기타'];
+
+  return {
+    totalCount: Number(counts['전체']) || 0,
+    recentJobs: recentJobs,
+    urgentJobs: urgentJobs,
+    urgentCount: Number(counts['마감임박']) || urgentJobs.length,
+    stats: stats
+  };
+}
+
+/**
+ * 수집일시가 어제인 공고 (Delta 시트가 없을 때의 대체 방식)
+ */
+function getNewJobsByCollectDate(data) {
+  const yesterday = getYesterdayString();
+  return data.filter(job => String(job.collectDate || '').startsWith(yesterday));
+}
+
 /**
  * 오늘 날짜 문자열 (YYYY-MM-DD)
  */
@@ -240,8 +353,9 @@ function getCompanyGroup(company) {
 /**
  * 이메일 HTML 생성
  */
-function generateEmailHTML(newJobs, urgentJobs, stats, totalCount, recentJobs) {
+function generateEmailHTML(newJobs, urgentJobs, stats, totalCount, recentJobs, urgentCount) {
   const today = getTodayString();
+  if (urgentCount === undefined) urgentCount = urgentJobs.length;
 
   // 신규 공고를 회사 그룹별로 정리
   const newJobsByGroup = {};
@@ -254,7 +368,7 @@ function generateEmailHTML(newJobs, urgentJobs, stats, totalCount, recentJobs) {
   // 최근 7일 공고를 회사 그룹별로 정리
   const recentJobsByGroup = {};
   for (const job of (recentJobs || [])) {
-    const group = getCompanyGroup(job.company);
+    const group = job.group || getCompanyGroup(job.company);
     if (!recentJobsByGroup[group]) recentJobsByGroup[group] = [];
     recentJobsByGroup[group].push(job);
   }
@@ -284,14 +398,14 @@ function generateEmailHTML(newJobs, urgentJobs, stats, totalCount, recentJobs) {
         </div>
         <div style="flex: 1; border-left: 1px solid #eee;">
           <div style="font-size: 32px; font-weight: 700; color: #10b981;">${newJobs.length}</div>
-          <div style="font-size: 12px; color: #888; margin-top: 4px;">어제 신규</div>
+          <div style="font-size: 12px; color: #888; margin-top: 4px;">신규 (24시간)</div>
         </div>
         <div style="flex: 1; border-left: 1px solid #eee;">
           <div style="font-size: 32px; font-weight: 700; color: #3b82f6;">${(recentJobs || []).length}</div>
           <div style="font-size: 12px; color: #888; margin-top: 4px;">최근 7일</div>
         </div>
         <div style="flex: 1; border-left: 1px solid #eee;">
-          <div style="font-size: 32px; font-weight: 700; color: #f59e0b;">${urgentJobs.length}</div>
+          <div style="font-size: 32px; font-weight: 700; color: #f59e0b;">${urgentCount}</div>
           <div style="font-size: 12px; color: #888; margin-top: 4px;">마감 임박</div>
         </div>
       </div>
@@ -330,10 +444,10 @@ function generateEmailHTML(newJobs, urgentJobs, stats, totalCount, recentJobs) {
     </div>
     ` : ''}
 
-    <!-- 어제 신규 공고 -->
+    <!-- 신규 공고 (최근 24시간) -->
     ${newJobs.length > 0 ? `
     <div style="background: white; padding: 24px; border-bottom: 1px solid #eee;">
-      <h2 style="margin: 0 0 16px 0; font-size: 16px; color: #333;">🆕 어제 신규 공고</h2>
+      <h2 style="margin: 0 0 16px 0; font-size: 16px; color: #333;">🆕 신규 공고 (최근 24시간)</h2>
       ${Object.entries(newJobsByGroup).map(([group, jobs]) => `
         <div style="margin-bottom: 20px;">
           <h3 style="font-size: 14px; color: #667eea; margin: 0 0 12px 0; padding-bottom: 8px; border-bottom: 2px solid #667eea;">${group} (${jobs.length}건)</h3>
@@ -350,7 +464,7 @@ function generateEmailHTML(newJobs, urgentJobs, stats, totalCount, recentJobs) {
     </div>
     ` : `
     <div style="background: white; padding: 24px; border-bottom: 1px solid #eee; text-align: center;">
-      <p style="color: #888; margin: 0;">어제 신규 공고가 없습니다.</p>
+      <p style="color: #888; margin: 0;">최근 24시간 동안 신규 공고가 없습니다.</p>
     </div>
     `}
 
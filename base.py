@@ -2,20 +2,57 @@
 """Common module for job crawlers — Google Sheets integration and orchestration.
 
 Provides shared infrastructure for all company-specific crawlers:
-- Google Sheets authentication via service account
-- Sheet lifecycle management (create, header setup, archiving)
-- Date format normalization (ISO 8601, compact YYYYMMDD)
-- Crawler orchestration with full-replace write strategy
+- Google Sheets authentication via service account (one client per process; the
+  access token and tab metadata are cached across runs, see sheets_auth)
+- Local SQLite job store as the source of truth (job_store); company tabs and
+  Archive are written as its projection via batched I/O (sheets_io)
+- Pooled HTTP sessions with keep-alive and jittered retry/backoff
+- On-disk conditional HTTP cache (ETag / Last-Modified) and unchanged-source skipping
+- Concurrent pagination with in-order reassembly and de-duplication
+- Declarative sources (SourceSpec → Source): a company's API, pagination and
+  field mapping as data, compiled once into fetch / filter / job_to_row, with
+  optional per-posting detail requests for missing fields, cached by job ID
+- Streaming pipeline (JobStream): pages are filtered, converted and stored as they arrive;
+  large single-response listings are parsed incrementally, job by job (json_stream)
+- Compact row record (JobRow) with one collect timestamp per run, and memoized
+  date normalization (ISO 8601, compact YYYYMMDD)
+- Crawler orchestration (run_crawler = fetch + sync_jobs) with diff-based or full-replace writes,
+  or store-only offline runs
+- Pluggable output sinks (sinks): Google Sheets (SheetsSink, default; the
+  Google client libraries are imported only when it is used) or local JSONL /
+  CSV / Parquet files, and dry runs against a throwaway copy of the store
+- Run instrumentation (metrics): per-company stage timings, HTTP statistics per
+  host and Sheets API counts, written as a JSON / Prometheus report
 """
 
+import atexit
+import hashlib
 import json
+import math
 import os
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Callable
+import re
+import shutil
+import tempfile
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple
+from urllib.parse import urlparse
 
-import gspread
-from google.oauth2.service_account import Credentials
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from job_store import JobStore, JobSummary, RunDelta, chunked
+from json_stream import READ_CHUNK_BYTES, JsonArrayStream
+from metrics import METRICS, METRICS_PATH
+from sheets_io import SCHEDULER, SheetIO, forget_metadata, use_metadata_cache
+from sinks import LOCAL_SINKS, OUTPUT_DIR, CsvSink, Sink
 
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
@@ -27,6 +64,81 @@ SCOPES = [
 HEADER = ["회사", "직무명", "등록일", "마감일", "URL", "직군", "근무지", "고용형태", "공고ID", "수집일시"]
 
 
+class JobRow(NamedTuple):
+    """One posting as a sheet row — fields in HEADER order.
+
+    A NamedTuple has no per-instance __dict__ (__slots__ = ()), so it is
+    smaller than the equivalent 10-element list, and it indexes, slices and
+    JSON-encodes like one, so the store and SheetIO accept it unchanged.
+    """
+
+    company: str          # 회사
+    title: str            # 직무명
+    reg_date: str         # 등록일
+    end_date: str         # 마감일
+    url: str              # URL
+    category: str         # 직군
+    location: str         # 근무지
+    employment_type: str  # 고용형태
+    job_id: str           # 공고ID
+    collected_at: str     # 수집일시 (see run_timestamp)
+
+
+ARCHIVE_SHEET = "Archive"
+
+# How closed postings are split over archive tabs (see archive_title):
+# "month" — by 수집일시 month ("Archive 2025-01"), "company" — by 회사 ("Archive 카카오"),
+# "none" — one "Archive" tab
+ARCHIVE_PARTITION = os.environ.get("ARCHIVE_PARTITION", "month")
+
+# Per-run new / reopened / closed postings of every company, for the newsletter (see JobStore.plan_delta)
+DELTA_SHEET = "Delta"
+DELTA_HEADER = ["실행일시", "구분"] + HEADER[:9]
+DELTA_LABELS = {"new": "신규", "reopened": "재게시", "closed": "마감"}
+DELTA_RETENTION_DAYS = 7
+
+# Newsletter aggregates over every company tab of a spreadsheet, rewritten after each run (see sync_summary).
+# Rows: [집계, 항목, 값] counts, [그룹, 그룹, 공고 수] per COMPANY_GROUPS, then the recent and
+# closing-soon postings as [구분, 그룹, columns A–I]
+SUMMARY_SHEET = "Summary"
+SUMMARY_HEADER = ["구분", "그룹"] + HEADER[:9]
+SUMMARY_DAYS = 7         # 최근 등록 / 마감 임박 기준 (일)
+SUMMARY_URGENT_ROWS = 10  # 마감 임박 공고는 건수 전체, 행은 마감이 가까운 순으로 이만큼만
+# 회사 그룹 — 회사명에 포함된 이름으로 분류 (apps-script/Code.gs의 COMPANY_GROUPS와 같게 유지)
+COMPANY_GROUPS = {
+    "카카오": ["카카오", "카카오페이", "카카오 게임즈", "카카오헬스케어", "카카오엔터프라이즈", "AXZ"],
+    "토스": ["토스", "토스플레이스", "토스인슈어런스", "토스뱅크", "토스페이먼츠", "토스씨엑스"],
+    "네이버": ["NAVER", "NAVER WEBTOON", "NAVER FINANCIAL", "NAVER Cloud"],
+    "쿠팡": ["쿠팡"],
+    "당근": ["당근", "당근마켓", "당근페이"],
+    "배민": ["우아한형제들"],
+}
+
+# Local state kept between runs (HTTP cache, fetch fingerprints, job store).
+# The GitHub workflow persists this directory with actions/cache.
+CACHE_DIR = Path(os.environ.get("CRAWLER_CACHE_DIR", ".cache"))
+
+# Process-wide JobStore (see get_job_store)
+_store: JobStore | None = None
+
+# 수집일시 shared by every row of the current run (see start_run / run_timestamp)
+_run_timestamp: str | None = None
+
+# Distinct date strings remembered by the date formatters; postings share few dates
+DATE_CACHE_SIZE = 4096
+
+# Max concurrent page requests per paginated source (see fetch_paginated)
+PAGE_WORKERS = 4
+
+# Rows per block when streaming planned writes from the store to SheetIO
+WRITE_CHUNK_ROWS = 1000
+
+# HTTP retry policy for idempotent requests (see create_session)
+HTTP_RETRIES = 3
+HTTP_BACKOFF = 0.5  # seconds; doubles per attempt, plus up to the same amount of jitter
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
 @dataclass
 class CrawlerConfig:
     """Per-company crawler settings passed to run_crawler().
@@ -44,97 +156,381 @@ class CrawlerConfig:
     job_id_field: str
 
 
-def get_google_spreadsheet(spreadsheet_env_var: str):
-    """Authenticate with Google via service account and return a Spreadsheet object.
+# Process-wide gspread Client (or a stand-in such as fake_sheets.FakeClient)
+_client = None
+
+
+def use_google_client(client) -> None:
+    """Install *client* as the process-wide Sheets client, e.g. a fake for offline runs."""
+    global _client
+    _client = client
+    _spreadsheets.clear()
+    use_metadata_cache(None)  # metadata is kept across runs only for the authenticated client
+    forget_metadata()
 
-    Reads GOOGLE_CREDENTIALS (JSON key) and the spreadsheet ID from environment
-    variables. Raises ValueError if either is missing.
+
+def get_google_client():
+    """Authenticate with Google via service account and return a gspread Client.
+
+    Cached for the lifetime of the process so that running several crawlers
+    in one interpreter (see run_all.py) authenticates only once; the access
+    token itself is kept in CACHE_DIR/google-token.json and reused by later
+    runs until it expires (sheets_auth; not on GitHub Actions, whose cache
+    other workflow runs can read), and tab metadata in
+    CACHE_DIR/sheets-metadata.json (sheets_io.use_metadata_cache).
+    Raises ValueError if GOOGLE_CREDENTIALS is missing.
     """
-    creds_json = os.environ.get("GOOGLE_CREDENTIALS")
-    spreadsheet_id = os.environ.get(spreadsheet_env_var)
+    global _client
+    if _client is not None:
+        return _client
 
+    creds_json = os.environ.get("GOOGLE_CREDENTIALS")
     if not creds_json:
         raise ValueError("GOOGLE_CREDENTIALS 환경변수가 설정되지 않았습니다.")
+
+    # The Google stack (~0.2s to import) is loaded only here, when a Sheets sink first needs it
+    from sheets_auth import authorize
+
+    # Actions 캐시는 다른 워크플로 실행(PR 포함)도 읽을 수 있으므로 토큰을 디스크에 두지 않음
+    token_path = None if os.environ.get("GITHUB_ACTIONS") else CACHE_DIR / "google-token.json"
+    _client = authorize(creds_json, SCOPES, token_path)
+    use_metadata_cache(CACHE_DIR / "sheets-metadata.json")
+    return _client
+
+
+# spreadsheet ID → opened Spreadsheet (a handle; tab metadata is cached by sheets_io)
+_spreadsheets: dict = {}
+
+
+def get_google_spreadsheet(spreadsheet_env_var: str):
+    """Return the Spreadsheet whose ID is stored in *spreadsheet_env_var*.
+
+    Uses the shared client from get_google_client() and opens each spreadsheet
+    only once per process — several companies may point at the same ID.
+    Raises ValueError if GOOGLE_CREDENTIALS or the spreadsheet ID is missing.
+    """
+    spreadsheet_id = os.environ.get(spreadsheet_env_var)
     if not spreadsheet_id:
         raise ValueError(f"{spreadsheet_env_var} 환경변수가 설정되지 않았습니다.")
 
-    creds_data = json.loads(creds_json)
-    credentials = Credentials.from_service_account_info(creds_data, scopes=SCOPES)
-    client = gspread.authorize(credentials)
+    if spreadsheet_id not in _spreadsheets:
+        _spreadsheets[spreadsheet_id] = SCHEDULER.call(get_google_client().open_by_key, spreadsheet_id)
+    return _spreadsheets[spreadsheet_id]
 
-    return client.open_by_key(spreadsheet_id)
 
+def archive_title(row: list[str]) -> str:
+    """Archive tab for a row (columns A–J), per ARCHIVE_PARTITION.
 
-def get_or_create_sheet(spreadsheet, sheet_name: str):
-    """Return the named worksheet, creating it with the standard header if absent."""
-    try:
-        return spreadsheet.worksheet(sheet_name)
-    except gspread.WorksheetNotFound:
-        sheet = spreadsheet.add_worksheet(title=sheet_name, rows=1000, cols=10)
-        sheet.update("A1:J1", [HEADER])
-        print(f"{sheet_name} 시트 생성 완료")
-        return sheet
+    The tab depends only on the row, so a posting that is archived again
+    (or re-read by compact_archive) maps to the same tab. Rows lacking the
+    partition value go to the plain "Archive" tab.
+    """
+    if ARCHIVE_PARTITION == "month":
+        month = row[9][:7]
+        return f"{ARCHIVE_SHEET} {month}" if re.fullmatch(r"\d{4}-\d{2}", month) else ARCHIVE_SHEET
+    if ARCHIVE_PARTITION == "company":
+        return f"{ARCHIVE_SHEET} {row[0]}" if row[0] else ARCHIVE_SHEET
+    if ARCHIVE_PARTITION == "none":
+        return ARCHIVE_SHEET
+    raise ValueError(f"Unknown ARCHIVE_PARTITION: {ARCHIVE_PARTITION}")
+
+
+def is_archive_title(title: str) -> bool:
+    """Whether *title* is the plain Archive tab or one of its partitions."""
+    return title == ARCHIVE_SHEET or title.startswith(ARCHIVE_SHEET + " ")
+
+
+class ResponseCache:
+    """On-disk store of GET response bodies and their validators, keyed by full URL.
 
+    For each cached URL, `<key>.json` holds the ETag / Last-Modified validators
+    and a SHA-256 of the body, and `<key>.body` holds the raw bytes. Only
+    responses that carry at least one validator are stored, since nothing else
+    can be revalidated.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def load(self, url: str) -> tuple[dict, bytes] | None:
+        """Return (metadata, body) for *url*, or None if absent or unreadable."""
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text())
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if hashlib.sha256(body).hexdigest() != meta.get("sha256"):
+            return None  # 손상된 캐시
+        return meta, body
+
+    def store(self, url: str, response: requests.Response) -> None:
+        meta = self._validators(url, response)
+        if meta is None:
+            return
+        meta["sha256"] = hashlib.sha256(response.content).hexdigest()
+        meta_path, body_path = self._paths(url)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to temp files then rename, so a crash never leaves a half-written entry
+        for path, data in ((body_path, response.content), (meta_path, json.dumps(meta).encode())):
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+
+    def tee(self, url: str, response: requests.Response, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Yield the body *chunks* of a streamed 200 *response* while storing them.
 
-def get_or_create_archive_sheet(spreadsheet):
-    """Return the 'Archive' worksheet, creating it if needed."""
-    return get_or_create_sheet(spreadsheet, "Archive")
+        The entry is only committed once the body has been read to the end,
+        so an abandoned read leaves the previous entry in place.
+        """
+        meta = self._validators(url, response)
+        if meta is None:
+            yield from chunks
+            return
+        meta_path, body_path = self._paths(url)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        body_tmp = body_path.with_suffix(body_path.suffix + ".tmp")
+        digest = hashlib.sha256()
+        with open(body_tmp, "wb") as file:
+            for chunk in chunks:
+                file.write(chunk)
+                digest.update(chunk)
+                yield chunk
+        meta["sha256"] = digest.hexdigest()
+        meta_tmp = meta_path.with_suffix(meta_path.suffix + ".tmp")
+        meta_tmp.write_bytes(json.dumps(meta).encode())
+        os.replace(body_tmp, body_path)
+        os.replace(meta_tmp, meta_path)
 
+    @staticmethod
+    def _validators(url: str, response: requests.Response) -> dict | None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return None
+        return {"url": url, "etag": etag, "last_modified": last_modified}
 
-def archive_closed_jobs(spreadsheet, sheet, active_job_ids: set[str]) -> int:
-    """Move jobs no longer present in the API response to the Archive sheet.
 
-    Compares the current sheet rows against active_job_ids (from the latest crawl).
-    Rows whose 공고ID (column I, index 8) is not in active_job_ids are appended to Archive.
-    This preserves a historical record of closed/removed postings.
+class MeteredSession(requests.Session):
+    """Session that records every request in METRICS, by host.
 
-    Returns the number of rows archived.
+    Latency is measured around the whole send, urllib3 retries included;
+    for a streamed response it ends when the headers arrived, and its body
+    bytes are added as iter_body() reads them.
     """
-    archive = get_or_create_archive_sheet(spreadsheet)
 
-    all_rows = sheet.get_all_values()
-    if len(all_rows) <= 1:  # Only header or empty
-        return 0
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).netloc
+        started = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        except requests.RequestException:
+            METRICS.http(host, time.perf_counter() - started)
+            raise
+        retries = getattr(getattr(response.raw, "retries", None), "history", ())
+        body_bytes = 0 if kwargs.get("stream") else len(response.content)
+        METRICS.http(host, time.perf_counter() - started, response.status_code, len(retries), body_bytes)
+        return response
 
-    data_rows = all_rows[1:]  # Skip header row
-    rows_to_archive = [
-        row for row in data_rows
-        # row[8] = 공고ID (column I); skip short/empty rows
-        if row and len(row) > 8 and row[8] and row[8] not in active_job_ids
-    ]
 
-    if not rows_to_archive:
-        return 0
+class CachingSession(MeteredSession):
+    """Session that revalidates GETs against a ResponseCache.
+
+    Sends If-None-Match / If-Modified-Since for URLs seen before. A 304 reply
+    is turned back into a 200 carrying the cached body, so callers use
+    response.json() unchanged; such responses have `from_cache = True`.
+
+    With stream=True, a 200 body is not read here; the response carries the
+    cache as `cache` instead, and iter_body() stores it as it is read.
+    """
+
+    def __init__(self, cache: ResponseCache):
+        super().__init__()
+        self.cache = cache
 
-    archive.append_rows(rows_to_archive, value_input_option="USER_ENTERED")
-    return len(rows_to_archive)
+    def send(self, request, **kwargs):
+        if request.method != "GET":
+            return super().send(request, **kwargs)
 
+        cached = self.cache.load(request.url)
+        if cached:
+            meta, body = cached
+            if meta.get("etag"):
+                request.headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request.headers["If-Modified-Since"] = meta["last_modified"]
 
-def setup_header(sheet) -> None:
-    """Ensure the header row is correct. Idempotent — safe to call repeatedly."""
-    existing = sheet.row_values(1)
-    if not existing or existing != HEADER:
-        sheet.update("A1:J1", [HEADER])
-        print("헤더 설정 완료")
+        response = super().send(request, **kwargs)
+        response.from_cache = False
 
+        if response.status_code == 304 and cached:
+            response.content  # 304 본문(비어 있음)을 읽어 stream 모드에서도 연결을 반납
+            response.status_code = 200
+            response.reason = "Not Modified (cached)"
+            response._content = cached[1]
+            response.encoding = None
+            response.from_cache = True
+        elif response.status_code == 200:
+            if kwargs.get("stream"):
+                response.cache = self.cache
+            else:
+                self.cache.store(request.url, response)
+        return response
 
-def get_existing_ids(sheet) -> set[str]:
-    """Return the set of job IDs currently in the sheet (column I, excluding header).
 
-    Returns an empty set on API errors (e.g. empty sheet edge cases).
+def iter_body(response: requests.Response, chunk_size: int = READ_CHUNK_BYTES) -> Iterator[bytes]:
+    """Yield a response body in chunks, storing it in the response cache if the session deferred that.
+
+    For responses requested with stream=True, the body is read from the
+    socket as it is consumed (and counted in METRICS); a cached (304) body is
+    replayed from memory.
     """
-    try:
-        ids = sheet.col_values(9)[1:]  # Column I = 공고ID
-        return set(ids)
-    except gspread.exceptions.APIError:
-        return set()
+    chunks = response.iter_content(chunk_size)
+    if not getattr(response, "from_cache", False):
+        chunks = _metered_body(chunks, urlparse(response.url).netloc)
+    cache = getattr(response, "cache", None)
+    return cache.tee(response.url, response, chunks) if cache else chunks
+
+
+def _metered_body(chunks: Iterator[bytes], host: str) -> Iterator[bytes]:
+    for chunk in chunks:
+        METRICS.http_bytes(host, len(chunk))
+        yield chunk
+
+
+def create_session(
+    headers: dict[str, str] | None = None,
+    pool_maxsize: int = PAGE_WORKERS,
+    cache: bool = True,
+) -> requests.Session:
+    """Return a requests Session with per-host connection pooling and retries.
+
+    Each crawler module keeps one session for its lifetime, so TCP/TLS
+    connections are reused across pages and runs (HTTP keep-alive). GET/HEAD
+    requests are retried on connection errors, read timeouts and
+    HTTP_RETRY_STATUSES with jittered exponential backoff, honoring
+    Retry-After on 429/503. When retries are exhausted the last response is
+    returned, so callers' raise_for_status() still reports the failure.
+
+    Args:
+        headers: Default headers sent with every request (e.g. a User-Agent
+            for APIs that reject the requests default).
+        pool_maxsize: Connections kept open per host; matches the paginator's
+            concurrency so parallel page requests never wait for a socket.
+        cache: Revalidate GETs against the on-disk ResponseCache under
+            CACHE_DIR, so unchanged payloads are not downloaded again.
+
+    Either way, every request is recorded in METRICS (MeteredSession).
+    """
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        backoff_jitter=HTTP_BACKOFF,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_maxsize=pool_maxsize)
+
+    session = CachingSession(ResponseCache(CACHE_DIR / "http")) if cache else MeteredSession()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def dedupe_jobs(jobs: Iterable[dict], id_field: str) -> Iterator[dict]:
+    """Drop repeated postings, keeping the first occurrence of each ID.
+
+    Listings can shift between page requests while a crawl is in progress
+    (a posting is added or removed upstream), so the same job may appear on
+    two consecutive pages. Jobs without an ID are kept as-is.
+    """
+    seen = set()
+    for job in jobs:
+        job_id = job.get(id_field)
+        if job_id:
+            if str(job_id) in seen:
+                continue
+            seen.add(str(job_id))
+        yield job
+
+
+def fetch_paginated(
+    fetch_page: Callable[[int], dict],
+    extract_jobs: Callable[[dict], list[dict]],
+    page_count: Callable[[dict], int],
+    id_field: str,
+    max_workers: int = PAGE_WORKERS,
+) -> Iterator[dict]:
+    """Yield every job of a paginated listing, pages 2..N fetched concurrently.
+
+    The first page is fetched alone because it tells us the total page count;
+    after that the remaining pages are requested in parallel, with at most
+    *max_workers* pages in flight or waiting to be consumed, and their jobs
+    are yielded in page order after de-duplication. Memory therefore grows
+    with the page size, not with the total number of postings.
+
+    Args:
+        fetch_page: Fetches and returns the decoded response for a 0-based page index.
+            Callers translate the index to their own scheme (1-based page, absolute offset).
+        extract_jobs: Returns the job list contained in a page response.
+        page_count: Returns the total number of pages, given the first page response.
+        id_field: Job ID key used to de-duplicate postings that shifted between pages.
+        max_workers: Max concurrent page requests.
+    """
+    def pages() -> Iterator[dict]:
+        first_page = fetch_page(0)
+        total_pages = page_count(first_page)
+        yield first_page
+        if total_pages <= 1:
+            return
+        indexes = iter(range(1, total_pages))
+        with ThreadPoolExecutor(max_workers=min(max_workers, total_pages - 1)) as pool:
+            pending = deque(pool.submit(fetch_page, index) for index in islice(indexes, max_workers))
+            while pending:
+                page = pending.popleft().result()
+                for index in islice(indexes, 1):
+                    pending.append(pool.submit(fetch_page, index))
+                yield page
+
+    return dedupe_jobs((job for page in pages() for job in extract_jobs(page)), id_field)
+
+
+def offset_page_count(total_size: int, page_size: int) -> int:
+    """Number of pages for an offset-based API (at least 1, so the first page always counts)."""
+    return max(1, math.ceil(total_size / page_size))
+
+
+def start_run(at: datetime | None = None) -> str:
+    """Stamp the collect time (수집일시) for the rows of a new run and return it."""
+    global _run_timestamp
+    _run_timestamp = (at or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+    return _run_timestamp
+
+
+def run_timestamp() -> str:
+    """Return the current run's collect time, stamping it on first use.
+
+    Every job_to_row of a run shares this one string instead of formatting
+    datetime.now() per row.
+    """
+    return _run_timestamp or start_run()
 
 
+@lru_cache(maxsize=DATE_CACHE_SIZE)
 def format_date_iso(date_str: str | None, default: str = "") -> str:
     """Parse an ISO 8601 datetime string and return YYYY-MM-DD.
 
     Handles the 'Z' suffix (UTC) by converting to '+00:00' for fromisoformat().
     Returns *default* if date_str is falsy, or the original string on parse failure.
+    Memoized: postings of one source share a handful of open/close dates.
     """
     if not date_str:
         return default
@@ -145,11 +541,12 @@ def format_date_iso(date_str: str | None, default: str = "") -> str:
         return date_str
 
 
+@lru_cache(maxsize=DATE_CACHE_SIZE)
 def format_date_compact(date_str: str | None, fmt: str = "%Y%m%d", default: str = "상시채용") -> str:
     """Parse a compact date string (e.g. '20250115') via strptime and return YYYY-MM-DD.
 
     Used by Naver which returns dates in YYYYMMDD format.
-    Returns *default* (상시채용) if date_str is falsy.
+    Returns *default* (상시채용) if date_str is falsy. Memoized like format_date_iso.
     """
     if not date_str:
         return default
@@ -160,65 +557,1288 @@ def format_date_compact(date_str: str | None, fmt: str = "%Y%m%d", default: str
         return date_str
 
 
+# ---------------------------------------------------------------------------
+# Declarative sources — a company's list API as data (SourceSpec), compiled
+# once into the fetch / filter / job_to_row callables (Source)
+# ---------------------------------------------------------------------------
+
+# A JobRow field's value: a dotted JSON path into the job, or a compiled getter (see field helpers)
+FieldSpec = str | Callable[[dict], str]
+
+
+def compile_path(path: str) -> Callable[[dict], object]:
+    """Compile a dotted JSON path ("result.data.nodes", "departments.0.name") into a getter.
+
+    Numeric components index into lists. A missing key, index or null on the
+    way yields None.
+    """
+    keys = tuple(int(key) if key.isdigit() else key for key in path.split(".")) if path else ()
+    if len(keys) == 1 and isinstance(keys[0], str):
+        key = keys[0]
+        return lambda data: data.get(key) if isinstance(data, dict) else None
+
+    def get(data):
+        for key in keys:
+            if isinstance(data, dict):
+                data = data.get(key)
+            elif isinstance(data, list) and isinstance(key, int) and key < len(data):
+                data = data[key]
+            else:
+                return None
+        return data
+
+    return get
+
+
+def text(path: str, default: str = "") -> Callable[[dict], str]:
+    """Value at *path* as a string; *default* if missing or null."""
+    if "." not in path:
+        # Top-level key (most fields): one dict lookup, no path walk
+        def value(job: dict) -> str:
+            found = job.get(path)
+            if found is None:
+                return default
+            return found if found.__class__ is str else str(found)
+
+        return value
+
+    get = compile_path(path)
+
+    def value(job: dict) -> str:
+        found = get(job)
+        if found is None:
+            return default
+        return found if found.__class__ is str else str(found)
+
+    return value
+
+
+def const(value: str) -> Callable[[dict], str]:
+    """A fixed value, for fields the source does not provide (e.g. 회사 for a single-company board)."""
+    return lambda job: value
+
+
+def first_of(*paths: str) -> Callable[[dict], str]:
+    """The first non-empty value among *paths* (e.g. a field with a fallback)."""
+    getters = [text(path) for path in paths]
+
+    def value(job: dict) -> str:
+        for get in getters:
+            found = get(job)
+            if found:
+                return found
+        return ""
+
+    return value
+
+
+def mapped(path: str, mapping: dict[str, str]) -> Callable[[dict], str]:
+    """Value at *path* translated through *mapping*; unmapped values pass through."""
+    get = text(path)
+
+    def value(job: dict) -> str:
+        found = get(job)
+        return mapping.get(found, found)
+
+    return value
+
+
+def template(fmt: str, path: str) -> Callable[[dict], str]:
+    """*fmt* with "{}" replaced by the value at *path* (e.g. a detail URL); "" if that value is empty."""
+    get = text(path)
+
+    def value(job: dict) -> str:
+        found = get(job)
+        return fmt.format(found) if found else ""
+
+    return value
+
+
+def iso_date(path: str, default: str = "") -> Callable[[dict], str]:
+    """ISO 8601 datetime at *path* as YYYY-MM-DD (memoized, see format_date_iso)."""
+    get = compile_path(path)
+    return lambda job: format_date_iso(get(job), default)  # positional: cheaper lru_cache key
+
+
+def compact_date(path: str, default: str = "상시채용") -> Callable[[dict], str]:
+    """YYYYMMDD date at *path* as YYYY-MM-DD (memoized, see format_date_compact)."""
+    get = compile_path(path)
+    return lambda job: format_date_compact(get(job), "%Y%m%d", default)
+
+
+@dataclass(frozen=True)
+class Condition:
+    """One filter condition of a SourceSpec; build with equals / one_of / contains / server_param.
+
+    A condition with *param* is pushed down: it is sent as a query parameter
+    and the API does the filtering. Otherwise it is checked client-side on the
+    value read from *path*; all client-side conditions of a source are
+    compiled into one predicate (see compile_filter).
+
+    Attributes:
+        label: Describes the condition in the log.
+        path: Dotted path or field getter for the client-side check; None
+            for a server-only condition.
+        op: "equals", "one_of" or "contains" (any of *values* is a substring).
+        values: The compared value(s).
+        param: (query parameter, value) that applies the condition server-side.
+    """
+
+    label: str
+    path: FieldSpec | None = None
+    op: str = "equals"
+    values: tuple[str, ...] = ()
+    param: tuple[str, str] | None = None
+
+
+def equals(path: FieldSpec, value: str, param: tuple[str, str] | None = None, label: str = "") -> Condition:
+    """Keep jobs whose value at *path* is *value*; pushed down as *param* when given."""
+    return Condition(label or value, path, "equals", (value,), param)
+
+
+def one_of(path: FieldSpec, values: Iterable[str], param: tuple[str, str] | None = None,
+           label: str = "") -> Condition:
+    """Keep jobs whose value at *path* is one of *values*."""
+    values = tuple(sorted(values))
+    return Condition(label or "/".join(values), path, "one_of", values, param)
+
+
+def contains(path: FieldSpec, *keywords: str, label: str = "") -> Condition:
+    """Keep jobs whose value at *path* contains any of *keywords*."""
+    return Condition(label or "/".join(f"'{keyword}'" for keyword in keywords), path, "contains", keywords)
+
+
+def server_param(name: str, value: str, label: str) -> Condition:
+    """A filter the API applies from query parameter *name* (e.g. a job-group code)."""
+    return Condition(label, None, "equals", (value,), (name, value))
+
+
+def _condition_reader(path: FieldSpec | None) -> Callable[[dict], object]:
+    """Getter for a condition's value: the raw JSON value at a plain key path, else a field getter.
+
+    Plain dict keys ("title", "location.name") are compared as decoded from
+    JSON; callables and list-index paths go through the field helpers.
+    """
+    if isinstance(path, str) and path and not any(key.isdigit() for key in path.split(".")):
+        return compile_path(path)
+    return _compile_field(path)
+
+
+def _compile_condition(condition: Condition) -> Callable[[dict], bool]:
+    """Predicate for one client-side *condition*."""
+    read = _condition_reader(condition.path)
+    if condition.op == "equals":
+        value = condition.values[0]
+        return lambda job: read(job) == value
+    if condition.op == "one_of":
+        values = frozenset(condition.values)
+        return lambda job: read(job) in values
+    if condition.op == "contains" and len(condition.values) == 1:
+        keyword = condition.values[0]
+        return lambda job: keyword in (read(job) or "")
+    if condition.op == "contains":
+        # Longest first, so the alternation scans the value once however many keywords there are
+        keywords = sorted(condition.values, key=len, reverse=True)
+        search = re.compile("|".join(map(re.escape, keywords))).search
+        return lambda job: search(read(job) or "") is not None
+    raise ValueError(f"Unknown filter op: {condition.op}")
+
+
+def compile_filter(conditions: Iterable[Condition]) -> Callable[[dict], bool] | None:
+    """Compile client-side *conditions* into one predicate over a raw job (None if there are none).
+
+    Each condition becomes a closure over its reader and compared value (see
+    _compile_condition); the predicate checks them in order and stops at the
+    first that fails. A single condition is returned as is.
+
+    The predicate sees decoded jobs: even with SourceSpec.stream, each
+    element is built as a dict by JsonArrayStream before it is checked.
+    """
+    tests = tuple(_compile_condition(condition) for condition in conditions)
+    if not tests:
+        return None
+    if len(tests) == 1:
+        return tests[0]
+
+    def keep(job: dict) -> bool:
+        for test in tests:
+            if not test(job):
+                return False
+        return True
+
+    return keep
+
+
+@dataclass
+class Profile:
+    """An extra output of a SourceSpec: another sheet target with its own filters.
+
+    Profiles share the source's single fetch; each fetched job is checked
+    against every profile's filters and written to each profile that keeps it.
+
+    Attributes:
+        sheet_name: Tab written by this profile. It is also the profile's key
+            in the local job store, so it must be unique across all sources.
+        filters: Conditions for this profile's jobs (not inherited from the spec).
+        spreadsheet_env_var: Environment variable holding the target spreadsheet
+            ID; defaults to the source's.
+    """
+
+    sheet_name: str
+    filters: tuple[Condition, ...] = ()
+    spreadsheet_env_var: str = ""
+
+
+@dataclass
+class Output:
+    """One compiled sheet target of a source: where its jobs go and which jobs it keeps.
+
+    Attributes:
+        config: Sheet target (and log name) for sync_rows().
+        keep: Compiled filter predicate over a raw job; None keeps every job.
+        label: Describes the filter in the log.
+    """
+
+    config: CrawlerConfig
+    keep: Callable[[dict], bool] | None = None
+    label: str = ""
+
+    def filter_jobs(self, jobs: Iterable[dict]) -> Iterator[dict]:
+        """Yield only the jobs that pass *keep*."""
+        count = 0
+        for job in filter(self.keep, jobs):
+            count += 1
+            yield job
+
+        print(f"필터링 후 {count}건 ({self.label})")
+
+    @property
+    def filter_fn(self) -> Callable[[Iterable[dict]], Iterator[dict]] | None:
+        """filter_jobs as a run_crawler() filter_fn, or None if there is nothing to filter."""
+        return self.filter_jobs if self.keep else None
+
+
+@dataclass
+class Detail:
+    """Per-posting detail endpoint of a SourceSpec, for fields the list API lacks.
+
+    Only postings that some output keeps are looked up, and their values are
+    cached by job ID (DetailCache), so a run requests the details of new
+    postings only (see Source.enrich). Filters therefore see the list
+    fields only.
+
+    Attributes:
+        url: Detail endpoint, "{}" standing for the job ID (e.g. Greenhouse's ".../jobs/{}").
+        fields: Name → a dotted path into the detail response or a getter over
+            it (see the field helpers). The values are put on the job as
+            job["detail"][name], so SourceSpec.fields read them as
+            "detail.<name>"; only these strings are cached, not the response.
+        workers: Max concurrent detail requests.
+    """
+
+    url: str
+    fields: dict[str, FieldSpec]
+    workers: int = PAGE_WORKERS
+
+
+@dataclass
+class SourceSpec:
+    """Declarative description of one company's job-list API.
+
+    Attributes:
+        config: Company-specific settings (sheet name, env var, job ID field).
+        url: List endpoint.
+        jobs_path: Dotted path to the job list in each response (e.g. "jobList").
+        fields: JobRow field name (except collected_at) → a dotted path or a
+            getter built with the field helpers (text, const, first_of,
+            mapped, template, iso_date, compact_date) or any callable. Fields
+            left out are empty.
+        params: Fixed query parameters.
+        headers: Extra headers for the session (e.g. a required User-Agent).
+        pagination: "none" (one request), "page" (1-based page number in
+            *page_param*) or "offset" (absolute offset in *page_param*, in
+            steps of *page_size*).
+        page_param: Query parameter carrying the page number or offset.
+        page_size: Postings per page, for offset pagination.
+        total_path: Path to the total page count ("page") or total posting count ("offset").
+        success: (path, expected) — a response is rejected unless str(value at path) == expected.
+        error_path: Path to the API's error message, quoted when *success* fails.
+        stream: Parse the response incrementally (see json_stream) instead of
+            decoding it whole: jobs are yielded while the body is still
+            being read, so memory stays at one job plus one read chunk.
+            Meant for large single-response listings (pagination "none").
+        filters: Conditions a kept job meets (equals, one_of, contains,
+            server_param). Those with a query parameter are pushed down to
+            the API; the rest are compiled into one client-side predicate.
+        profiles: Further outputs fed by the same fetch (see Profile). A
+            condition is only pushed down if every output has it.
+        detail: Per-posting detail endpoint for fields the list lacks (see Detail).
+    """
+
+    config: CrawlerConfig
+    url: str
+    jobs_path: str
+    fields: dict[str, FieldSpec]
+    params: dict[str, str] = field(default_factory=dict)
+    headers: dict[str, str] | None = None
+    pagination: str = "none"
+    page_param: str = ""
+    page_size: int = 0
+    total_path: str = ""
+    success: tuple[str, str] | None = None
+    error_path: str = ""
+    stream: bool = False
+    filters: tuple[Condition, ...] = ()
+    profiles: tuple[Profile, ...] = ()
+    detail: Detail | None = None
+
+
+class DetailCache:
+    """Detail values (see Detail) of one source's postings by job ID, kept in a JSON file.
+
+    Rewritten after every run: a complete run keeps just the postings it
+    looked up, so postings that left the listing drop out, while an
+    interrupted run only adds to it. A file written for another detail
+    endpoint or other field names is ignored.
+    """
+
+    def __init__(self, path: Path, key: str):
+        self.path = path
+        self.key = key
+        try:
+            saved = json.loads(path.read_text())
+        except (OSError, ValueError):
+            saved = {}
+        self._saved: dict[str, dict[str, str]] = (
+            saved.get("jobs", {}) if isinstance(saved, dict) and saved.get("key") == key else {}
+        )
+        self._used: dict[str, dict[str, str]] = {}
+
+    def get(self, job_id: str) -> dict[str, str] | None:
+        """Cached values for *job_id*, or None if it has not been looked up before."""
+        values = self._saved.get(job_id)
+        if values is not None:
+            self._used[job_id] = values
+        return values
+
+    def put(self, job_id: str, values: dict[str, str]) -> None:
+        self._used[job_id] = values
+
+    def save(self, complete: bool = True) -> None:
+        jobs = self._used if complete else {**self._saved, **self._used}
+        if jobs == self._saved:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps({"key": self.key, "jobs": jobs}, ensure_ascii=False))
+        os.replace(tmp, self.path)
+
+
+class Source:
+    """A SourceSpec compiled into the callables run_crawler() needs.
+
+    Paths and field specs are compiled once here, and job_to_row is a
+    closure over the field getters (see _compile_row) — no per-job loop
+    over the spec. Every pagination style goes through
+    fetch_paginated (a single request is a one-page listing), so all sources
+    share its concurrency, de-duplication and streaming — except sources with
+    spec.stream, whose one response is parsed incrementally (stream_jobs).
+    With spec.detail, the kept postings are then enriched (enrich).
+
+    Attributes:
+        spec: The source description.
+        config: spec.config.
+        url: List endpoint; may be repointed (e.g. at a local stub by bench.py).
+        detail_url: spec.detail's endpoint, likewise; "" without spec.detail.
+        session: Pooled, caching HTTP session for this source.
+        job_to_row: Converts a job dict to a JobRow.
+        params: Query parameters sent with every request — spec.params plus
+            the pushed-down filters.
+        outputs: The spec's own sheet target, then one per profile, each with
+            its compiled client-side filter.
+        filter_fn: Filter of the sole output (None with profiles or nothing to filter).
+    """
+
+    def __init__(self, spec: SourceSpec):
+        if spec.pagination not in ("none", "page", "offset"):
+            raise ValueError(f"Unknown pagination: {spec.pagination}")
+        if spec.stream and spec.pagination != "none":
+            raise ValueError("stream is only supported for single-response sources (pagination 'none')")
+        unknown = set(spec.fields) - set(JobRow._fields[:-1])
+        if unknown:
+            raise ValueError(f"Unknown JobRow fields: {sorted(unknown)}")
+        self.spec = spec
+        self.config = spec.config
+        self.url = spec.url
+        self.session = create_session(headers=spec.headers)
+        self._jobs_at = compile_path(spec.jobs_path)
+        self._total_at = compile_path(spec.total_path)
+        self._success_at = compile_path(spec.success[0]) if spec.success else None
+        self._error_at = compile_path(spec.error_path) if spec.error_path else None
+        self._getters = tuple(
+            _compile_field(spec.fields.get(name, "")) for name in JobRow._fields[:-1]
+        )
+        self.job_to_row = _compile_row(self._getters)
+        self.outputs = self._compile_outputs(spec)
+        self.filter_fn = self.outputs[0].filter_fn if len(self.outputs) == 1 else None
+
+        self.detail_url = spec.detail.url if spec.detail else ""
+        if spec.detail:
+            self._detail_getters = {name: _compile_field(path) for name, path in spec.detail.fields.items()}
+            # Details are not revalidated like list pages, so they bypass the HTTP cache
+            self.detail_session = create_session(headers=spec.headers, pool_maxsize=spec.detail.workers, cache=False)
+            keeps = [output.keep for output in self.outputs]
+            self._kept = None if None in keeps else lambda job: any(keep(job) for keep in keeps)
+
+    def _compile_outputs(self, spec: SourceSpec) -> list[Output]:
+        """Split filters into pushed-down params (shared by every output) and per-output predicates."""
+        targets = [(spec.config, spec.filters)] + [
+            (
+                replace(
+                    spec.config,
+                    company_name=f"{spec.config.company_name} ({profile.sheet_name})",
+                    sheet_name=profile.sheet_name,
+                    spreadsheet_env_var=profile.spreadsheet_env_var or spec.config.spreadsheet_env_var,
+                ),
+                profile.filters,
+            )
+            for profile in spec.profiles
+        ]
+        sheets = [(config.spreadsheet_env_var, config.sheet_name) for config, _ in targets]
+        if len(set(sheets)) != len(sheets):
+            raise ValueError(f"{spec.config.company_name}: 프로필마다 다른 시트를 지정해야 합니다: {sheets}")
+
+        pushed = [
+            condition for condition in spec.filters
+            if condition.param and all(condition in filters for _, filters in targets[1:])
+        ]
+        self.params = {**spec.params, **dict(condition.param for condition in pushed)}
+
+        outputs = []
+        for config, filters in targets:
+            local = [condition for condition in filters if condition not in pushed]
+            for condition in local:
+                if condition.path is None:
+                    raise ValueError(
+                        f"{config.sheet_name}: 서버 전용 조건 '{condition.label}'은(는) 모든 프로필에 공통이어야 합니다."
+                    )
+            outputs.append(Output(config, compile_filter(local), " + ".join(condition.label for condition in local)))
+        return outputs
+
+    def fetch_page(self, index: int) -> dict:
+        """Fetch and validate the response for a 0-based page index."""
+        spec = self.spec
+        params = dict(self.params)
+        if spec.pagination == "page":
+            params[spec.page_param] = index + 1
+        elif spec.pagination == "offset":
+            params[spec.page_param] = index * spec.page_size
+        response = self.session.get(self.url, params=params or None, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+
+        self._check(data)
+        if spec.pagination != "none":
+            print(f"페이지 {index + 1}/{self.page_count(data)} 수집 완료 ({len(self._jobs_at(data) or [])}건)")
+        return data
+
+    def stream_jobs(self) -> Iterator[dict]:
+        """Yield the jobs of a single-response listing while its body is still being read.
+
+        Only the array at jobs_path is decoded, one job at a time, so each
+        job reaches the filter before the next is parsed. The success flag
+        may follow the jobs in the document, so it is checked once the body
+        has been read; a failure then aborts the run before anything is
+        recorded (see JobStore.stage_run).
+        """
+        spec = self.spec
+        captures = [path for path in (spec.success[0] if spec.success else "", spec.error_path) if path]
+        response = self.session.get(self.url, params=self.params or None, timeout=30, stream=True)
+        with response:
+            response.raise_for_status()
+            jobs = JsonArrayStream(iter_body(response), spec.jobs_path, capture=captures)
+            yield from jobs
+        self._check(jobs.partial)
+
+    def _check(self, data: dict) -> None:
+        """Reject a response whose success flag (spec.success) does not match."""
+        if self._success_at and str(self._success_at(data)) != self.spec.success[1]:
+            raise ValueError(f"API 요청 실패: {self._error_at(data) if self._error_at else data}")
+
+    def page_count(self, first_page: dict) -> int:
+        """Total pages, given the first page response."""
+        total = self._total_at(first_page) or 0
+        if self.spec.pagination == "page":
+            return max(1, int(total))
+        if self.spec.pagination == "offset":
+            return offset_page_count(int(total), self.spec.page_size)
+        return 1
+
+    def fetch_all_jobs(self) -> Iterator[dict]:
+        """Yield every posting, page by page (pages 2..N fetched concurrently), or as parsed with spec.stream."""
+        if self.spec.stream:
+            jobs = dedupe_jobs(self.stream_jobs(), self.config.job_id_field)
+        else:
+            jobs = fetch_paginated(
+                self.fetch_page,
+                extract_jobs=lambda data: self._jobs_at(data) or [],
+                page_count=self.page_count,
+                id_field=self.config.job_id_field,
+            )
+        if self.spec.detail:
+            jobs = self.enrich(jobs)
+        count = 0
+        for job in jobs:
+            count += 1
+            yield job
+
+        print(f"총 {count}건의 채용 공고 수집 완료")
+
+    def fetch_detail(self, job_id: str) -> dict[str, str] | None:
+        """The spec.detail values of one posting, or None if the request failed."""
+        try:
+            response = self.detail_session.get(self.detail_url.format(job_id), timeout=30)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError) as error:
+            print(f"상세 정보 조회 실패 ({job_id}): {error}")
+            return None
+        return {name: get(data) for name, get in self._detail_getters.items()}
+
+    def enrich(self, jobs: Iterable[dict]) -> Iterator[dict]:
+        """Attach the spec.detail values, as job["detail"], to every job some output keeps.
+
+        Values cached by job ID (CACHE_DIR/details/<tab>.json) are reused; the
+        other postings are requested concurrently, at most detail.workers at a
+        time, and the kept jobs are yielded in their original order. Jobs no
+        output keeps pass straight through without a lookup. A failed lookup
+        leaves the job's detail fields empty and is retried on the next run.
+        """
+        detail = self.spec.detail
+        cache = DetailCache(CACHE_DIR / "details" / f"{self.config.sheet_name}.json",
+                            f"{detail.url}\n{','.join(sorted(detail.fields))}")
+        id_field = self.config.job_id_field
+        counts = Counter()
+        pending: deque[tuple[dict, str, dict | Future]] = deque()
+        in_flight = 0
+        complete = False
+
+        def settle() -> dict:
+            nonlocal in_flight
+            job, job_id, values = pending.popleft()
+            if isinstance(values, Future):
+                in_flight -= 1
+                values = values.result()
+                if values is None:
+                    counts["failed"] += 1
+                    values = {}
+                else:
+                    counts["fetched"] += 1
+                    cache.put(job_id, values)
+            job["detail"] = values
+            return job
+
+        pool = ThreadPoolExecutor(max_workers=detail.workers)
+        try:
+            for job in jobs:
+                if self._kept is not None and not self._kept(job):
+                    yield job
+                    continue
+                job_id = str(job.get(id_field) or "")
+                values = cache.get(job_id) if job_id else {}
+                if values is None:
+                    pending.append((job, job_id, pool.submit(self.fetch_detail, job_id)))
+                    in_flight += 1
+                else:
+                    counts["cached"] += 1
+                    pending.append((job, job_id, values))
+                # Yield what is ready; block on the oldest request only when all workers are busy
+                while pending and (in_flight >= detail.workers or not isinstance(pending[0][2], Future)
+                                   or pending[0][2].done()):
+                    yield settle()
+            while pending:
+                yield settle()
+            complete = True
+        finally:
+            pool.shutdown(cancel_futures=True)
+            cache.save(complete)
+            for result, count in counts.items():
+                METRICS.count("detail_lookups", count, result=result)
+            print(f"상세 정보: 신규 조회 {counts['fetched']}건, 캐시 {counts['cached']}건"
+                  + (f", 실패 {counts['failed']}건" if counts["failed"] else ""))
+
+    def run(self, force: bool = False, full_replace: bool = False, offline: bool = False):
+        """run_crawler() for this source and all its outputs."""
+        run_crawler(self.config, self.fetch_all_jobs, self.job_to_row, outputs=self.outputs,
+                    force=force, full_replace=full_replace, offline=offline)
+
+
+def _compile_row(getters: tuple[Callable[[dict], str], ...]) -> Callable[[dict], JobRow]:
+    """Build job_to_row for *getters* (one per JobRow field before collected_at).
+
+    The getters are bound to locals of one closure, so a row costs one call
+    per field and a single tuple.__new__, with no per-field loop.
+    """
+    new, stamp = tuple.__new__, run_timestamp
+    company, title, reg_date, end_date, url, category, location, employment_type, job_id = getters
+
+    def job_to_row(job: dict) -> JobRow:
+        return new(JobRow, (company(job), title(job), reg_date(job), end_date(job), url(job),
+                            category(job), location(job), employment_type(job), job_id(job), stamp()))
+
+    return job_to_row
+
+
+def _compile_field(spec: FieldSpec) -> Callable[[dict], str]:
+    if callable(spec):
+        return spec
+    return text(spec) if spec else const("")
+
+
+class JobStream:
+    """One crawl's rows, produced lazily from raw jobs: filter → job_to_row.
+
+    Iterating yields rows as the underlying jobs arrive, so a generator
+    source (e.g. fetch_paginated) is never materialized. While the jobs
+    pass through, they are counted and the kept ones hashed; `count`, `kept` and
+    `fingerprint` are final once the stream has been consumed.
+
+    With *spool*, the stream is consumed immediately into a temporary file and
+    later iterations replay it from disk — run_all.py uses this so that a
+    fetch can finish in a worker thread before the writer gets to it, without
+    holding the rows in memory.
+
+    The time spent producing jobs, filtering and encoding rows is charged to
+    the "fetch", "filter" and "encode" stages of METRICS.
+
+    Args:
+        jobs: Raw job dicts, any iterable (consumed once).
+        job_to_row_fn: Converts a single job dict to a 10-column row.
+        filter_fn: Optional filter over the job iterable; should be lazy (a
+            generator) for memory to stay bounded.
+        spool: Consume now and buffer rows on disk instead of in memory.
+    """
+
+    def __init__(
+        self,
+        jobs: Iterable[dict],
+        job_to_row_fn: Callable[[dict], JobRow],
+        filter_fn: Callable[[Iterable[dict]], Iterable[dict]] | None = None,
+        spool: bool = False,
+    ):
+        self._jobs = jobs
+        self._job_to_row_fn = job_to_row_fn
+        self._filter_fn = filter_fn
+        self._hash = hashlib.sha256()
+        self._spool = None
+        self.count = 0  # raw jobs fetched
+        self.kept = 0   # jobs left after filter_fn
+        if spool:
+            self._spool = tempfile.TemporaryFile("w+", encoding="utf-8")
+            with METRICS.stage("encode"):
+                for row in self._rows():
+                    self._spool.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def _raw(self) -> Iterator[dict]:
+        for job in METRICS.timed(self._jobs, "fetch"):
+            self.count += 1
+            yield job
+
+    def _rows(self) -> Iterator[list[str]]:
+        jobs = self._raw()
+        if self._filter_fn:
+            jobs = METRICS.timed(self._filter_fn(jobs), "filter")
+        return METRICS.timed(self._convert(jobs), "encode")
+
+    def _convert(self, jobs: Iterable[dict]) -> Iterator[list[str]]:
+        for job in jobs:
+            self._accept(_job_digest(job))
+            yield self._job_to_row_fn(job)
+
+    def _accept(self, digest: bytes) -> None:
+        self.kept += 1
+        self._hash.update(digest)
+
+    @classmethod
+    def fan_out(
+        cls,
+        jobs: Iterable[dict],
+        job_to_row_fn: Callable[[dict], JobRow],
+        predicates: list[Callable[[dict], bool] | None],
+    ) -> list["JobStream"]:
+        """Consume *jobs* once into one spooled stream per predicate (None keeps every job).
+
+        Each job is hashed, converted and encoded at most once, however many
+        streams keep it; every stream counts all jobs as fetched.
+        """
+        streams = [cls((), job_to_row_fn, spool=True) for _ in predicates]
+        with METRICS.stage("filter"):
+            for job in METRICS.timed(jobs, "fetch"):
+                digest = line = None
+                for stream, keep in zip(streams, predicates):
+                    stream.count += 1
+                    if keep is None or keep(job):
+                        if line is None:
+                            with METRICS.stage("encode"):
+                                digest = _job_digest(job)
+                                line = json.dumps(job_to_row_fn(job), ensure_ascii=False) + "\n"
+                        stream._accept(digest)
+                        stream._spool.write(line)
+        return streams
+
+    def __iter__(self) -> Iterator[list[str]]:
+        if self._spool is None:
+            return self._rows()
+        self._spool.seek(0)
+        return (json.loads(line) for line in self._spool)
+
+    @property
+    def fingerprint(self) -> str:
+        """SHA-256 over the jobs kept by the filter, in fetch order (key order independent).
+
+        Rejected postings are not hashed, so changes elsewhere on a company's
+        board do not trigger a rewrite.
+        """
+        return self._hash.hexdigest()
+
+
+def _job_digest(job: dict) -> bytes:
+    """A job's contribution to JobStream.fingerprint (key order independent)."""
+    return json.dumps(job, sort_keys=True, ensure_ascii=False, default=str).encode() + b"\n"
+
+
+def _fingerprint_path() -> Path:
+    return CACHE_DIR / "fingerprints.json"
+
+
+def _fingerprint_key(target: CrawlerConfig | str) -> str:
+    """"ENV_VAR/tab" for a company's config; other tabs (e.g. the Summary tab) pass the key itself."""
+    if isinstance(target, CrawlerConfig):
+        return f"{target.spreadsheet_env_var}/{target.sheet_name}"
+    return target
+
+
+def load_fingerprint(config: CrawlerConfig | str) -> str | None:
+    """Return the fingerprint recorded after the last successful write for *config*."""
+    try:
+        fingerprints = json.loads(_fingerprint_path().read_text())
+    except (OSError, ValueError):
+        return None
+    return fingerprints.get(_fingerprint_key(config))
+
+
+def save_fingerprint(config: CrawlerConfig | str, fingerprint: str) -> None:
+    path = _fingerprint_path()
+    try:
+        fingerprints = json.loads(path.read_text())
+    except (OSError, ValueError):
+        fingerprints = {}
+    fingerprints[_fingerprint_key(config)] = fingerprint
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(fingerprints, ensure_ascii=False, indent=2))
+
+
+def get_job_store() -> JobStore:
+    """Return the process-wide JobStore at CACHE_DIR/jobs.sqlite3 (reopened if CACHE_DIR changes)."""
+    global _store
+    path = CACHE_DIR / "jobs.sqlite3"
+    if _store is None or _store.path != path:
+        if _store is not None:
+            _store.close()
+        _store = JobStore(path)
+    return _store
+
+
 def run_crawler(
     config: CrawlerConfig,
-    fetch_fn: Callable[[], list[dict]],
-    job_to_row_fn: Callable[[dict], list[str]],
-    filter_fn: Callable[[list[dict]], list[dict]] | None = None,
+    fetch_fn: Callable[[], Iterable[dict]],
+    job_to_row_fn: Callable[[dict], JobRow],
+    filter_fn: Callable[[Iterable[dict]], Iterable[dict]] | None = None,
+    force: bool = False,
+    full_replace: bool = False,
+    offline: bool = False,
+    outputs: list[Output] | None = None,
 ):
-    """Orchestrate a full crawl cycle: fetch → filter → archive → overwrite.
+    """Orchestrate a full crawl cycle: fetch → filter → store → project to Sheets.
+
+    The pipeline streams: *fetch_fn* may return any iterable (typically a
+    generator yielding jobs page by page), and each job is filtered, turned
+    into a row and inserted into the local job store (see job_store) as it
+    arrives. The store closes postings that disappeared with an indexed set
+    difference and keeps each posting's first-seen time as its 수집일시 (the
+    수집일시 produced by job_to_row_fn is ignored). The run's new and closed
+    postings are appended to the Delta tab, and the newsletter's counts are
+    rewritten to the Summary tab (see sync_summary) — the two tabs the
+    newsletter reads.
+    Closed postings are archived once each: appended to their archive tab
+    (see archive_title), or rewritten in place if archived before.
+    The company tab is then written as a projection of the store **by diff**:
+    only inserted, deleted and changed rows are written, read back from the
+    store in chunks, and the sheet is not read back. With *full_replace*, the
+    tab is re-read and the entire tab (except Archive) is rewritten sorted by
+    회사 / 등록일 — the fallback when the sheet was edited by hand.
 
-    Uses a **full-replace strategy**: after archiving closed jobs, the entire sheet
-    (except Archive) is cleared and rewritten with current data. This ensures the
-    sheet always reflects the exact state of the API, avoiding stale or duplicate rows.
+    The run goes to the selected sinks (see make_sinks): the Google
+    spreadsheet as described above by default, and/or local JSONL / CSV /
+    Parquet files (CRAWLER_SINKS, use_sinks).
+
+    With several *outputs* (see Source / Profile), the one fetch fans out:
+    every job is checked against each output's filter and each output's
+    sheet is synced in turn (see sync_outputs).
+
+    Stage timings and counters are recorded in METRICS under the company
+    name; with METRICS_PATH set, the run report is written there at the end,
+    also when the run failed.
 
     Args:
         config: Company-specific settings (sheet name, env var, etc.).
-        fetch_fn: Fetches all raw job postings from the company API.
+        fetch_fn: Returns all raw job postings from the company API, as a list or iterator.
         job_to_row_fn: Converts a single job dict to a 10-column row.
-        filter_fn: Optional post-fetch filter (e.g. by employment type or category).
+        filter_fn: Optional post-fetch filter over the job iterable (e.g. by
+            employment type or category); a generator keeps memory bounded.
+        force: Rewrite the sheet even if the fetched data is unchanged since the last run.
+        full_replace: Rewrite the whole sheet instead of writing a diff.
+        offline: Update the local store only; the next online run projects the changes.
+        outputs: Sheet targets with their own filters, replacing *config* as
+            the target and *filter_fn* (which must then be None).
     """
     print(f"=== {config.company_name} 채용 정보 크롤러 시작 ===")
-    print(f"실행 시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"실행 시각: {start_run()}")
 
-    jobs = fetch_fn()
+    if outputs is None:
+        outputs = [Output(config)]
+    elif filter_fn is not None:
+        raise ValueError("outputs와 filter_fn은 함께 지정할 수 없습니다.")
+    try:
+        with METRICS.company(config.company_name):
+            sync_outputs(outputs, fetch_fn(), job_to_row_fn, filter_fn, force=force, full_replace=full_replace,
+                         offline=offline)
+            if not offline and SheetsSink.name in sink_names():
+                for env_var in dict.fromkeys(output.config.spreadsheet_env_var for output in outputs):
+                    sync_summary(env_var)
+    finally:
+        write_run_report(METRICS_PATH)
 
-    if not jobs:
-        print("수집된 채용 공고가 없습니다.")
+
+def write_run_report(path: str | None) -> None:
+    """Write METRICS to *path* (see RunMetrics.write); nothing without a path."""
+    if not path:
         return
+    METRICS.write(path)
+    if path != "-":
+        print(f"실행 보고서 저장: {path}")
 
-    if filter_fn:
-        jobs = filter_fn(jobs)
 
-    active_job_ids = set(
-        str(job.get(config.job_id_field))
-        for job in jobs
-        if job.get(config.job_id_field)
-    )
+def sync_outputs(
+    outputs: list[Output],
+    jobs: Iterable[dict],
+    job_to_row_fn: Callable[[dict], JobRow],
+    filter_fn: Callable[[Iterable[dict]], Iterable[dict]] | None = None,
+    force: bool = False,
+    full_replace: bool = False,
+    offline: bool = False,
+):
+    """Record fetched jobs for every output: sync_jobs() for one, a fan-out for several.
+
+    A single output streams as usual, filtered by its own predicate or by
+    *filter_fn*. Several outputs are fed from one pass over *jobs* into
+    spooled streams (JobStream.fan_out), then synced one after another.
+    """
+    if len(outputs) == 1:
+        sync_jobs(outputs[0].config, jobs, job_to_row_fn, outputs[0].filter_fn or filter_fn,
+                  force=force, full_replace=full_replace, offline=offline)
+        return
+
+    streams = JobStream.fan_out(jobs, job_to_row_fn, [output.keep for output in outputs])
+    for output, stream in zip(outputs, streams):
+        print(f"\n--- {output.config.sheet_name}: 필터링 후 {stream.kept}건 ({output.label or '전체'}) ---")
+        with METRICS.company(output.config.company_name):
+            sync_rows(output.config, stream, force=force, full_replace=full_replace, offline=offline)
+
+
+def sync_jobs(
+    config: CrawlerConfig,
+    jobs: Iterable[dict],
+    job_to_row_fn: Callable[[dict], JobRow],
+    filter_fn: Callable[[Iterable[dict]], Iterable[dict]] | None = None,
+    force: bool = False,
+    full_replace: bool = False,
+    offline: bool = False,
+):
+    """Record fetched jobs in the store and project them to the company sheet.
+
+    The post-fetch half of run_crawler(); *jobs* may be a list or an iterator.
+    See sync_rows().
+    """
+    sync_rows(config, JobStream(jobs, job_to_row_fn, filter_fn), force=force, full_replace=full_replace,
+              offline=offline)
+
 
-    print("\nGoogle Sheets 연결 중...")
-    spreadsheet = get_google_spreadsheet(config.spreadsheet_env_var)
-    sheet = get_or_create_sheet(spreadsheet, config.sheet_name)
+def _archive_tab_rows(store: JobStore, io: SheetIO, spreadsheet_id: str, title: str) -> int:
+    """Rows an archive tab uses, as tracked by the store.
 
-    archived_count = archive_closed_jobs(spreadsheet, sheet, active_job_ids)
-    if archived_count > 0:
-        print(f"마감 공고 {archived_count}건을 Archive 시트로 이동")
+    Only if the store lost track of the tab (first run, lost cache) is its
+    공고ID column read — once; a tab that does not exist yet costs no call.
+    """
+    rows = store.tab_rows(spreadsheet_id, title)
+    if rows is None:
+        io.load({title: "I:I"})
+        rows = io.row_count(title)
+    io.set_row_count(title, rows)
+    return rows
+
+
+def sync_rows(
+    config: CrawlerConfig,
+    rows: JobStream,
+    force: bool = False,
+    full_replace: bool = False,
+    offline: bool = False,
+):
+    """Stream one crawl's rows into the store and hand the run to the selected sinks.
+
+    Split out of run_crawler() so that run_all.py can fetch several companies
+    concurrently (into spooled JobStreams) and write each one as soon as its
+    fetch is done.
+
+    The sinks come from make_sinks() — by default the company sheet
+    (SheetsSink); --offline drops the remote ones. A sink whose last
+    successful write saw the same fetched jobs (same fingerprint) is skipped
+    unless *force* is set; when every sink is, the run is skipped entirely.
+    The fingerprints are only trusted while the store holds the source: a
+    lost or rebuilt store is refilled even if the fetched jobs are unchanged.
+    """
+    store = get_job_store()
+    source = config.sheet_name
+    with METRICS.stage("store"):
+        skipped = store.stage_run(rows)
+    METRICS.count("jobs_fetched", rows.count)
+    METRICS.count("jobs_kept", rows.kept)
+
+    if not rows.count:
+        print("수집된 채용 공고가 없습니다.")
+        return
 
-    if not jobs:
-        # 필터링 결과 0건 — 시트를 헤더만 남기고 비움 (빈 데이터도 정확히 반영)
+    sinks = make_sinks(config)
+    # fingerprint는 저장소와 따로 저장되므로, 저장소에 이 소스가 없으면(유실·초기화·스키마 변경) 같은 fingerprint여도 다시 기록
+    if not force and store.has_source(source):
+        sinks = [sink for sink in sinks if rows.fingerprint != load_fingerprint(sink.key)]
+    if not sinks:
+        print("이전 실행 이후 변경 사항 없음 — 시트 갱신을 건너뜁니다.")
+        return
+
+    if not rows.kept:
         print("조건에 맞는 채용 공고가 없습니다.")
-        sheet.clear()
-        setup_header(sheet)
+    if skipped:
+        print(f"공고ID 없는 공고 {skipped}건 제외")
+
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if offline:
+        sinks = [sink for sink in sinks if not sink.remote]
+
+    for sink in sinks:
+        sink.prepare(store, now, full_replace)
+    with METRICS.stage("store"):
+        delta = store.record_run(source, now)
+    if offline:
+        print(f"로컬 저장소 반영: 신규 {delta.new + delta.reopened}건, 마감 {delta.closed}건 (시트는 다음 실행 때 갱신)")
+    else:
+        print(f"이번 실행: 신규 {delta.new}건, 재게시 {delta.reopened}건, 마감 {delta.closed}건")
+
+    for sink in sinks:
+        sink.write(store, delta, now, full_replace)
+        save_fingerprint(sink.key, rows.fingerprint)
+    if not offline:
+        print(f"\n{rows.kept}건의 공고를 최신 데이터로 갱신했습니다.")
         print("=== 크롤링 완료 ===")
+
+
+class SheetsSink(Sink):
+    """The company tab of the Google spreadsheet, with its Archive and Delta tabs.
+
+    prepare() connects and, if the store never wrote the tab (first run,
+    lost cache), reads it once as the baseline. write() projects the run:
+    closed postings to their archive tab, the company tab by diff (or, with
+    full_replace, rewritten sorted), and the run's events to the Delta tab —
+    in one batched commit (see run_crawler), split into several requests only
+    past SHEETS_CHUNK_CELLS. If such a split write fails part way, the tabs'
+    projection state is dropped, so the next run reads them back as its
+    baseline instead of diffing against rows that were never written.
+    """
+    name = "sheets"
+    remote = True
+
+    def __init__(self, config: CrawlerConfig):
+        super().__init__(config.sheet_name)
+        self.config = config
+
+    @property
+    def key(self) -> str:
+        return _fingerprint_key(self.config)
+
+    def prepare(self, store: JobStore, now: str, full_replace: bool = False) -> None:
+        source = self.source
+        print("\nGoogle Sheets 연결 중...")
+        with METRICS.stage("connect"):
+            self.spreadsheet = spreadsheet = get_google_spreadsheet(self.config.spreadsheet_env_var)
+        self.io = io = SheetIO(spreadsheet, width=len(HEADER))
+
+        # 저장소가 이 시트를 쓴 적이 없으면(최초 실행, 캐시 유실) 현재 시트를 한 번 읽어 기준으로 삼음.
+        # Delta는 행 수만 필요하므로 A열만 읽음
+        tab_rows = None if full_replace else store.tab_rows(spreadsheet.id, source)
+        delta_rows = store.tab_rows(spreadsheet.id, DELTA_SHEET)
+        ranges = {}
+        if tab_rows is None:
+            ranges[source] = "A:J"
+        if delta_rows is None:
+            ranges[DELTA_SHEET] = "A:A"
+        self.header = None
+        if ranges:
+            io.load(ranges)
+        if tab_rows is None:
+            sheet_rows = io.rows(source)
+            with METRICS.stage("store"):
+                store.adopt_sheet(source, sheet_rows[1:], now)
+            tab_rows = len(sheet_rows)
+            if sheet_rows[:1] != [HEADER]:
+                self.header = HEADER
+        self.tab_rows = tab_rows
+        io.set_row_count(source, tab_rows)
+        if delta_rows is not None:
+            io.set_row_count(DELTA_SHEET, delta_rows)
+
+    def write(self, store: JobStore, delta: RunDelta, now: str, full_replace: bool = False) -> None:
+        source, spreadsheet, io = self.source, self.spreadsheet, self.io
+        with METRICS.stage("project"):
+            projection = store.plan_projection(source, self.tab_rows, full_replace=full_replace,
+                                               header=HEADER if full_replace else self.header)
+        with METRICS.stage("archive"):
+            archive = store.plan_archive(spreadsheet.id, source, archive_title,
+                                         lambda title: _archive_tab_rows(store, io, spreadsheet.id, title), HEADER)
+        run_at = datetime.strptime(now, "%Y-%m-%d %H:%M:%S")
+        since = (run_at - timedelta(days=DELTA_RETENTION_DAYS)).strftime("%Y-%m-%d %H:%M:%S")
+        with METRICS.stage("project"):
+            delta_projection = store.plan_delta(spreadsheet.id, source, io.row_count(DELTA_SHEET), since,
+                                                DELTA_LABELS, DELTA_HEADER)
+
+        # 최종 크기를 미리 알려 두면 청크 단위로 나눠 써도 그리드 확장은 한 번으로 끝남
+        io.reserve(source, projection.row_count)
+        for title, row_count in archive.row_counts.items():
+            io.reserve(title, row_count)
+        io.reserve(DELTA_SHEET, delta_projection.row_count)
+
+        try:
+            for title, start_row, block in METRICS.timed(store.archive_blocks(archive, WRITE_CHUNK_ROWS), "archive"):
+                io.write_rows(title, start_row, block)
+            if archive.appended:
+                print(f"마감 공고 {archive.appended}건을 Archive로 이동 ({', '.join(sorted(archive.row_counts))})")
+            if archive.updated:
+                print(f"이미 보관된 공고 {archive.updated}건은 Archive의 기존 행을 갱신")
+            for start_row, block in METRICS.timed(store.projection_blocks(projection, WRITE_CHUNK_ROWS), "project"):
+                io.write_rows(source, start_row, block)
+            for start_row, block in METRICS.timed(store.delta_blocks(delta_projection, WRITE_CHUNK_ROWS), "project"):
+                io.write_rows(DELTA_SHEET, start_row, block)
+            cells = io.commit()
+        except Exception:
+            # 큰 쓰기는 여러 요청으로 나뉘므로(SHEETS_CHUNK_CELLS) 일부 청크만 기록된 채 실패할 수 있음 —
+            # 그러면 시트가 저장소의 투영 상태와 어긋나므로, 다음 실행에서 시트를 다시 읽어 기준으로 삼게 함
+            if io.cells:
+                store.forget_tabs(spreadsheet.id, [source, DELTA_SHEET, *archive.row_counts])
+                print("시트 쓰기가 중간에 실패 — 다음 실행에서 시트를 다시 읽어 맞춥니다.")
+            raise
+        with METRICS.stage("store"):
+            store.apply_projection(projection, spreadsheet.id)
+            store.apply_archive(archive, now)
+            store.apply_delta(delta_projection, spreadsheet.id, DELTA_SHEET)
+
+        stats = projection.stats
+        if not full_replace:
+            print(f"변경분 반영: 신규 {stats['inserted']}건, 삭제 {stats['deleted']}건, 수정 {stats['changed']}건")
+        print(f"Sheets API 호출 {sum(io.calls.values())}회, {cells}셀 기록")
+
+
+# Sinks by name (CRAWLER_SINKS, run_all.py --sink)
+SINK_TYPES = {SheetsSink.name: SheetsSink, **LOCAL_SINKS}
+
+# Sinks every run writes to, comma-separated (e.g. "sheets,jsonl"); see use_sinks
+SINKS = os.environ.get("CRAWLER_SINKS", SheetsSink.name)
+
+_sink_names: list[str] | None = None  # set by use_sinks; SINKS until then
+_output_dir = OUTPUT_DIR
+_dry_run = False
+
+
+def _parse_sinks(names: Iterable[str]) -> list[str]:
+    names = list(dict.fromkeys(name.strip() for name in names if name.strip()))
+    for name in names:
+        if name not in SINK_TYPES:
+            raise ValueError(f"Unknown sink: {name} (choose from {', '.join(SINK_TYPES)})")
+        SINK_TYPES[name].check()
+    return names
+
+
+def use_sinks(names: Iterable[str] | None = None, directory: Path | str | None = None) -> None:
+    """Select the sinks every sync_rows() writes to, by name (see SINK_TYPES).
+
+    *names* None keeps the current selection; *directory* holds the local
+    sink files (default OUTPUT_DIR, i.e. CRAWLER_OUTPUT_DIR).
+    Raises ValueError for an unknown name.
+    """
+    global _sink_names, _output_dir
+    if names is not None:
+        _sink_names = _parse_sinks(names)
+    if directory is not None:
+        _output_dir = Path(directory)
+
+
+def sink_names() -> list[str]:
+    """Names of the selected sinks; a dry run leaves out the remote ones and defaults to csv."""
+    names = _parse_sinks(SINKS.split(",")) if _sink_names is None else _sink_names
+    if _dry_run:
+        names = [name for name in names if not SINK_TYPES[name].remote] or [CsvSink.name]
+    return names
+
+
+def make_sinks(config: CrawlerConfig) -> list[Sink]:
+    """The selected sinks for *config*'s tab (local files under the output directory)."""
+    return [SheetsSink(config) if name == SheetsSink.name else SINK_TYPES[name](config.sheet_name, _output_dir, HEADER)
+            for name in sink_names()]
+
+
+def start_dry_run() -> Path:
+    """Make this process's runs leave no trace outside the local sink files.
+
+    The remote sinks are dropped (see sink_names) and CACHE_DIR is pointed at
+    a fresh temporary directory holding a copy of the job store, so runs see
+    the real history (new vs. known postings) but neither the store, the
+    fingerprints nor the HTTP cache change. The directory is removed at exit;
+    returns it.
+    """
+    global CACHE_DIR, _dry_run, _store
+    directory = Path(tempfile.mkdtemp(prefix="crawler-dry-run-"))
+    if _store is not None:
+        _store.close()
+        _store = None
+    store = CACHE_DIR / "jobs.sqlite3"
+    if store.exists():
+        shutil.copyfile(store, directory / "jobs.sqlite3")
+    details = CACHE_DIR / "details"
+    if details.is_dir():
+        shutil.copytree(details, directory / "details")  # known postings' details are not requested again
+    CACHE_DIR = directory
+    _dry_run = True
+    atexit.register(shutil.rmtree, directory, True)
+    return directory
+
+
+def company_group(company: str) -> str:
+    """COMPANY_GROUPS group whose names appear in *company*, or 기타."""
+    for group, names in COMPANY_GROUPS.items():
+        if any(name in company for name in names):
+            return group
+    return "기타"
+
+
+def summary_rows(summary: JobSummary, today: str) -> list[list[str]]:
+    """The Summary tab's rows for *summary*, header first (see SUMMARY_HEADER)."""
+    recent = f"최근{SUMMARY_DAYS}일"
+    rows = [
+        SUMMARY_HEADER,
+        ["집계", "기준일", today],
+        ["집계", "전체", str(summary.total)],
+        ["집계", "신규", str(summary.new)],
+        ["집계", recent, str(len(summary.recent))],
+        ["집계", "마감임박", str(len(summary.urgent))],
+    ]
+    rows += [["그룹", group, str(count)] for group, count in summary.groups.items()]
+    rows += [[recent, company_group(row[0]), *row] for row in summary.recent]
+    rows += [["마감임박", company_group(row[0]), *row] for row in summary.urgent[:SUMMARY_URGENT_ROWS]]
+    return rows
+
+
+def sync_summary(spreadsheet_env_var: str) -> None:
+    """Rewrite the spreadsheet's Summary tab from the job store, if its contents changed.
+
+    The newsletter's counts — open, new in the last 24 hours, registered in
+    the last SUMMARY_DAYS days, closing within SUMMARY_DAYS days, per
+    COMPANY_GROUPS group — and the recent / closing-soon postings, over every
+    company tab projected to the spreadsheet. Computed once per run in SQL
+    (JobStore.summarize), so Apps Script reads one small range instead of
+    scanning and date-parsing every company tab. Nothing is read or written
+    when the rows equal the last ones written (e.g. a rerun on the same day);
+    leftover rows of a longer previous summary are blanked.
+    """
+    spreadsheet_id = os.environ.get(spreadsheet_env_var)
+    if not spreadsheet_id:
+        raise ValueError(f"{spreadsheet_env_var} 환경변수가 설정되지 않았습니다.")
+    store = get_job_store()
+    now = datetime.now()
+    today = now.strftime("%Y-%m-%d")
+    with METRICS.stage("summary"):
+        summary = store.summarize(
+            spreadsheet_id,
+            today=today,
+            until=(now + timedelta(days=SUMMARY_DAYS)).strftime("%Y-%m-%d"),
+            since=(now - timedelta(days=SUMMARY_DAYS)).strftime("%Y-%m-%d"),
+            new_since=(now - timedelta(hours=24)).strftime("%Y-%m-%d %H:%M:%S"),
+            group_of=company_group,
+            groups=COMPANY_GROUPS,
+        )
+        rows = summary_rows(summary, today)
+    key = f"{spreadsheet_env_var}/{SUMMARY_SHEET}"
+    fingerprint = hashlib.sha256(json.dumps(rows, ensure_ascii=False).encode()).hexdigest()
+    if fingerprint == load_fingerprint(key):
         return
 
-    data_rows = [job_to_row_fn(job) for job in jobs]
-    # Sort by 회사(col 0) asc, then 등록일(col 2) desc (newest first within each company)
-    data_rows.sort(key=lambda row: (row[0], row[2] if row[2] and row[2] != "상시채용" else ""), reverse=True)
-    all_rows = [HEADER] + data_rows
+    spreadsheet = get_google_spreadsheet(spreadsheet_env_var)
+    io = SheetIO(spreadsheet, width=len(SUMMARY_HEADER))
+    tab_rows = store.tab_rows(spreadsheet.id, SUMMARY_SHEET)
+    if tab_rows is None:
+        io.load({SUMMARY_SHEET: "A:A"})
+        tab_rows = io.row_count(SUMMARY_SHEET)
+    blank = [""] * len(SUMMARY_HEADER)
+    for start, block in enumerate(chunked(rows + [blank] * max(0, tab_rows - len(rows)), WRITE_CHUNK_ROWS)):
+        io.write_rows(SUMMARY_SHEET, 1 + start * WRITE_CHUNK_ROWS, block)
+    io.commit()
+    store.set_tab_rows(spreadsheet.id, SUMMARY_SHEET, len(rows))
+    save_fingerprint(key, fingerprint)
+    print(f"Summary 갱신: 전체 {summary.total}건, 신규 {summary.new}건, 최근{SUMMARY_DAYS}일 {len(summary.recent)}건, "
+          f"마감임박 {len(summary.urgent)}건")
+
+
+def compact_archive(spreadsheet_env_var: str) -> None:
+    """Rewrite a spreadsheet's archive tabs de-duplicated and partitioned, and rebuild the archive index.
+
+    Every archive tab (the plain "Archive" tab and its partitions) is read
+    in full — the only place that does — and each 공고ID + URL is kept once,
+    in the tab archive_title() gives it under the current ARCHIVE_PARTITION.
+    Rows left over in tabs that shrank are blanked; a tab that ends up empty
+    keeps its header. Run it once to migrate an existing Archive tab, or
+    after changing ARCHIVE_PARTITION; regular runs keep the archive
+    de-duplicated through the index.
+    """
+    spreadsheet = get_google_spreadsheet(spreadsheet_env_var)
+    forget_metadata(spreadsheet.id)  # 손으로 추가한 Archive 탭도 보이도록 탭 목록은 새로 읽음
+    io = SheetIO(spreadsheet, width=len(HEADER))
+    titles = sorted(title for title in io.sheets() if is_archive_title(title))  # "Archive"가 먼저 → 파티션 행이 우선
+    print(f"\n=== Archive 정리: {spreadsheet_env_var} ===")
+    if not titles:
+        print("Archive 탭이 없습니다.")
+        return
 
-    sheet.clear()
-    sheet.update(f"A1:J{len(all_rows)}", all_rows, value_input_option="USER_ENTERED")
+    io.load({title: "A:J" for title in titles})
+    store = get_job_store()
+    compaction = store.stage_archive(spreadsheet.id, ((title, io.rows(title)) for title in titles),
+                                     archive_title, HEADER)
+    for title, row_count in compaction.row_counts.items():
+        io.reserve(title, row_count)
+    for title, start_row, block in store.compaction_blocks(compaction, WRITE_CHUNK_ROWS):
+        io.write_rows(title, start_row, block)
+    cells = io.commit()
+    store.apply_compaction(compaction)
 
-    print(f"\n{len(jobs)}건의 공고를 최신 데이터로 갱신했습니다.")
-    print("=== 크롤링 완료 ===")
+    kept = compaction.read - compaction.duplicates
+    print(f"{len(titles)}개 탭 {compaction.read}행 → {kept}행 (중복 {compaction.duplicates}건 제거)")
+    for title, rows in sorted(compaction.row_counts.items()):
+        print(f"  {title}: {compaction.before.get(title, 0)}행 → {rows}행")
+    print(f"Sheets API 호출 {sum(io.calls.values())}회, {cells}셀 기록")
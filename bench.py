@@ -0,0 +1,942 @@
+#!/usr/bin/env python3
+"""Offline benchmarks — replays synthetic API payloads through a local HTTP stub.
+
+Every crawler's source URL is pointed at a stub server on 127.0.0.1 that serves
+payloads in that company's response format, with an artificial per-request
+latency to stand in for the real network round-trip. Sheets writes go to the
+in-memory fake in fake_sheets.py. Nothing here touches the live company APIs
+or Google Sheets (except `record`, which saves one real response per source).
+
+Payloads are synthetic, or replayed from a recorded response in FIXTURE_DIR
+when there is one (`record`): the recorded postings are repeated with
+suffixed IDs to reach the requested size, and paginated according to the
+source's SourceSpec. `suite` runs run_crawler end to end for every source at
+1x / 100x / 10,000x of that size, each run in a fresh process, and reports
+throughput, peak memory, HTTP and Sheets API calls and the time per stage
+(metrics); `--save` / `--compare` keep a baseline to catch regressions.
+
+Usage:
+    python bench.py fetch                    # 순차 vs 동시 fetch 비교
+    python bench.py fetch --latency 0.5 --jobs 30
+    python bench.py sheets                   # 회사별 Sheets API 호출 수 (최초 실행 / 재실행 / 공고 추가)
+    python bench.py sheets --quota-errors 3  # 공고 추가 실행 중 429 응답을 주입해 재시도 확인
+    python bench.py memory --jobs 100000     # 스트리밍 vs 리스트 파이프라인의 최대 RSS
+    python bench.py encode --jobs 100000     # job_to_row: 행별 list + 매번 날짜 파싱 vs JobRow + 메모이즈
+    python bench.py parse --jobs 20000       # 단일 응답 소스: response.json() vs 증분 파싱 (첫 행까지 시간, 최대 메모리)
+    python bench.py suite                    # 소스 × 배율(1x/100x) run_crawler 전체 실행
+    python bench.py suite --scales 1,100,10000 toss   # 10000x 포함 (페이지네이션 소스는 수 분 소요)
+    python bench.py suite --scales 1,100 --save bench-baseline.json
+    python bench.py suite --scales 1,100 --compare bench-baseline.json   # 기준 대비 회귀 시 종료 코드 1
+    python bench.py record                   # 실제 API 응답을 FIXTURE_DIR에 저장 (네트워크 필요)
+"""
+
+import argparse
+import importlib
+import io
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import replace
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+from urllib.parse import parse_qs, urlparse
+
+import base
+import run_all
+import sheets_io
+from fake_sheets import FakeClient, FakeSpreadsheet, api_error
+from metrics import METRICS
+from sheets_io import API_CALLS, SheetsScheduler
+
+DEFAULT_LATENCY = 0.3  # seconds per request
+DEFAULT_JOBS = 25      # postings per company
+
+# Recorded responses, one <crawler module>.json per source (see record)
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+# ---------------------------------------------------------------------------
+# Synthetic payloads — one builder per company response format
+# ---------------------------------------------------------------------------
+
+def _kakao(query: dict, n: int, page_size: int = 10) -> dict:
+    page = int(query.get("page", ["1"])[0])
+    total_page = max(1, -(-n // page_size))
+    start = (page - 1) * page_size
+    return {
+        "totalPage": total_page,
+        "jobList": [
+            {
+                "realId": f"P-{i}",
+                "companyName": "카카오",
+                "jobOfferTitle": f"서비스 기획 {i}",
+                "regDate": "2025-01-15T09:00:00",
+                "endDate": None,
+                "jobPartName": "서비스비즈",
+                "locationName": "판교",
+                "employeeTypeName": "정규직",
+            }
+            for i in range(start, min(start + page_size, n))
+        ],
+    }
+
+
+def _naver(query: dict, n: int) -> dict:
+    first_index = int(query.get("firstIndex", ["0"])[0])
+    return {
+        "result": "Y",
+        "totalSize": n,
+        "list": [
+            {
+                "annoId": 10000 + i,
+                "sysCompanyCdNm": "NAVER",
+                "annoSubject": f"사업개발 {i}",
+                "staYmd": "20250115",
+                "endYmd": "20250215",
+                "subJobCdNm": "Service & Business",
+                "empTypeCdNm": "정규직",
+            }
+            for i in range(first_index, min(first_index + 10, n))
+        ],
+    }
+
+
+def _toss(query: dict, n: int) -> dict:
+    return {
+        "resultType": "SUCCESS",
+        "success": [
+            {
+                "id": 5000 + i,
+                "title": f"Sales Manager {i}",
+                "company_name": "토스",
+                "first_published": "2025-01-15T09:00:00Z",
+                "absolute_url": f"https://toss.im/career/job-detail?job_id={5000 + i}",
+                "location": {"name": "Seoul"},
+                "metadata": [
+                    {"name": "Employment_Type_경력/신입", "value": "정규직"},
+                    {"name": "Job Category", "value": "Sales" if i % 2 else "Engineering"},
+                    {"name": "소속 자회사", "value": "토스뱅크"},
+                    {"name": "클로징 일자", "value": None},
+                ],
+            }
+            for i in range(n)
+        ],
+    }
+
+
+def _coupang(query: dict, n: int) -> dict:
+    return {
+        "jobs": [
+            {
+                "id": 7000 + i,
+                "title": f"서비스 기획 {i}" if i % 2 else f"Software Engineer {i}",
+                "first_published": "2025-01-15T09:00:00-05:00",
+                "absolute_url": f"https://www.coupang.jobs/kr/jobs/{7000 + i}",
+                "departments": [{"name": "Product"}],
+                "location": {"name": "Seoul, South Korea"},
+                "metadata": [{"id": 1, "name": "Employment Type", "value": "Contract" if i % 4 == 3 else "Full-time"}],
+            }
+            for i in range(n)
+        ],
+    }
+
+
+def _daangn(query: dict, n: int) -> dict:
+    nodes = [
+        {
+            "ghId": str(9000 + i),
+            "title": f"Business Manager {i}",
+            "corporate": "KARROT_MARKET",
+            "employmentType": "FULL_TIME" if i % 3 else "CONTRACTOR",
+            "absoluteUrl": f"https://about.daangn.com/jobs/{9000 + i}/",
+        }
+        for i in range(n)
+    ]
+    return {"result": {"data": {"allDepartmentFilteredJobPost": {"nodes": nodes}}}}
+
+
+def _baemin(query: dict, n: int) -> dict:
+    return {
+        "code": 2000,
+        "data": {
+            "totalSize": n,
+            "list": [
+                {
+                    "recruitNumber": f"R{2025000 + i}",
+                    "recruitName": f"B2B 영업 {i}",
+                    "recruitOpenDate": "2025-01-15 00:00:00",
+                    "recruitEndDate": "9999-12-31 23:59:59",
+                }
+                for i in range(n)
+            ],
+        },
+    }
+
+
+def _daangn_detail(job_id: str) -> dict:
+    return {
+        "id": int(job_id),
+        "first_published": "2025-01-15T09:00:00-05:00",
+        "location": {"name": "서울 서초구"},
+    }
+
+
+# crawler module name → stub path and payload builder
+FORMATS = {
+    "crawler": ("/kakao", _kakao),
+    "naver_crawler": ("/naver", _naver),
+    "toss_crawler": ("/toss", _toss),
+    "coupang_crawler": ("/coupang", _coupang),
+    "daangn_crawler": ("/daangn", _daangn),
+    "baemin_crawler": ("/baemin", _baemin),
+}
+
+# crawler module name → stub path prefix of its detail endpoint (spec.detail) and builder by job ID
+DETAIL_FORMATS = {
+    "daangn_crawler": ("/daangn/jobs/", _daangn_detail),
+}
+
+
+def load_fixtures(directory: Path = FIXTURE_DIR) -> dict[str, dict]:
+    """Recorded responses in *directory*, by crawler module name."""
+    return {path.stem: json.loads(path.read_text(encoding="utf-8"))
+            for path in sorted(directory.glob("*.json")) if path.stem in FORMATS}
+
+
+def fixture_jobs(document: dict, spec: base.SourceSpec) -> int:
+    """Size of the listing a recorded first response belongs to (its 1x)."""
+    recorded = len(base.compile_path(spec.jobs_path)(document) or [])
+    total = base.compile_path(spec.total_path)(document) if spec.total_path else None
+    if total is None:
+        return recorded
+    return int(total) * recorded if spec.pagination == "page" else int(total)
+
+
+def _with_path(node, keys: list[str], value):
+    """Copy of *node* with *value* at the path *keys*, copying only the containers on the path."""
+    if not keys:
+        return value
+    key, rest = keys[0], keys[1:]
+    if isinstance(node, list):
+        copy = list(node)
+        copy[int(key)] = _with_path(node[int(key)], rest, value)
+        return copy
+    copy = dict(node or {})
+    copy[key] = _with_path(copy.get(key), rest, value)
+    return copy
+
+
+def replay(document: dict, spec: base.SourceSpec) -> Callable[[dict, int], dict]:
+    """Payload builder serving a recorded response scaled to *n* postings.
+
+    Posting i is recorded posting i mod m (m recorded) with its ID suffixed
+    by i // m, so every copy is a distinct posting; pages are cut the way
+    *spec* requests them and the total (total_path) is rewritten to match.
+    """
+    recorded = base.compile_path(spec.jobs_path)(document) or []
+    id_field = spec.config.job_id_field
+    page_size = spec.page_size or len(recorded) or 1
+
+    def job(i: int) -> dict:
+        template = recorded[i % len(recorded)]
+        copy = i // len(recorded)
+        return {**template, id_field: f"{template[id_field]}-{copy}"} if copy else template
+
+    def build(query: dict, n: int) -> dict:
+        start, stop = 0, n if recorded else 0
+        if spec.pagination == "page":
+            start = (int(query.get(spec.page_param, ["1"])[0]) - 1) * page_size
+        elif spec.pagination == "offset":
+            start = int(query.get(spec.page_param, ["0"])[0])
+        if spec.pagination != "none":
+            stop = min(start + page_size, stop)
+        payload = _with_path(document, spec.jobs_path.split("."), [job(i) for i in range(start, stop)])
+        if spec.total_path:
+            total = max(1, -(-n // page_size)) if spec.pagination == "page" else n
+            payload = _with_path(payload, spec.total_path.split("."), total)
+        return payload
+
+    return build
+
+
+# ---------------------------------------------------------------------------
+# Local HTTP stub
+# ---------------------------------------------------------------------------
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency: float, jobs: int):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.latency = latency
+        self.jobs = jobs
+        self.routes = {path: builder for path, builder in FORMATS.values()}
+        self.detail_routes = {prefix: builder for prefix, builder in DETAIL_FORMATS.values()}
+        self.request_count = 0
+        self.bodies = {}  # (path, query, jobs) → encoded payload, built once
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: StubServer
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        builder = self.server.routes.get(url.path)
+        if builder is None:
+            prefix, _, job_id = url.path.rpartition("/")
+            detail = self.server.detail_routes.get(prefix + "/")
+            if detail is None or not job_id:
+                self.send_error(404)
+                return
+            builder = lambda query, jobs: detail(job_id)
+        with self.server._lock:
+            self.server.request_count += 1
+        time.sleep(self.server.latency)
+
+        key = (url.path, url.query, self.server.jobs)
+        body = self.server.bodies.get(key)
+        if body is None:
+            body = json.dumps(builder(parse_qs(url.query), self.server.jobs)).encode()
+            self.server.bodies[key] = body
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def stub_server(latency: float = DEFAULT_LATENCY, jobs: int = DEFAULT_JOBS, fixtures: dict[str, dict] | None = None):
+    """Start a StubServer and point every crawler module's source and detail URLs at it.
+
+    Sources with a recorded response in *fixtures* (see load_fixtures) are
+    served by replay() instead of their synthetic builder. CACHE_DIR points
+    at a throwaway directory meanwhile, so stub details never reach the real
+    detail cache.
+    """
+    server = StubServer(latency, jobs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    crawlers = run_all.discover_crawlers(list(FORMATS))
+    modules = {crawler.name: sys.modules[crawler.name] for crawler in crawlers}
+    for name, document in (fixtures or {}).items():
+        server.routes[FORMATS[name][0]] = replay(document, modules[name].SPEC)
+    original = {name: (module.SOURCE.url, module.SOURCE.detail_url) for name, module in modules.items()}
+    for name, module in modules.items():
+        module.SOURCE.url = server.base_url + FORMATS[name][0]
+        if name in DETAIL_FORMATS:
+            module.SOURCE.detail_url = server.base_url + DETAIL_FORMATS[name][0] + "{}"
+    original_cache_dir = base.CACHE_DIR
+    state_dir = tempfile.mkdtemp()
+    base.CACHE_DIR = Path(state_dir)
+    try:
+        yield server, run_all.discover_crawlers(list(FORMATS))
+    finally:
+        base.CACHE_DIR = original_cache_dir
+        shutil.rmtree(state_dir, ignore_errors=True)
+        for name, module in modules.items():
+            module.SOURCE.url, module.SOURCE.detail_url = original[name]
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def fake_sheets(crawlers: list):
+    """Route Sheets I/O to a FakeClient and keep run state in a throwaway CACHE_DIR."""
+    client = FakeClient()
+    original_cache_dir = base.CACHE_DIR
+    original_scheduler = sheets_io.SCHEDULER
+    original_env = {crawler.config.spreadsheet_env_var: os.environ.get(crawler.config.spreadsheet_env_var)
+                    for crawler in crawlers}
+    with tempfile.TemporaryDirectory() as state_dir:
+        base.CACHE_DIR = Path(state_dir)
+        base.use_google_client(client)
+        # 가짜 시트에는 쿼터가 없으므로 속도 제한 없이, 재시도 대기만 짧게
+        sheets_io.SCHEDULER = SheetsScheduler(per_minute=10**6, burst=10**6, backoff=0.01)
+        for env_var in original_env:
+            os.environ[env_var] = "bench"
+        try:
+            yield client
+        finally:
+            base.CACHE_DIR = original_cache_dir
+            sheets_io.SCHEDULER = original_scheduler
+            base.use_google_client(None)
+            for env_var, value in original_env.items():
+                if value is None:
+                    os.environ.pop(env_var, None)
+                else:
+                    os.environ[env_var] = value
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def fetch_results(crawlers: list, workers: int, per_host: int) -> tuple[float, dict]:
+    """Run the run_all fetch stage and return (elapsed seconds, sheet → rows)."""
+    shutil.rmtree(base.CACHE_DIR / "details", ignore_errors=True)  # 매 실행 같은 상세 요청을 보내도록
+    results = {}
+    started = time.perf_counter()
+    for crawler, future in run_all.fetch_concurrently(crawlers, workers, per_host):
+        for config, stream in future.result():
+            # 수집일시(마지막 컬럼)는 실행 시각이므로 비교에서 제외
+            results[config.sheet_name] = [row[:-1] for row in stream]
+    return time.perf_counter() - started, results
+
+
+def bench_fetch(args: argparse.Namespace) -> int:
+    with stub_server(args.latency, args.jobs) as (server, crawlers):
+        sequential, expected = fetch_results(crawlers, workers=1, per_host=1)
+        requests_per_run = server.request_count
+        concurrent, actual = fetch_results(crawlers, workers=args.workers, per_host=args.per_host)
+
+    identical = expected == actual
+    print(f"\n요청 수: {requests_per_run}회/실행, 지연 {args.latency:.2f}s/요청")
+    print(f"순차 fetch : {sequential:.2f}s")
+    print(f"동시 fetch : {concurrent:.2f}s (workers={args.workers}, per_host={args.per_host})")
+    print(f"속도 향상  : {sequential / concurrent:.1f}x")
+    print(f"결과 일치  : {'OK' if identical else 'MISMATCH'}")
+    return 0 if identical else 1
+
+
+def sync_all(crawlers: list) -> dict[str, Counter]:
+    """Fetch and sync every crawler once (crawler logs suppressed); returns Sheets calls per company."""
+    calls = {}
+    for crawler, future in run_all.fetch_concurrently(crawlers):
+        for config, stream in future.result():
+            before = Counter(API_CALLS)
+            with redirect_stdout(io.StringIO()):
+                base.sync_rows(config, stream, force=True)
+            calls[config.company_name] = API_CALLS - before
+    return calls
+
+
+def bench_sheets(args: argparse.Namespace) -> int:
+    with stub_server(0, args.jobs) as (server, crawlers), fake_sheets(crawlers) as client:
+        first = sync_all(crawlers)
+        second = sync_all(crawlers)
+        # 공고가 늘어난 재실행 — 429는 실제 쓰기가 일어나는 이 실행에 주입
+        server.jobs += 5
+        spreadsheet = client.open_by_key("bench")
+        spreadsheet.fail_next(*[429] * args.quota_errors)
+        third = sync_all(crawlers)
+        retried = dict(sheets_io.SCHEDULER.retried)
+
+        ok = True
+        for crawler in crawlers:
+            with redirect_stdout(io.StringIO()):
+                rows = list(base.JobStream(crawler.fetch_fn(), crawler.job_to_row_fn, crawler.filter_fn))
+            expected = sorted(str(row[8]) for row in rows)
+            written = spreadsheet.values(crawler.config.sheet_name)
+            ok &= written[0] == base.HEADER and sorted(row[8] for row in written[1:]) == expected
+
+    runs = (first, second, third)
+    print(f"\n{'회사':<6} {'최초 실행':>10} {'재실행':>8} {'공고 추가':>10}   (Sheets API 호출 수)")
+    for company in first:
+        print(f"{company:<6}" + "".join(f"{sum(run[company].values()):>{width}}"
+                                         for run, width in zip(runs, (11, 9, 11))))
+    print(f"{'합계':<6}" + "".join(f"{sum(sum(calls.values()) for calls in run.values()):>{width}}"
+                                 for run, width in zip(runs, (11, 9, 11))))
+    print(f"메서드별  : {dict(sum((Counter(calls) for run in runs for calls in run.values()), Counter()))}")
+    print(f"재시도    : {retried or '없음'}")
+    print(f"시트 내용 : {'OK' if ok else 'MISMATCH'}")
+    return 0 if ok else 1
+
+
+class NullSpreadsheet(FakeSpreadsheet):
+    """FakeSpreadsheet that checks grid limits and counts cells but keeps no values.
+
+    Used by the memory benchmark, so that the fake's own storage does not
+    dominate the measured RSS.
+    """
+
+    def __init__(self, spreadsheet_id: str = "null"):
+        super().__init__(spreadsheet_id)
+        self.cells_written = 0
+
+    def values_batch_update(self, body: dict) -> dict:
+        self._call("values_batch_update")
+        for entry in body.get("data", []):
+            title, _, first_row, _, _ = self._parse(entry["range"])
+            last_row = first_row + len(entry["values"]) - 1
+            if last_row > self.tabs[title]["rowCount"]:
+                raise api_error(400, f"Range ('{title}'!A{last_row}) exceeds grid limits.")
+            self.cells_written += sum(len(row) for row in entry["values"])
+        return {"spreadsheetId": self.id}
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss survives exec — a child would inherit the parent's peak (e.g. the stub's payloads),
+    # so prefer the peak of this process image (VmHWM, Linux)
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024  # KiB
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+
+
+def memory_child(args: argparse.Namespace) -> int:
+    """One measured pipeline run in a fresh process; prints a JSON result line."""
+    import crawler as kakao
+
+    page_size = 100
+    client = FakeClient()
+    client.spreadsheets["bench"] = NullSpreadsheet("bench")
+    base.use_google_client(client)
+    sheets_io.SCHEDULER = SheetsScheduler(per_minute=10**6, burst=10**6, backoff=0.01)
+    os.environ["BENCH_SPREADSHEET_ID"] = "bench"
+    config = base.CrawlerConfig("합성", "합성", "BENCH_SPREADSHEET_ID", "realId")
+
+    def fetch_page(index: int) -> dict:
+        return _kakao({"page": [str(index + 1)]}, args.jobs, page_size)
+
+    def filter_jobs(jobs):
+        return (job for job in jobs if job.get("employeeTypeName") == "정규직")
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        base.CACHE_DIR = Path(state_dir)
+        baseline = _peak_rss_mb()
+        started = time.perf_counter()
+        jobs = base.fetch_paginated(fetch_page, lambda page: page["jobList"], lambda page: page["totalPage"],
+                                    config.job_id_field)
+        with redirect_stdout(io.StringIO()):
+            if args.materialize:
+                # 이전 방식: 전체 목록 → 필터 목록 → 행 목록을 모두 메모리에 둔 뒤 기록
+                jobs = list(jobs)
+                jobs = list(filter_jobs(jobs))
+                data_rows = [kakao.SOURCE.job_to_row(job) for job in jobs]
+                base.sync_jobs(config, jobs, kakao.SOURCE.job_to_row)
+                del data_rows
+            else:
+                base.sync_jobs(config, jobs, kakao.SOURCE.job_to_row, filter_jobs)
+        elapsed = time.perf_counter() - started
+        written = client.spreadsheets["bench"].cells_written
+
+    print(json.dumps({"baseline_mb": baseline, "peak_mb": _peak_rss_mb(), "seconds": elapsed, "cells": written}))
+    return 0
+
+
+def bench_memory(args: argparse.Namespace) -> int:
+    sizes = sorted({max(1, args.jobs // 10), args.jobs})
+    print(f"\n{'공고 수':>8} {'방식':<8} {'최대 RSS':>10} {'증가분':>9} {'소요':>7}")
+    ok = True
+    for jobs in sizes:
+        for materialize in (False, True):
+            command = [sys.executable, __file__, "memory-child", "--jobs", str(jobs)]
+            if materialize:
+                command.append("--materialize")
+            result = subprocess.run(command, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(result.stderr)
+                return 1
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+            ok &= stats["cells"] >= jobs * len(base.HEADER)
+            print(f"{jobs:>8} {'리스트' if materialize else '스트리밍':<8} {stats['peak_mb']:>8.1f}MB "
+                  f"{stats['peak_mb'] - stats['baseline_mb']:>7.1f}MB {stats['seconds']:>6.1f}s")
+    print(f"시트 기록 : {'OK' if ok else 'MISMATCH'}")
+    return 0 if ok else 1
+
+
+def _encode_jobs(n: int) -> tuple[list[dict], list[dict]]:
+    """Synthetic Kakao and Naver jobs whose open/close dates spread over ~90 days."""
+    kakao_jobs, naver_jobs = [], []
+    for i in range(n):
+        opened = datetime(2025, 1, 1, 9) + timedelta(days=i % 90)
+        closed = opened + timedelta(days=30)
+        kakao_jobs.append({
+            "realId": f"P-{i}",
+            "companyName": "카카오",
+            "jobOfferTitle": f"서비스 기획 {i}",
+            "regDate": opened.isoformat(),
+            "endDate": closed.isoformat() if i % 3 else None,
+            "jobPartName": "서비스비즈",
+            "locationName": "판교",
+            "employeeTypeName": "정규직",
+        })
+        naver_jobs.append({
+            "annoId": 10000 + i,
+            "sysCompanyCdNm": "NAVER",
+            "annoSubject": f"사업개발 {i}",
+            "staYmd": opened.strftime("%Y%m%d"),
+            "endYmd": closed.strftime("%Y%m%d"),
+            "subJobCdNm": "Service & Business",
+            "empTypeCdNm": "정규직",
+        })
+    return kakao_jobs, naver_jobs
+
+
+# 이전 job_to_row 구현 (비교 기준): 행마다 list, 날짜 파싱, datetime.now()
+def _legacy_kakao_row(job: dict) -> list[str]:
+    format_date = base.format_date_iso.__wrapped__
+    real_id = job.get("realId", "")
+    url = f"https://careers.kakao.com/jobs/{real_id}" if real_id else ""
+    return [
+        job.get("companyName", ""),
+        job.get("jobOfferTitle", ""),
+        format_date(job.get("regDate"), default="상시채용"),
+        format_date(job.get("endDate"), default="상시채용"),
+        url,
+        job.get("jobPartName", "") or job.get("jobTypeName", ""),
+        job.get("locationName", ""),
+        job.get("employeeTypeName", ""),
+        real_id,
+        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    ]
+
+
+def _legacy_naver_row(job: dict) -> list[str]:
+    format_date = base.format_date_compact.__wrapped__
+    anno_id = str(job.get("annoId", ""))
+    url = f"https://recruit.navercorp.com/rcrt/view.do?annoId={anno_id}&lang=ko" if anno_id else ""
+    return [
+        job.get("sysCompanyCdNm", ""),
+        job.get("annoSubject", ""),
+        format_date(job.get("staYmd")),
+        format_date(job.get("endYmd")),
+        url,
+        job.get("subJobCdNm", ""),
+        "",
+        job.get("empTypeCdNm", ""),
+        anno_id,
+        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    ]
+
+
+def _encode(job_to_row, jobs: list[dict], repeat: int) -> tuple[float, int, list]:
+    """Return (best seconds over *repeat* runs, bytes retained by the rows, rows)."""
+    best = float("inf")
+    for _ in range(repeat):
+        base.format_date_iso.cache_clear()
+        base.format_date_compact.cache_clear()
+        started = time.perf_counter()
+        rows = [job_to_row(job) for job in jobs]
+        best = min(best, time.perf_counter() - started)
+        del rows
+    base.format_date_iso.cache_clear()
+    base.format_date_compact.cache_clear()
+    tracemalloc.start()
+    rows = [job_to_row(job) for job in jobs]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, retained, rows
+
+
+def bench_encode(args: argparse.Namespace) -> int:
+    import crawler as kakao
+    import naver_crawler as naver
+
+    kakao_jobs, naver_jobs = _encode_jobs(args.jobs)
+    base.start_run()
+    print(f"\n{'소스':<6} {'방식':<22} {'소요':>8} {'행당':>8} {'행 메모리':>10}")
+    ok = True
+    for name, jobs, legacy, current in (
+        ("카카오", kakao_jobs, _legacy_kakao_row, kakao.SOURCE.job_to_row),
+        ("네이버", naver_jobs, _legacy_naver_row, naver.SOURCE.job_to_row),
+    ):
+        results = {}
+        for label, job_to_row in (("list + 행별 파싱/now()", legacy), ("JobRow + 메모이즈", current)):
+            seconds, retained, rows = _encode(job_to_row, jobs, args.repeat)
+            results[label] = [list(row[:-1]) for row in rows]
+            print(f"{name:<6} {label:<22} {seconds:>7.3f}s {seconds / len(jobs) * 1e6:>6.2f}µs "
+                  f"{retained / 2**20:>8.1f}MB")
+            del rows
+        ok &= len({json.dumps(rows) for rows in results.values()}) == 1
+    print(f"결과 일치 : {'OK' if ok else 'MISMATCH'}")
+    return 0 if ok else 1
+
+
+# Sources whose listing is one response (SourceSpec.stream candidates)
+SINGLE_RESPONSE = ("toss_crawler", "coupang_crawler", "daangn_crawler")
+
+
+def _parse(source: base.Source, traced: bool) -> tuple[float, float, int, list]:
+    """Fetch + filter + job_to_row once; return (seconds to first row, total seconds, peak bytes, rows).
+
+    With *traced*, rows are dropped as they come so that the peak only covers the fetch itself.
+    """
+    kept = []
+    if traced:
+        tracemalloc.start()
+    with redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        first = None
+        for row in base.JobStream(source.fetch_all_jobs(), source.job_to_row, source.filter_fn):
+            if first is None:
+                first = time.perf_counter() - started
+            if not traced:
+                kept.append(row[:-1])  # 수집일시 제외
+        total = time.perf_counter() - started
+    peak = 0
+    if traced:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return first or total, total, peak, kept
+
+
+def bench_parse(args: argparse.Namespace) -> int:
+    print(f"\n{'소스':<16} {'방식':<14} {'첫 행까지':>9} {'전체':>8} {'최대 메모리':>11} {'공고':>7}")
+    ok = True
+    with stub_server(0, args.jobs):
+        for name in SINGLE_RESPONSE:
+            module = sys.modules[name]
+            results = []
+            for label, stream in (("response.json", False), ("증분 파싱", True)):
+                source = base.Source(replace(module.SPEC, stream=stream))
+                source.url, source.detail_url = module.SOURCE.url, module.SOURCE.detail_url
+                _parse(source, traced=False)  # 스텁의 페이로드 생성과 연결 수립을 측정에서 제외
+                first, total, _, rows = min((_parse(source, traced=False) for _ in range(args.repeat)),
+                                            key=lambda result: result[1])
+                _, _, peak, _ = _parse(source, traced=True)
+                results.append(rows)
+                print(f"{name:<16} {label:<14} {first * 1000:>7.1f}ms {total:>7.3f}s "
+                      f"{peak / 2**20:>9.1f}MB {len(rows):>7}")
+            ok &= results[0] == results[1]
+    print(f"결과 일치 : {'OK' if ok else 'MISMATCH'}")
+    return 0 if ok else 1
+
+
+# Scales of the suite, relative to a source's 1x (its recorded listing, or DEFAULT_JOBS).
+# 10,000x is opt-in (--scales 1,100,10000): paginated sources then take minutes per run
+SUITE_SCALES = (1, 100)
+
+# Slack below which a slower or larger result is not a regression (timer / RSS noise on small runs)
+REGRESSION_SECONDS = 0.05
+REGRESSION_MB = 5.0
+
+
+def suite_child(args: argparse.Namespace) -> int:
+    """run_crawler for one source in a fresh process, then again unchanged; prints a JSON result line."""
+    source = importlib.import_module(args.module).SOURCE
+    source.url = args.url
+    if args.detail_url:
+        source.detail_url = args.detail_url
+    client = FakeClient()
+    spreadsheet = client.spreadsheets["bench"] = NullSpreadsheet("bench")
+    base.use_google_client(client)
+    sheets_io.SCHEDULER = SheetsScheduler(per_minute=10**6, burst=10**6, backoff=0.01)
+    for output in source.outputs:
+        os.environ[output.config.spreadsheet_env_var] = "bench"
+    METRICS.timing = True
+
+    baseline = _peak_rss_mb()
+    runs = {}
+    for phase in ("initial", "rerun"):
+        METRICS.reset()
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            source.run(force=True)
+        runs[phase] = {"seconds": time.perf_counter() - started, "metrics": METRICS.report()}
+    print(json.dumps({"baseline_mb": baseline, "peak_mb": _peak_rss_mb(), "cells": spreadsheet.cells_written,
+                      "runs": runs}, ensure_ascii=False))
+    return 0
+
+
+def _run_summary(run: dict) -> dict:
+    """Totals of one suite_child run over the source's outputs."""
+    counts = [company["counts"] for company in run["metrics"]["companies"].values()]
+    return {
+        "seconds": run["seconds"],
+        "jobs": max((count.get("jobs_fetched", 0) for count in counts), default=0),
+        "kept": sum(count.get("jobs_kept", 0) for count in counts),
+        "http": sum(host["requests"] for host in run["metrics"]["http"].values()),
+        "sheets": sum(sum(count.get("sheets_api_calls", {}).values()) for count in counts),
+        "stages": run["metrics"]["stages"],
+    }
+
+
+def _regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Results worse than *baseline*: time or memory beyond *tolerance*, or any extra API call."""
+    found = []
+    for key, result in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        for field, slack, label in (
+            ("seconds", REGRESSION_SECONDS, "최초 실행 시간"),
+            ("rerun_seconds", REGRESSION_SECONDS, "재실행 시간"),
+            ("peak_mb", REGRESSION_MB, "메모리 증가"),
+        ):
+            if result[field] > before[field] * (1 + tolerance) + slack:
+                found.append(f"{key} {label}: {before[field]:.2f} → {result[field]:.2f}")
+        for field, label in (("http", "HTTP 요청"), ("sheets_initial", "Sheets API (최초)"),
+                             ("sheets_rerun", "Sheets API (재실행)")):
+            if result[field] > before[field]:
+                found.append(f"{key} {label}: {before[field]} → {result[field]}회")
+    return found
+
+
+def bench_suite(args: argparse.Namespace) -> int:
+    scales = [int(scale) for scale in args.scales.split(",")]
+    fixtures = load_fixtures(Path(args.fixtures))
+    names = [name for name in FORMATS
+             if not args.crawlers or name in args.crawlers or name.removesuffix("_crawler") in args.crawlers]
+    results = {}
+    ok = True
+    print(f"\n{'소스':<16} {'배율':>7} {'공고':>8} {'최초 실행':>9} {'공고/s':>9} {'재실행':>8} {'메모리':>8} "
+          f"{'HTTP':>6} {'Sheets':>7}  주요 단계 (최초 실행)")
+    with stub_server(args.latency, DEFAULT_JOBS, fixtures) as (server, crawlers), \
+            tempfile.TemporaryDirectory() as state_root:
+        specs = {crawler.name: sys.modules[crawler.name].SPEC for crawler in crawlers}
+        for name in names:
+            one_x = fixture_jobs(fixtures[name], specs[name]) if name in fixtures else DEFAULT_JOBS
+            for scale in scales:
+                server.jobs = one_x * scale
+                server.bodies.clear()
+                # 실행마다 빈 저장소·HTTP 캐시에서 시작; 보고서 파일은 쓰지 않음
+                env = {**os.environ, "CRAWLER_CACHE_DIR": tempfile.mkdtemp(dir=state_root)}
+                env.pop("CRAWLER_METRICS", None)
+                command = [sys.executable, __file__, "suite-child", name, "--url", server.base_url + FORMATS[name][0]]
+                if name in DETAIL_FORMATS:
+                    command += ["--detail-url", server.base_url + DETAIL_FORMATS[name][0] + "{}"]
+                result = subprocess.run(command, capture_output=True, text=True, env=env)
+                if result.returncode != 0:
+                    print(result.stderr)
+                    return 1
+                child = json.loads(result.stdout.strip().splitlines()[-1])
+                initial = _run_summary(child["runs"]["initial"])
+                rerun = _run_summary(child["runs"]["rerun"])
+                ok &= initial["jobs"] == server.jobs and child["cells"] >= initial["kept"] * len(base.HEADER)
+                results[f"{name}@{scale}x"] = record = {
+                    "payload": "fixture" if name in fixtures else "synthetic",
+                    "jobs": initial["jobs"],
+                    "kept": initial["kept"],
+                    "seconds": initial["seconds"],
+                    "jobs_per_second": initial["jobs"] / initial["seconds"],
+                    "rerun_seconds": rerun["seconds"],
+                    "peak_mb": child["peak_mb"] - child["baseline_mb"],
+                    "http": initial["http"],
+                    "sheets_initial": initial["sheets"],
+                    "sheets_rerun": rerun["sheets"],
+                    "stages": initial["stages"],
+                    "rerun_stages": rerun["stages"],
+                }
+                top = sorted(initial["stages"].items(), key=lambda item: -item[1])[:3]
+                print(f"{name:<16} {scale:>6}x {record['jobs']:>8} {record['seconds']:>8.2f}s "
+                      f"{record['jobs_per_second']:>9.0f} {record['rerun_seconds']:>7.2f}s "
+                      f"{record['peak_mb']:>6.1f}MB {record['http']:>6} "
+                      f"{record['sheets_initial']:>3}/{record['sheets_rerun']:<3}  "
+                      + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in top))
+
+    print(f"시트 기록 : {'OK' if ok else 'MISMATCH'}")
+    if args.save:
+        Path(args.save).write_text(json.dumps({"scales": scales, "results": results}, ensure_ascii=False, indent=2))
+        print(f"결과 저장 : {args.save}")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())["results"]
+        regressions = _regressions(results, baseline, args.tolerance)
+        print(f"기준 비교 : {args.compare} — " + (f"회귀 {len(regressions)}건" if regressions else "회귀 없음"))
+        for regression in regressions:
+            print(f"  {regression}")
+        ok &= not regressions
+    return 0 if ok else 1
+
+
+def bench_record(args: argparse.Namespace) -> int:
+    """Save each source's first live response to the fixture directory."""
+    directory = Path(args.fixtures)
+    directory.mkdir(parents=True, exist_ok=True)
+    failed = 0
+    for crawler in run_all.discover_crawlers(args.crawlers or None):
+        source = getattr(sys.modules[crawler.name], "SOURCE", None)
+        if crawler.name not in FORMATS or source is None:
+            continue
+        try:
+            with redirect_stdout(io.StringIO()):
+                document = source.fetch_page(0)
+        except Exception as error:
+            print(f"{crawler.name}: 실패 — {error}")
+            failed += 1
+            continue
+        path = directory / f"{crawler.name}.json"
+        path.write_text(json.dumps(document, ensure_ascii=False, indent=1), encoding="utf-8")
+        recorded = len(base.compile_path(source.spec.jobs_path)(document) or [])
+        print(f"{crawler.name}: {recorded}건 기록 (1x = {fixture_jobs(document, source.spec)}건) → {path}")
+    return 1 if failed else 0
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="오프라인 크롤러 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    fetch = sub.add_parser("fetch", help="순차 vs 동시 fetch 비교 (로컬 스텁 서버)")
+    fetch.add_argument("--latency", type=float, default=DEFAULT_LATENCY, help="요청당 인위적 지연 (초)")
+    fetch.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="회사별 공고 수")
+    fetch.add_argument("--workers", type=int, default=run_all.DEFAULT_WORKERS)
+    # 스텁은 모든 회사를 한 호스트(127.0.0.1)로 서빙하므로 호스트 제한을 workers에 맞춤
+    fetch.add_argument("--per-host", type=int, default=run_all.DEFAULT_WORKERS)
+    fetch.set_defaults(func=bench_fetch)
+
+    sheets = sub.add_parser("sheets", help="회사별 Sheets API 호출 수 (메모리 내 가짜 시트)")
+    sheets.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="회사별 공고 수")
+    sheets.add_argument("--quota-errors", type=int, default=0, help="공고 추가 실행 시작 시 주입할 429 응답 수")
+    sheets.set_defaults(func=bench_sheets)
+
+    memory = sub.add_parser("memory", help="합성 대용량 소스로 스트리밍 vs 리스트 파이프라인의 최대 RSS 비교")
+    memory.add_argument("--jobs", type=int, default=100_000, help="합성 소스의 공고 수")
+    memory.set_defaults(func=bench_memory)
+
+    encode = sub.add_parser("encode", help="job_to_row 행 인코딩: 행별 list + 매번 날짜 파싱 vs JobRow + 메모이즈")
+    encode.add_argument("--jobs", type=int, default=100_000, help="소스별 합성 공고 수")
+    encode.add_argument("--repeat", type=int, default=3, help="반복 측정 횟수 (최솟값 사용)")
+    encode.set_defaults(func=bench_encode)
+
+    parse = sub.add_parser("parse", help="단일 응답 소스: response.json() vs 증분 파싱 (첫 행까지 시간, 최대 메모리)")
+    parse.add_argument("--jobs", type=int, default=20_000, help="소스별 합성 공고 수")
+    parse.add_argument("--repeat", type=int, default=3, help="반복 측정 횟수 (최솟값 사용)")
+    parse.set_defaults(func=bench_parse)
+
+    suite = sub.add_parser("suite", help="소스 × 배율별 run_crawler 전체 실행: 처리량·최대 메모리·API 호출·단계별 시간")
+    suite.add_argument("crawlers", nargs="*", help="대상 크롤러 (예: toss, naver_crawler). 생략 시 전체")
+    suite.add_argument("--scales", default=",".join(map(str, SUITE_SCALES)),
+                       help="1x(기록된 응답 또는 합성 25건) 대비 배율, 쉼표로 구분")
+    suite.add_argument("--latency", type=float, default=0.0, help="요청당 인위적 지연 (초)")
+    suite.add_argument("--fixtures", default=str(FIXTURE_DIR), help="기록된 응답 디렉터리 (없으면 합성 응답)")
+    suite.add_argument("--save", metavar="PATH", help="결과를 기준 파일로 저장")
+    suite.add_argument("--compare", metavar="PATH", help="기준 파일과 비교해 회귀가 있으면 종료 코드 1")
+    suite.add_argument("--tolerance", type=float, default=0.25, help="시간·메모리 허용 증가율")
+    suite.set_defaults(func=bench_suite)
+
+    record = sub.add_parser("record", help="실제 API의 첫 응답을 픽스처로 저장 (네트워크 필요)")
+    record.add_argument("crawlers", nargs="*", help="대상 크롤러. 생략 시 전체")
+    record.add_argument("--fixtures", default=str(FIXTURE_DIR), help="저장할 디렉터리")
+    record.set_defaults(func=bench_record)
+
+    suite_run = sub.add_parser("suite-child")  # bench_suite가 소스·배율마다 새 프로세스로 실행
+    suite_run.add_argument("module")
+    suite_run.add_argument("--url", required=True)
+    suite_run.add_argument("--detail-url", default="")
+    suite_run.set_defaults(func=suite_child)
+
+    child = sub.add_parser("memory-child")  # bench_memory가 측정마다 새 프로세스로 실행
+    child.add_argument("--jobs", type=int, required=True)
+    child.add_argument("--materialize", action="store_true")
+    child.set_defaults(func=memory_child)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,176 @@
+"""In-memory stand-in for a gspread Client/Spreadsheet — for offline runs and benchmarks.
+
+Implements the subset of the gspread Spreadsheet API that sheets_io.SheetIO
+uses (fetch_sheet_metadata, values_batch_get, values_batch_update, batch_update)
+with Sheets-like semantics: A1 ranges with quoted titles, grid limits,
+trailing empty rows/cells omitted from reads. Every call is counted in `calls`.
+fail_next() queues API errors (e.g. 429 quota exhaustion) for the next calls.
+
+    from base import use_google_client
+    from fake_sheets import FakeClient
+
+    use_google_client(FakeClient())   # run_crawler / run_all now write here
+"""
+
+import json
+import re
+from collections import Counter
+
+import requests
+from gspread.exceptions import APIError
+
+_RANGE_RE = re.compile(r"^'((?:[^']|'')*)'!([A-Z]+)(\d*)(?::([A-Z]+)(\d*))?$")
+
+
+def api_error(status: int, message: str) -> APIError:
+    """Build a gspread APIError carrying a Google-style JSON error body."""
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps({"error": {"code": status, "message": message, "status": message}}).encode()
+    return APIError(response)
+
+
+def _column_number(letters: str) -> int:
+    number = 0
+    for char in letters:
+        number = number * 26 + ord(char) - ord("A") + 1
+    return number
+
+
+class FakeSpreadsheet:
+    """One spreadsheet: tabs of string cells, keyed by title."""
+
+    def __init__(self, spreadsheet_id: str = "fake"):
+        self.id = spreadsheet_id
+        self.calls: Counter = Counter()
+        self.tabs: dict[str, dict] = {}
+        self._next_sheet_id = 1
+        self._failures: list[int] = []
+
+    def fail_next(self, *statuses: int) -> None:
+        """Make the next len(statuses) API calls raise APIError with these statuses, in order."""
+        self._failures.extend(statuses)
+
+    def _call(self, method: str) -> None:
+        self.calls[method] += 1
+        if self._failures:
+            status = self._failures.pop(0)
+            message = "RESOURCE_EXHAUSTED: Quota exceeded" if status == 429 else "Backend error"
+            raise api_error(status, message)
+
+    # -- helpers -------------------------------------------------------------
+
+    def add_tab(self, title: str, rows: int = 1000, cols: int = 26) -> dict:
+        if title in self.tabs:
+            raise api_error(400, f'A sheet with the name "{title}" already exists.')
+        tab = {"sheetId": self._next_sheet_id, "rowCount": rows, "columnCount": cols, "values": []}
+        self._next_sheet_id += 1
+        self.tabs[title] = tab
+        return tab
+
+    def values(self, title: str) -> list[list[str]]:
+        """Return the tab's cells with trailing empty cells and rows trimmed (as Sheets does)."""
+        rows = [list(row) for row in self.tabs[title]["values"]]
+        for row in rows:
+            while row and row[-1] == "":
+                row.pop()
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    def _parse(self, a1: str) -> tuple[str, int, int, int | None, int | None]:
+        """Return (title, first col, first row, last col, last row); None = open-ended."""
+        match = _RANGE_RE.match(a1)
+        if not match:
+            raise api_error(400, f"Unable to parse range: {a1}")
+        title = match.group(1).replace("''", "'")
+        if title not in self.tabs:
+            raise api_error(400, f"Unable to parse range: {a1}")
+        first_col = _column_number(match.group(2))
+        first_row = int(match.group(3) or 1)
+        last_col = _column_number(match.group(4)) if match.group(4) else first_col
+        last_row = int(match.group(5)) if match.group(5) else (None if not match.group(3) else first_row)
+        return title, first_col, first_row, last_col, last_row
+
+    # -- gspread Spreadsheet API ---------------------------------------------
+
+    def fetch_sheet_metadata(self, params=None) -> dict:
+        self._call("fetch_sheet_metadata")
+        return {
+            "properties": {"title": self.id},
+            "sheets": [
+                {"properties": {
+                    "sheetId": tab["sheetId"],
+                    "title": title,
+                    "index": index,
+                    "gridProperties": {"rowCount": tab["rowCount"], "columnCount": tab["columnCount"]},
+                }}
+                for index, (title, tab) in enumerate(self.tabs.items())
+            ],
+        }
+
+    def values_batch_get(self, ranges: list[str], params=None) -> dict:
+        self._call("values_batch_get")
+        value_ranges = []
+        for a1 in ranges:
+            title, first_col, first_row, last_col, last_row = self._parse(a1)
+            rows = self.values(title)[first_row - 1:last_row]
+            rows = [row[first_col - 1:last_col] for row in rows]
+            while rows and not rows[-1]:
+                rows.pop()
+            value_ranges.append({"range": a1, "majorDimension": "ROWS", "values": rows} if rows else {"range": a1})
+        return {"spreadsheetId": self.id, "valueRanges": value_ranges}
+
+    def values_batch_update(self, body: dict) -> dict:
+        self._call("values_batch_update")
+        # Validate every range before applying any, so a failed batch changes nothing (as in Sheets)
+        parsed = [(self._parse(entry["range"]), entry["values"]) for entry in body.get("data", [])]
+        for (title, first_col, first_row, _, _), values in parsed:
+            tab = self.tabs[title]
+            if first_row + len(values) - 1 > tab["rowCount"]:
+                raise api_error(400, f"Range ('{title}'!A{first_row + len(values) - 1}) exceeds grid limits.")
+        for (title, first_col, first_row, _, _), values in parsed:
+            cells = self.tabs[title]["values"]
+            for offset, row in enumerate(values):
+                index = first_row - 1 + offset
+                while len(cells) <= index:
+                    cells.append([])
+                target = cells[index]
+                while len(target) < first_col - 1 + len(row):
+                    target.append("")
+                target[first_col - 1:first_col - 1 + len(row)] = ["" if value is None else str(value) for value in row]
+        return {"spreadsheetId": self.id, "totalUpdatedCells": sum(len(row) for _, values in parsed for row in values)}
+
+    def batch_update(self, body: dict) -> dict:
+        self._call("batch_update")
+        replies = []
+        for request in body.get("requests", []):
+            if "addSheet" in request:
+                properties = request["addSheet"]["properties"]
+                grid = properties.get("gridProperties", {})
+                tab = self.add_tab(properties["title"], grid.get("rowCount", 1000), grid.get("columnCount", 26))
+                replies.append({"addSheet": {"properties": {
+                    "sheetId": tab["sheetId"],
+                    "title": properties["title"],
+                    "gridProperties": {"rowCount": tab["rowCount"], "columnCount": tab["columnCount"]},
+                }}})
+            elif "appendDimension" in request:
+                dimension = request["appendDimension"]
+                tab = next(tab for tab in self.tabs.values() if tab["sheetId"] == dimension["sheetId"])
+                tab["rowCount"] += dimension["length"]
+                replies.append({})
+            else:
+                raise api_error(400, f"Unsupported request: {sorted(request)}")
+        return {"spreadsheetId": self.id, "replies": replies}
+
+
+class FakeClient:
+    """gspread Client stand-in; open_by_key returns one FakeSpreadsheet per key."""
+
+    def __init__(self):
+        self.spreadsheets: dict[str, FakeSpreadsheet] = {}
+
+    def open_by_key(self, key: str) -> FakeSpreadsheet:
+        if key not in self.spreadsheets:
+            self.spreadsheets[key] = FakeSpreadsheet(key)
+        return self.spreadsheets[key]
@@ -0,0 +1,932 @@
+"""Local persistent job store (SQLite) — the source of truth for every company tab.
+
+Each run upserts the crawled rows into the `jobs` table, keyed by (source,
+공고ID) where the source is the company's sheet tab. Postings that were open
+but are missing from the run are closed with an indexed set difference in
+SQL, so nothing has to be read back from the spreadsheet to find them.
+
+The Sheets tabs are a projection of the store. The store remembers which
+data row (`slot`) each open posting occupies and how many rows each tab
+uses, so a run can plan its writes — archive appends, inserts into freed
+slots, in-place changes, compaction — without reading the sheet. 수집일시 is
+each posting's first_seen, so it survives rewrites. Every run also logs its
+new / reopened / closed postings as events, projected to a compact Delta
+tab. summarize() aggregates a spreadsheet's open postings for the Summary
+tab the newsletter reads.
+
+Closed postings are archived once per spreadsheet: the `archive` index
+maps each archived 공고ID + URL to its archive tab and row, so a posting
+that closes again is rewritten in place and every run only writes its own
+closings (plan_archive). Archive tabs are partitioned by a caller-supplied
+function (e.g. by month); stage_archive / compaction_blocks rewrite them
+de-duplicated and rebuild the index from what the sheets hold.
+
+Projection state only advances after the Sheets write succeeded
+(apply_projection, apply_archive), so a failed or offline run is caught up
+by the next one.
+
+Rows flow through without being held in memory: stage_run() consumes any
+iterable of rows into a temporary table, and the planned writes are read
+back from SQL in chunks (projection_blocks, archive_blocks, delta_blocks).
+
+    store = JobStore(CACHE_DIR / "jobs.sqlite3")
+    store.stage_run(rows)                        # rows: any iterable, consumed once
+    delta = store.record_run("카카오", now)
+    projection = store.plan_projection("카카오", tab_rows)
+    archive = store.plan_archive(spreadsheet_id, "카카오", partition, tab_rows, HEADER)
+    ... write store.projection_blocks(projection, 1000) / store.archive_blocks(archive, 1000) ...
+    store.apply_projection(projection, spreadsheet_id)
+    store.apply_archive(archive, now)
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from itertools import chain, islice, repeat
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+# Columns A–I in HEADER order (회사 … 공고ID)
+DATA_COLUMNS = (
+    "company", "title", "reg_date", "end_date", "url",
+    "category", "location", "employment_type", "job_id",
+)
+# A change in any of these rewrites the row
+CONTENT_COLUMNS = DATA_COLUMNS[:-1]
+# Projected row: columns A–I plus 수집일시 (J), which is the posting's first_seen
+ROW_COLUMNS = DATA_COLUMNS + ("first_seen",)
+
+# Bumped on incompatible schema changes; an older store is rebuilt from the sheets
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    source          TEXT NOT NULL,
+    job_id          TEXT NOT NULL,
+    company         TEXT NOT NULL DEFAULT '',
+    title           TEXT NOT NULL DEFAULT '',
+    reg_date        TEXT NOT NULL DEFAULT '',
+    end_date        TEXT NOT NULL DEFAULT '',
+    url             TEXT NOT NULL DEFAULT '',
+    category        TEXT NOT NULL DEFAULT '',
+    location        TEXT NOT NULL DEFAULT '',
+    employment_type TEXT NOT NULL DEFAULT '',
+    first_seen      TEXT NOT NULL,
+    last_seen       TEXT NOT NULL,
+    closed_at       TEXT,
+    archived_at     TEXT,
+    seq             INTEGER NOT NULL DEFAULT 0,
+    slot            INTEGER,
+    dirty           INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (source, job_id)
+);
+CREATE INDEX IF NOT EXISTS jobs_open ON jobs (source, closed_at);
+CREATE INDEX IF NOT EXISTS jobs_slot ON jobs (source, slot);
+
+-- Per-run new / reopened / closed postings, projected to the Delta tab
+CREATE TABLE IF NOT EXISTS events (
+    source          TEXT NOT NULL,
+    job_id          TEXT NOT NULL,
+    run_at          TEXT NOT NULL,
+    kind            TEXT NOT NULL,
+    projected       INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS events_pending ON events (source, projected);
+CREATE INDEX IF NOT EXISTS events_run ON events (run_at);
+
+-- Archive index: the archive tab row of every archived posting, one per 공고ID + URL
+-- (unique across companies, so rows read back from a sheet need no source)
+CREATE TABLE IF NOT EXISTS archive (
+    spreadsheet_id  TEXT NOT NULL,
+    job_id          TEXT NOT NULL,
+    url             TEXT NOT NULL,
+    tab             TEXT NOT NULL,
+    row             INTEGER NOT NULL,
+    PRIMARY KEY (spreadsheet_id, job_id, url)
+);
+
+CREATE TABLE IF NOT EXISTS tabs (
+    spreadsheet_id  TEXT NOT NULL,
+    title           TEXT NOT NULL,
+    rows            INTEGER NOT NULL,
+    PRIMARY KEY (spreadsheet_id, title)
+);
+"""
+
+
+def pad_row(row: list[str]) -> list[str]:
+    """Pad or trim a row to the ROW_COLUMNS width (Sheets drops trailing empty cells)."""
+    width = len(ROW_COLUMNS)
+    return (["" if value is None else str(value) for value in row] + [""] * width)[:width]
+
+
+@dataclass
+class RunDelta:
+    """Counts of what one record_run() changed in the store.
+
+    The run's events are the source's events with a rowid above *events_after*
+    (see run_events).
+    """
+    new: int = 0
+    reopened: int = 0
+    closed: int = 0
+    events_after: int = 0
+
+
+@dataclass
+class Projection:
+    """Planned Sheets writes that bring one tab in line with the store.
+
+    The rows themselves stay in SQL (a temporary `plan` table of slot →
+    posting) and are streamed by JobStore.projection_blocks().
+
+    Attributes:
+        source: Store source (= sheet tab title).
+        header: Header row to write at row 1, or None to leave row 1 alone.
+        row_count: Rows the tab uses after the writes, header included.
+        stats: {"inserted", "deleted", "changed"} counts for the log.
+    """
+    source: str
+    header: list[str] | None
+    row_count: int
+    stats: dict
+
+
+@dataclass
+class ArchiveProjection:
+    """Planned archive writes for one source's newly closed postings (see plan_archive).
+
+    The rows stay in SQL (a temporary `archive_plan` table of archive tab
+    row → posting) and are streamed by JobStore.archive_blocks().
+
+    Attributes:
+        spreadsheet_id: Spreadsheet holding the archive tabs.
+        source: Source whose closed postings are archived.
+        header: Header row written at row 1 of tabs listed in *new_tabs*.
+        new_tabs: Archive tabs that were empty and get the header.
+        row_counts: Archive tab → rows it uses after the writes, header included.
+        appended: Postings appended (never archived before).
+        updated: Postings rewritten in place (archived before, reopened, closed again).
+    """
+    spreadsheet_id: str
+    source: str
+    header: list[str]
+    new_tabs: list[str]
+    row_counts: dict[str, int]
+    appended: int
+    updated: int
+
+
+@dataclass
+class ArchiveCompaction:
+    """Planned rewrite of every archive tab of a spreadsheet (see stage_archive).
+
+    Attributes:
+        spreadsheet_id: Spreadsheet holding the archive tabs.
+        header: Header row written at row 1 of every tab.
+        before: Archive tab → rows it used before, header included.
+        row_counts: Archive tab → rows it uses after the rewrite, header included.
+        read: Data rows read.
+        duplicates: Rows dropped as repeats of a 공고ID + URL.
+    """
+    spreadsheet_id: str
+    header: list[str]
+    before: dict[str, int]
+    row_counts: dict[str, int]
+    read: int
+    duplicates: int
+
+
+@dataclass
+class DeltaProjection:
+    """Planned Delta tab writes for one run (see plan_delta / delta_blocks).
+
+    Attributes:
+        source: Source whose pending events are written.
+        start_row: 1-based row where the writes start (1 when rewriting).
+        header: Delta tab header row, written when rewriting.
+        blank_rows: Leftover rows to blank after a rewrite.
+        row_count: Rows the tab uses after the writes, header included.
+        sources: Sources whose events share the tab.
+        since: Cutoff used when the tab is rewritten; None when only appending.
+        labels: Event kind → 구분 label.
+    """
+    source: str
+    start_row: int
+    header: list[str] | None
+    blank_rows: int
+    row_count: int
+    sources: list[str]
+    since: str | None
+    labels: dict[str, str]
+
+
+@dataclass
+class JobSummary:
+    """Open postings of a spreadsheet's company tabs, aggregated for the newsletter (see summarize).
+
+    A posting listed in several tabs (profiles) counts once.
+
+    Attributes:
+        total: Open postings.
+        new: Postings new or reopened since the cutoff.
+        groups: Group → open postings, in the order of the groups passed in ("기타" last, if any).
+        recent: Rows [회사 … 공고ID] registered within the window, newest first.
+        urgent: Rows closing within the window, soonest first.
+    """
+    total: int
+    new: int
+    groups: dict[str, int]
+    recent: list[list[str]]
+    urgent: list[list[str]]
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Yield lists of up to *size* items from *items*."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def tab_blocks(rows: Iterable[tuple[str, int, list[str]]], max_rows: int) -> Iterator[tuple[str, int, list[list[str]]]]:
+    """Group (tab, 1-based row, values) ordered by tab and row into blocks of at most *max_rows* consecutive rows."""
+    title, start, block = None, 0, []
+    for tab, row, values in rows:
+        if block and (tab != title or start + len(block) != row or len(block) >= max_rows):
+            yield title, start, block
+            block = []
+        if not block:
+            title, start = tab, row
+        block.append(values)
+    if block:
+        yield title, start, block
+
+
+def _with_headers(rows: Iterable[tuple[str, int, list[str]]], tabs: list[str],
+                  header: list[str]) -> Iterator[tuple[str, int, list[str]]]:
+    """Insert *header* as row 1 of each tab in *tabs* ahead of its rows (ordered by tab)."""
+    pending = set(tabs)
+    for title, row, values in rows:
+        if title in pending:
+            pending.discard(title)
+            yield title, 1, header
+        yield title, row, values
+    for title in sorted(pending):
+        yield title, 1, header
+
+
+class JobStore:
+    """SQLite-backed job history plus the sheet projection state."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.executescript("DROP TABLE IF EXISTS jobs; DROP TABLE IF EXISTS events; DROP TABLE IF EXISTS tabs;")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # -- projection bookkeeping ------------------------------------------------
+
+    def tab_rows(self, spreadsheet_id: str, title: str) -> int | None:
+        """Rows in use in a tab as of the last projection, or None if the store never wrote it."""
+        row = self.conn.execute(
+            "SELECT rows FROM tabs WHERE spreadsheet_id = ? AND title = ?", (spreadsheet_id, title)
+        ).fetchone()
+        return row[0] if row else None
+
+    def adopt_sheet(self, source: str, rows: list[list[str]], now: str) -> None:
+        """Take the tab's current data rows (header excluded) as the projection baseline.
+
+        Used when the store has no projection state for the tab (first run,
+        lost cache, --full-replace). Postings already in the store take the
+        slot they occupy in the sheet; unknown ones are inserted as open, so
+        the next record_run() closes those that are gone. Blank, ID-less and
+        duplicate rows get no posting, so the projection overwrites or clears them.
+        """
+        seen = set()
+        with self.conn:
+            self.conn.execute("UPDATE jobs SET slot = NULL WHERE source = ? AND slot IS NOT NULL", (source,))
+            for slot, row in enumerate((pad_row(row) for row in rows), start=1):
+                job_id = row[8]
+                if not job_id or job_id in seen:
+                    continue
+                seen.add(job_id)
+                self.conn.execute(
+                    f"""
+                    INSERT INTO jobs (source, {", ".join(ROW_COLUMNS)}, last_seen, slot, dirty)
+                    VALUES (?, {", ".join("?" * len(ROW_COLUMNS))}, ?, ?, 0)
+                    ON CONFLICT (source, job_id) DO UPDATE SET
+                        slot = excluded.slot,
+                        closed_at = NULL,
+                        dirty = ({" OR ".join(f"jobs.{column} IS NOT excluded.{column}" for column in CONTENT_COLUMNS)})
+                    """,
+                    # 기존 수집일시를 first_seen으로 이어받음
+                    (source, *row[:-1], row[-1] or now, now, slot),
+                )
+
+    # -- lifecycle ---------------------------------------------------------------
+
+    def stage_run(self, rows: Iterable[list[str]]) -> int:
+        """Consume one crawl's rows into a temporary table; returns the rows skipped for lacking a 공고ID.
+
+        *rows* may be any iterable (e.g. a generator over API pages); it is
+        inserted as it is produced, so memory does not grow with the crawl
+        size. The first row wins for a repeated 공고ID. Nothing permanent
+        changes until record_run().
+        """
+        skipped = 0
+
+        def valid(rows):
+            nonlocal skipped
+            for seq, row in enumerate(rows):
+                row = pad_row(row)
+                if not row[8]:
+                    skipped += 1
+                    continue
+                yield (seq, *row[:len(DATA_COLUMNS)])
+
+        with self.conn:
+            self.conn.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS run_rows "
+                f"(seq INTEGER, {', '.join(DATA_COLUMNS)}, PRIMARY KEY (job_id))"
+            )
+            self.conn.execute("DELETE FROM temp.run_rows")
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO temp.run_rows VALUES (?, {', '.join('?' * len(DATA_COLUMNS))})",
+                valid(rows),
+            )
+        return skipped
+
+    def record_run(self, source: str, now: str) -> RunDelta:
+        """Upsert the staged rows and close the open postings they no longer contain.
+
+        The rows' 수집일시 column is ignored: a posting keeps the first_seen of
+        the run that first saw it. A posting whose columns A–I changed is
+        marked dirty. A closed posting that reappears is reopened (and will be
+        archived again when it closes). New, reopened and closed postings are
+        logged as events for the Delta tab.
+        """
+        delta = RunDelta(events_after=self.conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM events").fetchone()[0])
+        with self.conn:
+            # Events first, while the pre-run state is still visible
+            events = {
+                "new": "SELECT ?, r.job_id, ?, 'new' FROM temp.run_rows r "
+                       "LEFT JOIN jobs j ON j.source = ? AND j.job_id = r.job_id "
+                       "WHERE j.job_id IS NULL ORDER BY r.seq",
+                "reopened": "SELECT ?, r.job_id, ?, 'reopened' FROM temp.run_rows r "
+                            "JOIN jobs j ON j.source = ? AND j.job_id = r.job_id "
+                            "WHERE j.closed_at IS NOT NULL ORDER BY r.seq",
+                "closed": "SELECT ?, job_id, ?, 'closed' FROM jobs WHERE source = ? AND closed_at IS NULL "
+                          "AND job_id NOT IN (SELECT job_id FROM temp.run_rows)",
+            }
+            for kind, select in events.items():
+                cursor = self.conn.execute(
+                    f"INSERT INTO events (source, job_id, run_at, kind) {select}", (source, now, source))
+                setattr(delta, kind, cursor.rowcount)
+
+            changed = " OR ".join(f"jobs.{column} IS NOT excluded.{column}" for column in CONTENT_COLUMNS)
+            self.conn.execute(
+                f"""
+                INSERT INTO jobs (source, {", ".join(DATA_COLUMNS)}, first_seen, last_seen, seq)
+                SELECT ?, {", ".join(DATA_COLUMNS)}, ?, ?, seq FROM temp.run_rows WHERE true
+                ON CONFLICT (source, job_id) DO UPDATE SET
+                    {", ".join(f"{column} = excluded.{column}" for column in CONTENT_COLUMNS)},
+                    dirty = jobs.dirty OR {changed},
+                    last_seen = excluded.last_seen,
+                    seq = excluded.seq,
+                    archived_at = CASE WHEN jobs.closed_at IS NULL THEN jobs.archived_at END,
+                    closed_at = NULL
+                """,
+                (source, now, now),
+            )
+            self.conn.execute(
+                "UPDATE jobs SET closed_at = ? WHERE source = ? AND closed_at IS NULL "
+                "AND job_id NOT IN (SELECT job_id FROM temp.run_rows)",
+                (now, source),
+            )
+        return delta
+
+    # -- projection ----------------------------------------------------------------
+
+    def _count(self, where: str, params: tuple) -> int:
+        return self.conn.execute(f"SELECT COUNT(*) FROM jobs WHERE source = ? AND {where}", params).fetchone()[0]
+
+    def _holes(self, source: str, tab_rows: int) -> Iterator[int]:
+        """Data slots below *tab_rows* not held by an open posting (freed, blank or junk rows), ascending."""
+        occupied = self.conn.execute(
+            "SELECT slot FROM jobs WHERE source = ? AND closed_at IS NULL AND slot IS NOT NULL ORDER BY slot",
+            (source,),
+        )
+        slot = 1
+        for (taken,) in occupied:
+            yield from range(slot, min(taken, tab_rows))
+            slot = taken + 1
+        yield from range(slot, tab_rows)
+
+    def plan_projection(
+        self,
+        source: str,
+        tab_rows: int,
+        full_replace: bool = False,
+        header: list[str] | None = None,
+    ) -> Projection:
+        """Plan the writes that make the tab show exactly the open postings.
+
+        By default open postings keep their slot: slots freed by closed
+        postings are reused for new ones in crawl order, leftover new postings
+        are appended, and leftover holes are filled by moving rows up from the
+        bottom so the data stays contiguous. Rows whose columns A–I changed are
+        rewritten in place. With *full_replace* every open posting is rewritten,
+        sorted by 회사 / 등록일 (newest first).
+
+        The plan (slot → 공고ID, or blank) is kept in a temporary table; only
+        slot numbers pass through Python.
+
+        Args:
+            source: Store source (= sheet tab title).
+            tab_rows: Rows the tab currently uses, header included.
+            full_replace: Rewrite the whole tab instead of writing a diff.
+            header: Header row to (re)write at row 1 — pass it when the tab
+                lacks it, and always with *full_replace*.
+        """
+        with self.conn:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS plan (slot INTEGER PRIMARY KEY, job_id TEXT)")
+            self.conn.execute("DELETE FROM temp.plan")
+
+            deleted = self._count("closed_at IS NOT NULL AND slot IS NOT NULL", (source,))
+            total = self._count("closed_at IS NULL", (source,))
+
+            if full_replace:
+                # 회사 / 등록일 내림차순 ('상시채용'·빈 값은 가장 뒤), 같은 값은 수집 순서대로
+                self.conn.execute(
+                    "INSERT INTO temp.plan (slot, job_id) "
+                    "SELECT ROW_NUMBER() OVER (ORDER BY company DESC, "
+                    "CASE WHEN reg_date IN ('', '상시채용') THEN '' ELSE reg_date END DESC, seq), job_id "
+                    "FROM jobs WHERE source = ? AND closed_at IS NULL",
+                    (source,),
+                )
+                inserted = self._count("closed_at IS NULL AND slot IS NULL", (source,))
+                changed = total - inserted
+            else:
+                self.conn.execute(
+                    "INSERT INTO temp.plan (slot, job_id) SELECT slot, job_id FROM jobs "
+                    "WHERE source = ? AND closed_at IS NULL AND slot IS NOT NULL AND dirty",
+                    (source,),
+                )
+                changed = self.conn.execute("SELECT COUNT(*) FROM temp.plan").fetchone()[0]
+                inserted = self._count("closed_at IS NULL AND slot IS NULL", (source,))
+
+                # Freed slots first (lowest first), then append after the last data row
+                holes = self._holes(source, tab_rows)
+                targets = (next(holes, None) for _ in range(inserted))
+                end = max(tab_rows - 1, 0)
+
+                def placements():
+                    nonlocal end
+                    inserts = self.conn.execute(
+                        "SELECT job_id FROM jobs WHERE source = ? AND closed_at IS NULL AND slot IS NULL "
+                        "ORDER BY seq",
+                        (source,),
+                    )
+                    for (job_id,), slot in zip(inserts, targets):
+                        if slot is None:
+                            end += 1
+                            slot = end
+                        yield slot, job_id
+
+                self.conn.executemany("INSERT OR REPLACE INTO temp.plan (slot, job_id) VALUES (?, ?)",
+                                      placements())
+
+                # Holes left inside 1..total are filled by the open rows sitting below total
+                movers = self.conn.execute(
+                    "SELECT job_id FROM jobs WHERE source = ? AND closed_at IS NULL AND slot > ? ORDER BY slot",
+                    (source, total),
+                )
+                remaining = (slot for slot in holes if slot <= total)
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO temp.plan (slot, job_id) VALUES (?, ?)",
+                    ((hole, job_id) for hole, (job_id,) in zip(remaining, movers)),
+                )
+
+            # 남는 행은 공백 처리 (위로 옮긴 행의 원래 자리 포함)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO temp.plan (slot, job_id) VALUES (?, NULL)",
+                ((slot,) for slot in range(total + 1, tab_rows)),
+            )
+
+        return Projection(
+            source=source,
+            header=list(header) if header is not None else None,
+            row_count=total + 1,
+            stats={"inserted": inserted, "deleted": deleted, "changed": changed},
+        )
+
+    def projection_blocks(self, projection: Projection, max_rows: int) -> Iterator[tuple[int, list[list[str]]]]:
+        """Yield (1-based sheet row, rows) blocks of consecutive rows planned by plan_projection().
+
+        Blocks hold at most *max_rows* rows, so they can be written in chunks.
+        """
+        blank = [""] * len(ROW_COLUMNS)
+        cursor = self.conn.execute(
+            f"SELECT p.slot, {', '.join(f'j.{column}' for column in ROW_COLUMNS)} FROM temp.plan p "
+            f"LEFT JOIN jobs j ON j.source = ? AND j.job_id = p.job_id ORDER BY p.slot",
+            (projection.source,),
+        )
+        start, rows = None, []
+        if projection.header is not None:
+            start, rows = 0, [projection.header]
+        for slot, *values in cursor:
+            if rows and (start + len(rows) != slot or len(rows) >= max_rows):
+                yield start + 1, rows
+                rows = []
+            if not rows:
+                start = slot
+            rows.append(list(values) if values[8] is not None else blank)
+        if rows:
+            yield start + 1, rows
+
+    def apply_projection(self, projection: Projection, spreadsheet_id: str) -> None:
+        """Record that *projection* was written to the spreadsheet."""
+        source = projection.source
+        with self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET slot = NULL WHERE source = ? AND closed_at IS NOT NULL AND slot IS NOT NULL",
+                (source,),
+            )
+            self.conn.execute(
+                "UPDATE jobs SET slot = p.slot FROM temp.plan p WHERE jobs.source = ? AND jobs.job_id = p.job_id",
+                (source,),
+            )
+            self.conn.execute("UPDATE jobs SET dirty = 0 WHERE source = ? AND dirty", (source,))
+            self._set_tab_rows(spreadsheet_id, {source: projection.row_count})
+
+    def set_tab_rows(self, spreadsheet_id: str, title: str, rows: int) -> None:
+        """Record the rows a tab written outside the planned projections (e.g. Summary) now uses."""
+        with self.conn:
+            self._set_tab_rows(spreadsheet_id, {title: rows})
+
+    def forget_tabs(self, spreadsheet_id: str, titles: Iterable[str]) -> None:
+        """Drop the projection state of *titles*, so the next run reads them back as its baseline.
+
+        Used when a write that was split over several requests failed part way:
+        the tabs then match neither the old nor the new projection.
+        """
+        with self.conn:
+            self.conn.executemany("DELETE FROM tabs WHERE spreadsheet_id = ? AND title = ?",
+                                  [(spreadsheet_id, title) for title in titles])
+
+    def _set_tab_rows(self, spreadsheet_id: str, row_counts: dict[str, int]) -> None:
+        self.conn.executemany(
+            "INSERT INTO tabs (spreadsheet_id, title, rows) VALUES (?, ?, ?) "
+            "ON CONFLICT (spreadsheet_id, title) DO UPDATE SET rows = excluded.rows",
+            [(spreadsheet_id, title, rows) for title, rows in row_counts.items()],
+        )
+
+    # -- local sinks ---------------------------------------------------------------
+
+    def has_source(self, source: str) -> bool:
+        """Whether any posting of *source* is recorded (open or closed)."""
+        return self.conn.execute("SELECT 1 FROM jobs WHERE source = ? LIMIT 1", (source,)).fetchone() is not None
+
+    def open_rows(self, source: str) -> Iterator[tuple]:
+        """Open postings of *source* as ROW_COLUMNS tuples, in the order of the last crawl."""
+        return self.conn.execute(
+            f"SELECT {', '.join(ROW_COLUMNS)} FROM jobs WHERE source = ? AND closed_at IS NULL ORDER BY seq",
+            (source,),
+        )
+
+    def run_events(self, source: str, delta: RunDelta) -> Iterator[tuple]:
+        """The new / reopened / closed events of the run *delta* describes, as (kind, *DATA_COLUMNS)."""
+        return self.conn.execute(
+            f"SELECT e.kind, {', '.join(f'j.{column}' for column in DATA_COLUMNS)} "
+            f"FROM events e JOIN jobs j ON j.source = e.source AND j.job_id = e.job_id "
+            f"WHERE e.source = ? AND e.rowid > ? ORDER BY e.rowid",
+            (source, delta.events_after),
+        )
+
+    # -- newsletter summary --------------------------------------------------------
+
+    def summarize(self, spreadsheet_id: str, today: str, until: str, since: str, new_since: str,
+                  group_of: Callable[[str], str], groups: Iterable[str]) -> JobSummary:
+        """Aggregate the open postings of every source projected to this spreadsheet.
+
+        등록일 / 마감일 are YYYY-MM-DD (or 상시채용), so the date windows are
+        plain string ranges in SQL; only the distinct company names go
+        through *group_of*.
+
+        Args:
+            spreadsheet_id: Spreadsheet whose company tabs are summarized.
+            today: First 마감일 counted as closing soon (YYYY-MM-DD).
+            until: Last 마감일 counted as closing soon, and last recent 등록일.
+            since: First 등록일 counted as recent.
+            new_since: Oldest run_at whose new / reopened events count as new.
+            group_of: 회사 → group name.
+            groups: Group names, in report order.
+        """
+        sources = [title for (title,) in self.conn.execute(
+            "SELECT title FROM tabs WHERE spreadsheet_id = ?", (spreadsheet_id,))]
+        marks = ", ".join("?" * len(sources))
+        open_jobs = (f"WITH open AS (SELECT {', '.join(DATA_COLUMNS)} FROM jobs "
+                     f"WHERE source IN ({marks}) AND closed_at IS NULL GROUP BY job_id, url) ")
+        counts = dict.fromkeys(groups, 0)
+        for company, count in self.conn.execute(
+                open_jobs + "SELECT company, COUNT(*) FROM open GROUP BY company", sources):
+            group = group_of(company)
+            counts[group] = counts.get(group, 0) + count
+        recent = self.conn.execute(
+            open_jobs + "SELECT * FROM open WHERE reg_date BETWEEN ? AND ? ORDER BY reg_date DESC, company, title",
+            (*sources, since, until),
+        ).fetchall()
+        urgent = self.conn.execute(
+            open_jobs + "SELECT * FROM open WHERE end_date BETWEEN ? AND ? ORDER BY end_date, company, title",
+            (*sources, today, until),
+        ).fetchall()
+        new = self.conn.execute(
+            f"SELECT COUNT(DISTINCT job_id) FROM events WHERE source IN ({marks}) "
+            f"AND kind IN ('new', 'reopened') AND run_at >= ?",
+            (*sources, new_since),
+        ).fetchone()[0]
+        return JobSummary(
+            total=sum(counts.values()), new=new, groups=counts,
+            recent=[list(row) for row in recent], urgent=[list(row) for row in urgent],
+        )
+
+    # -- archive -------------------------------------------------------------------
+
+    def plan_archive(
+        self,
+        spreadsheet_id: str,
+        source: str,
+        partition: Callable[[list[str]], str],
+        tab_rows: Callable[[str], int],
+        header: list[str],
+    ) -> ArchiveProjection:
+        """Plan the archive writes for the source's closed postings not archived yet.
+
+        A posting is archived once per spreadsheet: one found in the archive
+        index (closed, reopened, closed again — or archived by another
+        profile's tab) is rewritten in place; any other is appended to the
+        tab *partition* picks for it, so each run writes only its delta and
+        nothing has to be read back.
+
+        Args:
+            spreadsheet_id: Spreadsheet holding the archive tabs.
+            source: Store source whose closed postings are archived.
+            partition: Archive tab title for a row (columns A–J).
+            tab_rows: Rows an archive tab uses, header included; called once
+                per tab that receives appends.
+            header: Header row for archive tabs that are still empty.
+        """
+        with self.conn:
+            self.conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS archive_plan "
+                "(tab TEXT, row INTEGER, job_id TEXT, url TEXT, PRIMARY KEY (tab, row))"
+            )
+            self.conn.execute("DELETE FROM temp.archive_plan")
+            cursor = self.conn.execute(
+                f"SELECT a.tab, a.row, {', '.join(f'j.{column}' for column in ROW_COLUMNS)} FROM jobs j "
+                f"LEFT JOIN archive a ON a.spreadsheet_id = ? AND a.job_id = j.job_id AND a.url = j.url "
+                f"WHERE j.source = ? AND j.closed_at IS NOT NULL AND j.archived_at IS NULL "
+                f"ORDER BY j.closed_at, j.seq",
+                (spreadsheet_id, source),
+            )
+            row_counts: dict[str, int] = {}
+            new_tabs = []
+            appended = updated = 0
+
+            def placements():
+                nonlocal appended, updated
+                for title, row, *values in cursor:
+                    if title is not None:
+                        updated += 1
+                    else:
+                        appended += 1
+                        title = partition(values)
+                        if title not in row_counts:
+                            row_counts[title] = tab_rows(title)
+                            if row_counts[title] == 0:
+                                new_tabs.append(title)
+                                row_counts[title] = 1
+                        row_counts[title] += 1
+                        row = row_counts[title]
+                    yield title, row, values[8], values[4]
+
+            self.conn.executemany("INSERT OR REPLACE INTO temp.archive_plan VALUES (?, ?, ?, ?)", placements())
+        return ArchiveProjection(
+            spreadsheet_id=spreadsheet_id,
+            source=source,
+            header=list(header),
+            new_tabs=new_tabs,
+            row_counts=row_counts,
+            appended=appended,
+            updated=updated,
+        )
+
+    def archive_blocks(self, projection: ArchiveProjection, max_rows: int) -> Iterator[tuple[str, int, list[list[str]]]]:
+        """Yield (archive tab, 1-based row, rows) blocks of consecutive rows planned by plan_archive()."""
+        cursor = self.conn.execute(
+            f"SELECT p.tab, p.row, {', '.join(f'j.{column}' for column in ROW_COLUMNS)} FROM temp.archive_plan p "
+            f"JOIN jobs j ON j.source = ? AND j.job_id = p.job_id ORDER BY p.tab, p.row",
+            (projection.source,),
+        )
+        rows = ((title, row, list(values)) for title, row, *values in cursor)
+        return tab_blocks(_with_headers(rows, projection.new_tabs, projection.header), max_rows)
+
+    def apply_archive(self, projection: ArchiveProjection, now: str) -> None:
+        """Record that *projection* was written: index the archived postings and mark them archived."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO archive (spreadsheet_id, job_id, url, tab, row) "
+                "SELECT ?, job_id, url, tab, row FROM temp.archive_plan WHERE true "
+                "ON CONFLICT (spreadsheet_id, job_id, url) DO UPDATE SET tab = excluded.tab, row = excluded.row",
+                (projection.spreadsheet_id,),
+            )
+            self.conn.execute(
+                "UPDATE jobs SET archived_at = ? WHERE source = ? AND closed_at IS NOT NULL AND archived_at IS NULL",
+                (now, projection.source),
+            )
+            self._set_tab_rows(projection.spreadsheet_id, projection.row_counts)
+
+    def stage_archive(
+        self,
+        spreadsheet_id: str,
+        tabs: Iterable[tuple[str, Iterable[list[str]]]],
+        partition: Callable[[list[str]], str],
+        header: list[str],
+    ) -> ArchiveCompaction:
+        """Stage the contents of a spreadsheet's archive tabs for a compacting rewrite.
+
+        Rows are de-duplicated by 공고ID + URL (the last one read wins) and
+        assigned to the tab *partition* picks for them, ordered by 수집일시
+        within a tab. Header, blank and ID-less rows are dropped. Nothing
+        permanent changes until apply_compaction().
+
+        Args:
+            spreadsheet_id: Spreadsheet holding the archive tabs.
+            tabs: (archive tab, all its rows) pairs; rows may be any iterable.
+            partition: Archive tab title for a row (columns A–J).
+            header: Header row, skipped when read and written to every tab.
+        """
+        before: dict[str, int] = {}
+        read = 0
+
+        def staged():
+            nonlocal read
+            seq = 0
+            for title, rows in tabs:
+                before[title] = 0
+                for row in rows:
+                    before[title] += 1
+                    row = pad_row(row)
+                    if not row[8] or row[:len(header)] == list(header):
+                        continue
+                    read += 1
+                    seq += 1
+                    yield (seq, partition(row), *row)
+
+        with self.conn:
+            self.conn.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS archive_stage "
+                f"(seq INTEGER, tab TEXT, {', '.join(ROW_COLUMNS)}, PRIMARY KEY (job_id, url))"
+            )
+            self.conn.execute("DELETE FROM temp.archive_stage")
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO temp.archive_stage VALUES (?, ?, {', '.join('?' * len(ROW_COLUMNS))})",
+                staged(),
+            )
+        row_counts = {title: 1 for title, rows in before.items() if rows}
+        for title, count in self.conn.execute("SELECT tab, COUNT(*) FROM temp.archive_stage GROUP BY tab"):
+            row_counts[title] = count + 1
+        return ArchiveCompaction(
+            spreadsheet_id=spreadsheet_id,
+            header=list(header),
+            before=before,
+            row_counts=row_counts,
+            read=read,
+            duplicates=read - sum(row_counts.values()) + len(row_counts),
+        )
+
+    def _compacted(self) -> str:
+        """SELECT of (tab, row, job_id, url) for the staged archive, rows numbered from 2 per tab."""
+        return ("SELECT tab, ROW_NUMBER() OVER (PARTITION BY tab ORDER BY first_seen, seq) + 1 AS row, "
+                "job_id, url FROM temp.archive_stage")
+
+    def compaction_blocks(self, compaction: ArchiveCompaction,
+                          max_rows: int) -> Iterator[tuple[str, int, list[list[str]]]]:
+        """Yield (archive tab, 1-based row, rows) blocks rewriting every archive tab staged by stage_archive().
+
+        Each tab gets the header and its rows from row 2; rows left over
+        below are blanked.
+        """
+        cursor = self.conn.execute(
+            f"SELECT c.tab, c.row, {', '.join(f's.{column}' for column in ROW_COLUMNS)} "
+            f"FROM ({self._compacted()}) c JOIN temp.archive_stage s ON s.job_id = c.job_id AND s.url = c.url "
+            f"ORDER BY c.tab, c.row"
+        )
+        rows = ((title, row, list(values)) for title, row, *values in cursor)
+        yield from tab_blocks(_with_headers(rows, list(compaction.row_counts), compaction.header), max_rows)
+        blank = [""] * len(ROW_COLUMNS)
+        for title, rows in compaction.before.items():
+            after = compaction.row_counts.get(title, 0)
+            start = after + 1
+            for block in chunked(repeat(blank, max(0, rows - after)), max_rows):
+                yield title, start, block
+                start += len(block)
+
+    def apply_compaction(self, compaction: ArchiveCompaction) -> None:
+        """Record that *compaction* was written: the archive index is rebuilt from the staged rows."""
+        with self.conn:
+            self.conn.execute("DELETE FROM archive WHERE spreadsheet_id = ?", (compaction.spreadsheet_id,))
+            self.conn.execute(
+                f"INSERT INTO archive (spreadsheet_id, tab, row, job_id, url) SELECT ?, * FROM ({self._compacted()})",
+                (compaction.spreadsheet_id,),
+            )
+            self._set_tab_rows(compaction.spreadsheet_id, compaction.row_counts)
+
+    # -- delta ---------------------------------------------------------------------
+
+    def plan_delta(self, spreadsheet_id: str, source: str, tab_rows: int, since: str,
+                   labels: dict[str, str], header: list[str]) -> DeltaProjection:
+        """Plan the Delta tab writes: one row per new / reopened / closed event.
+
+        The tab lists the events since *since* for every source projected to
+        this spreadsheet, oldest first, as [실행일시, 구분, columns A–I].
+        Normally the source's pending events are appended. When older events
+        have expired (or the tab is new) the tab is rewritten from the store
+        and leftover rows are blanked.
+
+        Args:
+            spreadsheet_id: Spreadsheet holding the Delta tab.
+            source: Source whose pending events this run adds.
+            tab_rows: Rows the Delta tab currently uses, header included.
+            since: Oldest run_at to keep (same format as the run timestamps).
+            labels: Event kind → 구분 label written to the tab.
+            header: Delta tab header row.
+        """
+        sources = [title for (title,) in self.conn.execute(
+            "SELECT title FROM tabs WHERE spreadsheet_id = ?", (spreadsheet_id,))]
+        sources = sorted(set(sources) | {source})
+        marks = ", ".join("?" * len(sources))
+        expired = self.conn.execute(
+            f"SELECT 1 FROM events WHERE source IN ({marks}) AND projected AND run_at < ? LIMIT 1",
+            (*sources, since),
+        ).fetchone()
+        if tab_rows == 0 or expired is not None:
+            count = self.conn.execute(
+                f"SELECT COUNT(*) FROM events WHERE source IN ({marks}) AND run_at >= ?", (*sources, since)
+            ).fetchone()[0]
+            return DeltaProjection(
+                source=source, start_row=1, header=list(header), blank_rows=max(0, tab_rows - count - 1),
+                row_count=count + 1, sources=sources, since=since, labels=labels,
+            )
+        count = self.conn.execute(
+            "SELECT COUNT(*) FROM events WHERE source = ? AND NOT projected", (source,)
+        ).fetchone()[0]
+        return DeltaProjection(
+            source=source, start_row=tab_rows + 1, header=None, blank_rows=0,
+            row_count=tab_rows + count, sources=sources, since=None, labels=labels,
+        )
+
+    def delta_blocks(self, projection: DeltaProjection, max_rows: int) -> Iterator[tuple[int, list[list[str]]]]:
+        """Yield (1-based sheet row, rows) blocks of at most *max_rows* rows for the Delta tab."""
+        if projection.since is not None:
+            marks = ", ".join("?" * len(projection.sources))
+            where, params = f"e.source IN ({marks}) AND e.run_at >= ?", (*projection.sources, projection.since)
+        else:
+            where, params = "e.source = ? AND NOT e.projected", (projection.source,)
+        cursor = self.conn.execute(
+            f"SELECT e.run_at, e.kind, {', '.join(f'j.{column}' for column in DATA_COLUMNS)} "
+            f"FROM events e JOIN jobs j ON j.source = e.source AND j.job_id = e.job_id "
+            f"WHERE {where} ORDER BY e.run_at, e.rowid",
+            params,
+        )
+        rows = ([run_at, projection.labels.get(kind, kind), *values] for run_at, kind, *values in cursor)
+        if projection.header is not None:
+            rows = chain([projection.header], rows)
+        if projection.blank_rows:
+            rows = chain(rows, repeat([""] * len(projection.header), projection.blank_rows))
+        start = projection.start_row
+        for block in chunked(rows, max_rows):
+            yield start, block
+            start += len(block)
+
+    def apply_delta(self, projection: DeltaProjection, spreadsheet_id: str, title: str) -> None:
+        """Record that the Delta tab *projection* was written; expired events are dropped."""
+        sources, since = projection.sources, projection.since
+        marks = ", ".join("?" * len(sources))
+        with self.conn:
+            if since is not None:
+                self.conn.execute(
+                    f"DELETE FROM events WHERE source IN ({marks}) AND run_at < ?", (*sources, since))
+                self.conn.execute(f"UPDATE events SET projected = 1 WHERE source IN ({marks})", sources)
+            else:
+                self.conn.execute("UPDATE events SET projected = 1 WHERE source = ?", (projection.source,))
+            self.conn.execute(
+                "INSERT INTO tabs (spreadsheet_id, title, rows) VALUES (?, ?, ?) "
+                "ON CONFLICT (spreadsheet_id, title) DO UPDATE SET rows = excluded.rows",
+                (spreadsheet_id, title, projection.row_count),
+            )
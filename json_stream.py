@@ -0,0 +1,253 @@
+"""Incremental JSON parsing — the elements of one array inside a large document.
+
+Some sources return every posting in a single response (Greenhouse, Toss) or
+bury the list deep inside a larger document (Daangn's Gatsby page-data).
+Decoding such a body with response.json() holds the raw text and the whole
+object tree in memory before the first job can be looked at. JsonArrayStream
+instead reads the body chunk by chunk and yields each element of the array at
+a dotted path as soon as it is complete:
+
+- the path down to the array is followed key by key; every other value is
+  skipped by scanning brackets and strings, without building it;
+- each array element is decoded on its own by json's C scanner, so memory
+  is bounded by one element plus one read chunk, not by the document;
+- small values at other paths (a success flag, an error message) can be
+  captured on the way, into `partial`.
+
+    stream = JsonArrayStream(response.iter_content(READ_CHUNK_BYTES), "result.data.nodes",
+                             capture=["resultType"])
+    for job in stream:
+        ...
+    stream.partial  # {"resultType": "SUCCESS"} — complete once the stream is exhausted
+
+Only standard library is used. Input must be UTF-8 (RFC 8259).
+"""
+
+import codecs
+import json
+import re
+from json.scanner import make_scanner
+from typing import Iterable, Iterator
+
+# Body bytes read per chunk
+READ_CHUNK_BYTES = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Next character that matters when skipping a container
+_STRUCTURE = re.compile(r'[\[\]{}"]')
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# Text that may still belong to a number cut off at the end of the buffer ("2." of "2.5e3")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*")
+
+
+class JsonArrayStream:
+    """Iterate the elements of the array at *path* in a JSON document read from *chunks*.
+
+    Numeric path components index into arrays, as in base.compile_path. If
+    the path is missing, nothing is yielded; if it holds a value other than an
+    array, nothing is yielded either.
+
+    Args:
+        chunks: The document as UTF-8 byte chunks (e.g. response.iter_content()).
+        path: Dotted path to the array whose elements are yielded.
+        capture: Dotted paths of further values to keep; found ones are
+            stored in `partial`, nested as in the document.
+
+    Attributes:
+        partial: Captured values, e.g. {"result": {"code": "Y"}}; only
+            complete after iteration finished (a value may follow the array).
+    """
+
+    def __init__(self, chunks: Iterable[bytes], path: str, capture: Iterable[str] = ()):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._decode = json.JSONDecoder().raw_decode
+        # The decoder's C scanner, for the element loop: no Python frame per
+        # element, and StopIteration instead of JSONDecodeError on a cut-off element
+        self._scan = make_scanner(json.JSONDecoder())
+        self._target = tuple(path.split(".")) if path else ()
+        self._capture = {tuple(other.split(".")) for other in capture if other}
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self.partial: dict = {}
+
+    def __iter__(self) -> Iterator:
+        self._peek()
+        yield from self._walk(())
+        if self._peek():
+            self._fail("Extra data")
+
+    # -- navigation ---------------------------------------------------------
+
+    def _walk(self, path: tuple[str, ...]) -> Iterator:
+        """Handle the value at the current position, which is at *path*."""
+        if path == self._target:
+            if self._peek() == "[":
+                yield from self._elements()
+            else:
+                self._skip()
+        elif path in self._capture:
+            self._store(path, self._value())
+        elif not self._leads_somewhere(path):
+            self._skip()
+        elif self._peek() == "{":
+            self._pos += 1
+            for _ in self._members("}"):
+                key = self._value()
+                if not isinstance(key, str):
+                    self._fail("Expecting property name")
+                self._expect(":")
+                yield from self._walk(path + (key,))
+        elif self._peek() == "[":
+            self._pos += 1
+            for index in self._members("]"):
+                yield from self._walk(path + (str(index),))
+        else:
+            self._skip()
+
+    def _leads_somewhere(self, path: tuple[str, ...]) -> bool:
+        """Whether the target or a captured path lies below *path*."""
+        depth = len(path)
+        return self._target[:depth] == path or any(other[:depth] == path for other in self._capture)
+
+    def _elements(self) -> Iterator:
+        """Decode the array's elements one by one.
+
+        The common case — element and separator already in the buffer — stays
+        in this loop; anything cut off by a chunk boundary takes the general
+        path (_value / _peek).
+        """
+        self._pos += 1
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        scan, skip_whitespace, number_tail = self._scan, _WHITESPACE.match, _NUMBER_TAIL.fullmatch
+        while True:
+            buf = self._buf
+            pos = skip_whitespace(buf, self._pos).end()
+            try:
+                value, end = scan(buf, pos)
+            except (StopIteration, json.JSONDecodeError):
+                end = None
+            if end is None or number_tail(buf, end):
+                self._pos = pos
+                value = self._value()
+            else:
+                self._pos = end
+            yield value
+
+            buf = self._buf
+            pos = skip_whitespace(buf, self._pos).end()
+            if pos < len(buf):
+                char = buf[pos]
+                self._pos = pos + 1
+            else:
+                char = self._peek()
+                self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                self._fail("Expecting ',' or ']'")
+
+    def _members(self, close: str) -> Iterator[int]:
+        """Yield once per member of the container just opened, until *close*.
+
+        The caller consumes the member itself; separators are handled here.
+        """
+        if self._peek() == close:
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            char = self._peek()
+            self._pos += 1
+            if char == close:
+                return
+            if char != ",":
+                self._fail(f"Expecting ',' or '{close}'")
+
+    def _store(self, path: tuple[str, ...], value) -> None:
+        node = self.partial
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+
+    # -- scanning -----------------------------------------------------------
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer (dropping consumed text); False at end of input."""
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buf = self._buf[self._pos:] + text
+                self._pos = 0
+                return True
+        self._buf = self._buf[self._pos:] + self._decoder.decode(b"", final=True)
+        self._pos = 0
+        self._eof = True
+        return False
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character ("" at end of input)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            self._fail(f"Expecting '{char}'")
+        self._pos += 1
+
+    def _value(self):
+        """Decode one complete value at the current position."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number cut off by the chunk boundary decodes as a shorter one
+            if _NUMBER_TAIL.fullmatch(self._buf, end) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _skip(self) -> None:
+        """Move past the value at the current position without building it."""
+        if self._peek() not in ("{", "["):
+            self._value()
+            return
+        depth = 0
+        while True:
+            match = _STRUCTURE.search(self._buf, self._pos)
+            if match is None:
+                self._pos = len(self._buf)
+                if not self._fill():
+                    self._fail("Unterminated value")
+                continue
+            if match.group() == '"':
+                string = _STRING.match(self._buf, match.start())
+                if string is None:
+                    self._pos = match.start()
+                    if not self._fill():
+                        self._fail("Unterminated string")
+                    continue
+                self._pos = string.end()
+                continue
+            self._pos = match.end()
+            depth += 1 if match.group() in "{[" else -1
+            if depth == 0:
+                return
+
+    def _fail(self, message: str):
+        raise json.JSONDecodeError(message, self._buf, self._pos)
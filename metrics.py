@@ -0,0 +1,342 @@
+"""Run instrumentation — per-stage timings, HTTP and Sheets counters, and the run report.
+
+Everything a run records goes into the process-wide METRICS:
+
+- stage timings per company (fetch, filter, encode, store, connect, read,
+  archive, project, write, throttle). Stages nest, and each records its
+  *exclusive* time: the time spent in a nested stage is charged to that stage
+  and not to the enclosing one. Because the pipeline streams, one job's fetch,
+  filter and encode interleave; `timed()` charges each `next()` of an iterator
+  to a stage, so the split stays exact;
+- counters per company (jobs fetched and kept, rows and cells written, Sheets
+  API calls by method, Sheets retries by status);
+- HTTP requests per host: count, errors, 304 revalidations, urllib3 retries,
+  body bytes and latency percentiles.
+
+Stage timing costs a few hundred nanoseconds per job and stage, so it is only
+on with `timing` set — when a report was asked for (CRAWLER_METRICS, or
+run_all.py --metrics); counters and HTTP statistics are always kept.
+
+Recording is lock-free: every thread writes to its own tables, which are only
+merged by report(). The company a record belongs to is set per thread with
+`company()`, so the fetch workers of run_all.py and the writer on the main
+thread are attributed correctly.
+
+    with METRICS.company("토스"), METRICS.stage("store"):
+        for job in METRICS.timed(jobs, "fetch"):
+            ...
+    METRICS.write("metrics.prom")   # Prometheus text format; any other suffix → JSON
+
+Only standard library is used.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+# Run report path: a `.prom` path gets Prometheus text format, anything else
+# JSON; also turns stage timing on (run_all.py: --metrics)
+METRICS_PATH = os.environ.get("CRAWLER_METRICS")
+
+# Company label of records made outside any company() block
+NO_COMPANY = "-"
+
+# Latency percentiles reported per host
+LATENCY_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class _HostStats:
+    """HTTP counters of one host, as recorded by one thread."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.not_modified = 0
+        self.retries = 0
+        self.bytes = 0
+        self.latencies: list[float] = []
+
+    def merge(self, other: "_HostStats") -> None:
+        self.requests += other.requests
+        self.errors += other.errors
+        self.not_modified += other.not_modified
+        self.retries += other.retries
+        self.bytes += other.bytes
+        self.latencies.extend(other.latencies)
+
+
+class _ThreadTables:
+    """One thread's records (see RunMetrics._tables)."""
+
+    def __init__(self):
+        self.company = NO_COMPANY
+        # Per open stage, the seconds spent in stages nested in it; the first
+        # entry is the root, so every stage has a parent to report to
+        self.stack: list[float] = [0.0]
+        self.seconds: defaultdict = defaultdict(float)  # (company, stage) → exclusive seconds
+        self.counts: Counter = Counter()  # (company, name, labels) → count
+        self.hosts: defaultdict = defaultdict(_HostStats)
+
+
+def percentile(values: list[float], quantile: float) -> float:
+    """Nearest-rank percentile of sorted *values* (0.0 when empty)."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, round(quantile * len(values) + 0.5) - 1))]
+
+
+class RunMetrics:
+    """Stage timings, counters and HTTP statistics of one process run.
+
+    Args:
+        timing: Record stage timings (stage() and timed() are no-ops otherwise).
+
+    Attributes:
+        timing: As above; may be switched on before the run starts.
+        started_at: Wall-clock start of the run (construction or reset()).
+    """
+
+    def __init__(self, timing: bool = False):
+        self.timing = timing
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop everything recorded so far and restart the run clock."""
+        self._lock = threading.Lock()
+        self._registry: list[_ThreadTables] = []
+        self._local = threading.local()
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+
+    def _tables(self) -> _ThreadTables:
+        """The calling thread's tables, created and registered on first use."""
+        try:
+            return self._local.tables
+        except AttributeError:
+            tables = self._local.tables = _ThreadTables()
+            with self._lock:
+                self._registry.append(tables)
+            return tables
+
+    # -- recording ------------------------------------------------------------
+
+    @contextmanager
+    def company(self, name: str):
+        """Attribute records made by this thread inside the block to *name*."""
+        tables = self._tables()
+        previous, tables.company = tables.company, name
+        try:
+            yield
+        finally:
+            tables.company = previous
+
+    def stage(self, name: str):
+        """Context manager charging the time spent inside it, minus nested stages, to stage *name*."""
+        return self._stage(name) if self.timing else nullcontext()
+
+    @contextmanager
+    def _stage(self, name: str):
+        tables = self._tables()
+        stack = tables.stack
+        stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            tables.seconds[tables.company, name] += elapsed - stack.pop()
+            stack[-1] += elapsed
+
+    def timed(self, iterable: Iterable, name: str) -> Iterable:
+        """Yield from *iterable*, charging the time each item takes to produce to stage *name*.
+
+        The stage is entered once per item, i.e. per job, so the loop only
+        reads the clock twice and sums locally; the total is recorded when the
+        iteration ends (or the generator is closed).
+        """
+        return self._timed(iterable, name) if self.timing else iterable
+
+    def _timed(self, iterable: Iterable, name: str) -> Iterator:
+        iterator = iter(iterable)
+        tables = self._tables()
+        stack, clock = tables.stack, time.perf_counter
+        total = 0.0
+        try:
+            while True:
+                stack.append(0.0)
+                started = clock()
+                try:
+                    item = next(iterator)
+                finally:
+                    elapsed = clock() - started
+                    total += elapsed - stack.pop()
+                    stack[-1] += elapsed
+                yield item
+        except StopIteration:
+            return
+        finally:
+            tables.seconds[tables.company, name] += total
+
+    def count(self, name: str, value: int = 1, **labels: str) -> None:
+        """Add *value* to counter *name* of the current company (e.g. count("rows_written", 120))."""
+        tables = self._tables()
+        tables.counts[tables.company, name, tuple(sorted(labels.items()))] += value
+
+    def http(self, host: str, seconds: float, status: int | None = None, retries: int = 0,
+             body_bytes: int = 0) -> None:
+        """Record one HTTP request to *host*; a *status* of None means it raised."""
+        stats = self._tables().hosts[host]
+        stats.requests += 1
+        stats.retries += retries
+        stats.bytes += body_bytes
+        stats.latencies.append(seconds)
+        if status is None or status >= 400:
+            stats.errors += 1
+        elif status == 304:
+            stats.not_modified += 1
+
+    def http_bytes(self, host: str, body_bytes: int) -> None:
+        """Add body bytes read after the request was recorded (streamed responses)."""
+        self._tables().hosts[host].bytes += body_bytes
+
+    # -- reporting ------------------------------------------------------------
+
+    def _merged(self) -> tuple[defaultdict, Counter, dict[str, _HostStats]]:
+        seconds: defaultdict = defaultdict(float)
+        counts: Counter = Counter()
+        hosts: dict[str, _HostStats] = defaultdict(_HostStats)
+        with self._lock:
+            registry = list(self._registry)
+        for tables in registry:
+            for key, value in list(tables.seconds.items()):
+                seconds[key] += value
+            counts.update(dict(tables.counts))
+            for host, stats in list(tables.hosts.items()):
+                hosts[host].merge(stats)
+        for stats in hosts.values():
+            stats.latencies.sort()
+        return seconds, counts, hosts
+
+    def report(self) -> dict:
+        """The run so far as a JSON-serializable dict.
+
+        Per company: `stages` (exclusive seconds) and `counts` (a labelled
+        counter becomes {label value: count}); `stages` also holds the totals
+        over all companies; `http` is per host.
+        """
+        seconds, counts, hosts = self._merged()
+        companies: dict[str, dict] = defaultdict(lambda: {"stages": {}, "counts": {}})
+        totals: Counter = Counter()
+        for (company, name), value in sorted(seconds.items()):
+            companies[company]["stages"][name] = round(value, 6)
+            totals[name] += value
+        for (company, name, labels), value in sorted(counts.items()):
+            company_counts = companies[company]["counts"]
+            if labels:
+                key = ",".join(label for _, label in labels)
+                company_counts.setdefault(name, {})[key] = value
+            else:
+                company_counts[name] = value
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "duration_seconds": round(time.perf_counter() - self._started, 6),
+            "stages": {name: round(value, 6) for name, value in sorted(totals.items())},
+            "companies": dict(sorted(companies.items())),
+            "http": {
+                host: {
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    "not_modified": stats.not_modified,
+                    "retries": stats.retries,
+                    "bytes": stats.bytes,
+                    "latency_seconds": {
+                        **{f"p{round(quantile * 100)}": round(percentile(stats.latencies, quantile), 6)
+                           for quantile in LATENCY_QUANTILES},
+                        "max": round(stats.latencies[-1] if stats.latencies else 0.0, 6),
+                        "sum": round(sum(stats.latencies), 6),
+                    },
+                }
+                for host, stats in sorted(hosts.items())
+            },
+        }
+
+    def prometheus(self, prefix: str = "crawler") -> str:
+        """The run so far in the Prometheus text exposition format (e.g. for node_exporter's textfile collector)."""
+        seconds, counts, hosts = self._merged()
+        lines: list[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> str:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            return f"{prefix}_{name}"
+
+        metric = family("run_start_timestamp_seconds", "gauge", "Unix time the run started.")
+        lines.append(f"{metric} {self.started_at.timestamp():.3f}")
+        metric = family("run_duration_seconds", "gauge", "Wall-clock duration of the run so far.")
+        lines.append(f"{metric} {time.perf_counter() - self._started:.6f}")
+
+        metric = family("stage_seconds_total", "counter", "Exclusive time spent per company and stage.")
+        for (company, name), value in sorted(seconds.items()):
+            lines.append(f"{metric}{_labels(company=company, stage=name)} {value:.6f}")
+
+        for name in sorted({name for _, name, _ in counts}):
+            metric = family(f"{name}_total", "counter", f"{name.replace('_', ' ').capitalize()} per company.")
+            for (company, counter, labels), value in sorted(counts.items()):
+                if counter == name:
+                    lines.append(f"{metric}{_labels(company=company, **dict(labels))} {value}")
+
+        for name, attribute, help_text in (
+            ("http_requests_total", "requests", "HTTP requests per host (redirects and revalidations included)."),
+            ("http_errors_total", "errors", "HTTP requests per host that raised or returned a 4xx/5xx status."),
+            ("http_not_modified_total", "not_modified", "HTTP 304 revalidations per host."),
+            ("http_retries_total", "retries", "Retries made by urllib3 per host."),
+            ("http_response_bytes_total", "bytes", "Response body bytes received per host."),
+        ):
+            metric = family(name, "counter", help_text)
+            for host, stats in sorted(hosts.items()):
+                lines.append(f"{metric}{_labels(host=host)} {getattr(stats, attribute)}")
+
+        metric = family("http_request_duration_seconds", "summary", "HTTP request latency per host.")
+        for host, stats in sorted(hosts.items()):
+            for quantile in LATENCY_QUANTILES:
+                lines.append(f"{metric}{_labels(host=host, quantile=str(quantile))} "
+                             f"{percentile(stats.latencies, quantile):.6f}")
+            lines.append(f"{metric}_sum{_labels(host=host)} {sum(stats.latencies):.6f}")
+            lines.append(f"{metric}_count{_labels(host=host)} {len(stats.latencies)}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str | Path) -> None:
+        """Write the report to *path*: Prometheus text for a `.prom` suffix, JSON otherwise ("-" → stdout).
+
+        The file is replaced atomically, so a collector never reads a partial report.
+        """
+        path = str(path)
+        prometheus = path.endswith(".prom")
+        body = self.prometheus() if prometheus else json.dumps(self.report(), ensure_ascii=False, indent=2) + "\n"
+        if path == "-":
+            print(body, end="")
+            return
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_text(body, encoding="utf-8")
+        os.replace(tmp, target)
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value (backslash, double quote, newline)."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Process-wide metrics of the current run
+METRICS = RunMetrics(timing=bool(METRICS_PATH))
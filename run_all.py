@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""Single-process runner — discovers every company crawler and runs them all.
+
+A crawler module is any `crawler.py` / `*_crawler.py` next to this file that
+defines a module-level SOURCE (base.Source, compiled from a SourceSpec), or
+for a hand-written crawler a CONFIG (CrawlerConfig), fetch_all_jobs and
+job_to_row, plus an optional filter_jobs. Running them in one interpreter means the Google
+client libraries are imported once, the service account authenticates once,
+and each spreadsheet is opened once (see base.get_google_spreadsheet).
+
+The fetch stage runs concurrently in a bounded thread pool (--workers), with at
+most --per-host fetches in flight against the same API host. Sheets writes stay
+on the main thread and start as soon as each company's fetch completes; the
+newsletter's Summary tab is rewritten once per spreadsheet at the end.
+
+Each company's run goes to the selected sinks (base.make_sinks, sinks.py):
+the Google spreadsheet by default, or local JSONL / CSV / Parquet files.
+The Google client libraries are only imported when a Sheets sink is used.
+
+Per-company stage timings, HTTP statistics per host and Sheets API counts are
+collected in metrics.METRICS; --metrics (or CRAWLER_METRICS) writes them as a
+JSON or Prometheus report at the end of the run.
+
+With --daemon the process stays up and polls each crawler on its own
+interval (PollSchedule): shorter after its fetched jobs changed, longer
+while they stay the same, within --min-interval / --max-interval and with
+jitter. Sessions, the Google client and the job store stay warm between
+polls, and every poll goes through the same bounded fetch pool (--workers,
+--per-host). SIGTERM / Ctrl+C stops it after the current poll.
+
+Usage:
+    python run_all.py                 # 모든 크롤러 실행
+    python run_all.py toss naver      # 일부만 실행 (모듈 이름 또는 접두어)
+    python run_all.py --workers 1     # 순차 실행
+    python run_all.py --offline       # 로컬 저장소(.cache/jobs.sqlite3)만 갱신, 시트는 다음 실행 때 반영
+    python run_all.py --fake-sheets   # Google Sheets 대신 메모리 내 가짜 시트에 기록 (오프라인 점검)
+    python run_all.py --compact-archive   # Archive 탭 중복 제거·파티션 재배치 (크롤링 없음)
+    python run_all.py --metrics metrics.json   # 단계별 소요 시간·HTTP·Sheets API 집계 보고서 (.prom → Prometheus)
+    python run_all.py --sink sheets --sink jsonl   # 출력 선택: sheets, jsonl, csv, parquet (기본값: CRAWLER_SINKS 또는 sheets)
+    python run_all.py toss --dry-run  # Google 없이 실행, 로컬 파일(기본 CSV)만 output/에 기록하고 상태는 바꾸지 않음
+    python run_all.py --daemon        # 상주 실행: 회사별 폴링 간격을 변경 빈도에 맞춰 조절
+    python run_all.py --daemon --min-interval 30m --max-interval 1d
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import random
+import re
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Iterable
+from urllib.parse import urlparse
+
+import base
+from base import (
+    CrawlerConfig,
+    JobRow,
+    JobStream,
+    Output,
+    SheetsSink,
+    Source,
+    compact_archive,
+    sink_names,
+    start_dry_run,
+    start_run,
+    sync_rows,
+    sync_summary,
+    use_google_client,
+    use_sinks,
+    write_run_report,
+)
+from metrics import METRICS, METRICS_PATH
+from sheets_io import API_CALLS
+
+CRAWLER_DIR = Path(__file__).resolve().parent
+
+DEFAULT_WORKERS = 6   # 전체 동시 fetch 수
+DEFAULT_PER_HOST = 2  # 같은 API 호스트에 대한 동시 fetch 수
+
+# --daemon 폴링 간격 (초)
+DAEMON_MIN_INTERVAL = 15 * 60
+DAEMON_MAX_INTERVAL = 24 * 60 * 60
+DAEMON_START_INTERVAL = 60 * 60  # 처음 보는 크롤러 (범위 안으로 보정)
+DAEMON_SPEEDUP = 0.5  # 변경이 있으면 간격 × 0.5
+DAEMON_BACKOFF = 1.5  # 변경이 없거나 실패하면 간격 × 1.5
+DAEMON_JITTER = 0.1   # 다음 폴링 시각을 간격의 ±10% 안에서 분산
+
+
+@dataclass
+class CrawlerModule:
+    """A discovered crawler module and the callables run_crawler() needs."""
+    name: str
+    config: CrawlerConfig
+    fetch_fn: Callable[[], Iterable[dict]]
+    job_to_row_fn: Callable[[dict], JobRow]
+    filter_fn: Callable[[Iterable[dict]], Iterable[dict]] | None = None
+    host: str = ""
+    outputs: list[Output] = field(default_factory=list)  # sheet targets of a Source with profiles
+
+    @property
+    def configs(self) -> list[CrawlerConfig]:
+        """Sheet targets: one per output, or the crawler's own config."""
+        return [output.config for output in self.outputs] or [self.config]
+
+    def streams(self) -> list[tuple[CrawlerConfig, JobStream]]:
+        """Fetch once and return a spooled JobStream per sheet target."""
+        jobs = self.fetch_fn()
+        if len(self.outputs) > 1:
+            streams = JobStream.fan_out(jobs, self.job_to_row_fn, [output.keep for output in self.outputs])
+            return [(output.config, stream) for output, stream in zip(self.outputs, streams)]
+        return [(self.config, JobStream(jobs, self.job_to_row_fn, self.filter_fn, spool=True))]
+
+
+def load_crawler(module: ModuleType) -> CrawlerModule | None:
+    """Return the crawler callables defined by *module*, or None if it is not a crawler."""
+    source = getattr(module, "SOURCE", None)
+    if isinstance(source, Source):
+        return CrawlerModule(
+            name=module.__name__,
+            config=source.config,
+            fetch_fn=source.fetch_all_jobs,
+            job_to_row_fn=source.job_to_row,
+            filter_fn=source.filter_fn,
+            host=urlparse(source.url).netloc,
+            outputs=source.outputs,
+        )
+    config = getattr(module, "CONFIG", None)
+    fetch_fn = getattr(module, "fetch_all_jobs", None)
+    job_to_row_fn = getattr(module, "job_to_row", None)
+    if not isinstance(config, CrawlerConfig) or not callable(fetch_fn) or not callable(job_to_row_fn):
+        return None
+    return CrawlerModule(
+        name=module.__name__,
+        config=config,
+        fetch_fn=fetch_fn,
+        job_to_row_fn=job_to_row_fn,
+        filter_fn=getattr(module, "filter_jobs", None),
+        host=urlparse(getattr(module, "API_URL", "")).netloc,
+    )
+
+
+def discover_crawlers(selected: list[str] | None = None) -> list[CrawlerModule]:
+    """Import every crawler module in CRAWLER_DIR, optionally limited to *selected*.
+
+    *selected* entries match a module name with or without the `_crawler`
+    suffix (e.g. "toss" or "toss_crawler"; "crawler" is Kakao).
+    """
+    paths = sorted(CRAWLER_DIR.glob("*crawler.py"))
+    crawlers = []
+    for path in paths:
+        name = path.stem
+        if selected and name not in selected and name.removesuffix("_crawler") not in selected:
+            continue
+        crawler = load_crawler(importlib.import_module(name))
+        if crawler:
+            crawlers.append(crawler)
+    return crawlers
+
+
+class HostLimiter:
+    """Caps the number of concurrent fetches per API host."""
+
+    def __init__(self, per_host: int):
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.Semaphore] = defaultdict(lambda: threading.Semaphore(per_host))
+
+    def semaphore(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            return self._semaphores[host]
+
+
+def fetch_concurrently(
+    crawlers: list[CrawlerModule],
+    workers: int = DEFAULT_WORKERS,
+    per_host: int = DEFAULT_PER_HOST,
+):
+    """Yield (crawler, future) pairs in fetch-completion order.
+
+    Each future resolves to a list of (config, spooled JobStream) pairs, one
+    per sheet target of the crawler (CrawlerModule.streams: fetched once,
+    filtered and converted in the worker, buffered on disk rather than in
+    memory), or raises the fetch's exception. The pool is bounded by
+    *workers* overall and *per_host* per API host.
+    """
+    limiter = HostLimiter(per_host)
+
+    def fetch(crawler: CrawlerModule) -> list[tuple[CrawlerConfig, JobStream]]:
+        with limiter.semaphore(crawler.host), METRICS.company(crawler.config.company_name):
+            return crawler.streams()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="fetch") as pool:
+        futures: dict[Future, CrawlerModule] = {pool.submit(fetch, crawler): crawler for crawler in crawlers}
+        for future in as_completed(futures):
+            yield futures[future], future
+
+
+def run_all(
+    crawlers: list[CrawlerModule],
+    workers: int = DEFAULT_WORKERS,
+    per_host: int = DEFAULT_PER_HOST,
+    force: bool = False,
+    full_replace: bool = False,
+    offline: bool = False,
+    fingerprints: dict[str, str] | None = None,
+) -> list[str]:
+    """Fetch all companies concurrently and write each one as soon as it arrives.
+
+    A failing company (fetch or write) does not stop the others. Companies whose
+    fetched data is unchanged since the last run are skipped unless *force* is set.
+    *full_replace* rewrites each sheet instead of writing a diff; *offline*
+    only updates the local job store. If *fingerprints* is given, each
+    successfully fetched crawler's name is mapped in it to a fingerprint of
+    its kept jobs (over all its sheet targets).
+    Returns the names of the crawlers that raised.
+    """
+    failed = []
+    start_run()  # one 수집일시 for every company in this run
+    for crawler, future in fetch_concurrently(crawlers, workers, per_host):
+        try:
+            streams = future.result()
+        except Exception:
+            traceback.print_exc()
+            print(f"!!! {crawler.config.company_name} 크롤링 실패 — 다음 회사로 계속합니다.")
+            with METRICS.company(crawler.config.company_name):
+                METRICS.count("failures", stage="fetch")
+            failed.append(crawler.name)
+            continue
+        if fingerprints is not None:
+            combined = "".join(stream.fingerprint for _, stream in streams)
+            fingerprints[crawler.name] = hashlib.sha256(combined.encode()).hexdigest()
+        for config, stream in streams:
+            print(f"\n=== {config.company_name} 시트 갱신 ===")
+            with METRICS.company(config.company_name):
+                try:
+                    sync_rows(config, stream, force=force, full_replace=full_replace, offline=offline)
+                except Exception:
+                    traceback.print_exc()
+                    print(f"!!! {config.company_name} 시트 갱신 실패 — 다음으로 계속합니다.")
+                    METRICS.count("failures", stage="sync")
+                    if crawler.name not in failed:
+                        failed.append(crawler.name)
+    return failed
+
+
+def sync_summaries(env_vars: list[str]) -> list[str]:
+    """sync_summary() once per distinct spreadsheet; returns the env vars that failed."""
+    failed = []
+    for env_var in {os.environ.get(env_var): env_var for env_var in reversed(env_vars)}.values():
+        with METRICS.company(env_var):
+            try:
+                sync_summary(env_var)
+            except Exception:
+                traceback.print_exc()
+                print(f"!!! {env_var} Summary 갱신 실패 — 다음으로 계속합니다.")
+                METRICS.count("failures", stage="summary")
+                failed.append(env_var)
+    return failed
+
+
+def compact_archives(env_vars: list[str]) -> int:
+    """compact_archive() once per distinct spreadsheet; returns the exit code."""
+    failed = []
+    for env_var in {os.environ.get(env_var): env_var for env_var in reversed(env_vars)}.values():
+        with METRICS.company(env_var):
+            try:
+                compact_archive(env_var)
+            except Exception:
+                traceback.print_exc()
+                print(f"!!! {env_var} Archive 정리 실패 — 다음으로 계속합니다.")
+                METRICS.count("failures", stage="compact")
+                failed.append(env_var)
+    print(f"Sheets API 호출: {sum(API_CALLS.values())}회 {dict(API_CALLS)}")
+    return 1 if failed else 0
+
+
+class PollSchedule:
+    """Per-crawler polling intervals for --daemon, adapted to how often each source changes.
+
+    After each poll a crawler's interval is multiplied by DAEMON_SPEEDUP if
+    its fetched jobs changed since its previous poll, and by DAEMON_BACKOFF
+    if they did not or the fetch failed, within [min_interval, max_interval].
+    The next poll is due one interval later, ± *jitter* of it, so crawlers
+    that share a host drift apart. The state is kept in a JSON file, so a
+    restarted daemon resumes the learned intervals instead of polling every
+    source at once.
+
+    Args:
+        path: State file (CACHE_DIR/schedule.json).
+        names: Crawler names to schedule; new ones are due at once, at DAEMON_START_INTERVAL.
+        min_interval: Shortest interval, in seconds.
+        max_interval: Longest interval, in seconds.
+        jitter: Fraction of the interval the next poll is moved by, at most.
+    """
+
+    def __init__(self, path: Path, names: list[str], min_interval: float = DAEMON_MIN_INTERVAL,
+                 max_interval: float = DAEMON_MAX_INTERVAL, jitter: float = DAEMON_JITTER):
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("--min-interval은 0보다 크고 --max-interval 이하여야 합니다.")
+        self.path = path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        try:
+            saved = json.loads(path.read_text())
+        except (OSError, ValueError):
+            saved = {}
+        # name → {"interval": seconds, "next_at": epoch seconds, "fingerprint": of the last successful fetch}
+        self.state: dict[str, dict] = {}
+        for name in names:
+            entry = saved.get(name) if isinstance(saved, dict) else None
+            if not isinstance(entry, dict):
+                entry = {"interval": DAEMON_START_INTERVAL, "next_at": 0.0, "fingerprint": ""}
+            entry["interval"] = self._clamp(entry.get("interval", DAEMON_START_INTERVAL))
+            entry["next_at"] = min(float(entry.get("next_at", 0.0)), time.time() + entry["interval"])
+            self.state[name] = entry
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, float(interval)))
+
+    def due(self, now: float) -> list[str]:
+        """Names of the crawlers whose next poll is due at *now*."""
+        return [name for name, entry in self.state.items() if entry["next_at"] <= now]
+
+    def next_at(self) -> float:
+        """Time of the earliest next poll."""
+        return min(entry["next_at"] for entry in self.state.values())
+
+    def record(self, name: str, fingerprint: str | None, now: float) -> bool:
+        """Adapt *name*'s interval to a poll that fetched *fingerprint* (None: failed); returns whether it changed."""
+        entry = self.state[name]
+        changed = fingerprint is not None and entry["fingerprint"] not in ("", fingerprint)
+        if changed:
+            entry["interval"] = self._clamp(entry["interval"] * DAEMON_SPEEDUP)
+        elif fingerprint is None or entry["fingerprint"]:  # 첫 폴링은 비교 대상이 없으므로 간격 유지
+            entry["interval"] = self._clamp(entry["interval"] * DAEMON_BACKOFF)
+        if fingerprint is not None:
+            entry["fingerprint"] = fingerprint
+        entry["next_at"] = now + entry["interval"] * random.uniform(1 - self.jitter, 1 + self.jitter)
+        return changed
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(self.state, ensure_ascii=False, indent=2))
+        os.replace(tmp, self.path)
+
+
+def format_interval(seconds: float) -> str:
+    """Interval for the log, e.g. "30초", "45분", "6.0시간"."""
+    if seconds < 2 * 60:
+        return f"{seconds:.0f}초"
+    return f"{seconds / 60:.0f}분" if seconds < 2 * 60 * 60 else f"{seconds / 3600:.1f}시간"
+
+
+def parse_interval(value: str) -> float:
+    """argparse type for intervals: "90" or "90s", "15m", "6h", "1d" → seconds."""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smhd]?)", value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"잘못된 간격: {value} (예: 30m, 6h, 1d)")
+    return float(match[1]) * {"": 1, "s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}[match[2]]
+
+
+def run_daemon(
+    crawlers: list[CrawlerModule],
+    schedule: PollSchedule,
+    stop: threading.Event,
+    workers: int = DEFAULT_WORKERS,
+    per_host: int = DEFAULT_PER_HOST,
+    force: bool = False,
+    full_replace: bool = False,
+    offline: bool = False,
+    summaries: bool = True,
+    metrics_path: str | None = None,
+) -> None:
+    """Poll the crawlers as *schedule* says until *stop* is set.
+
+    Each round runs run_all() on the crawlers that are due — so the global
+    and per-host fetch limits hold across crawlers polled together — then
+    rewrites the Summary tab of their spreadsheets (with *summaries*),
+    adapts their intervals and saves the schedule. The run report
+    (*metrics_path*) covers the latest round.
+    """
+    by_name = {crawler.name: crawler for crawler in crawlers}
+    while not stop.is_set():
+        due = [by_name[name] for name in schedule.due(time.time())]
+        if due:
+            METRICS.reset()
+            print(f"\n##### 폴링 {time.strftime('%Y-%m-%d %H:%M:%S')}: {', '.join(c.config.company_name for c in due)} #####")
+            fingerprints: dict[str, str] = {}
+            run_all(due, workers=workers, per_host=per_host, force=force, full_replace=full_replace,
+                    offline=offline, fingerprints=fingerprints)
+            if summaries:
+                sync_summaries(list(dict.fromkeys(
+                    config.spreadsheet_env_var for crawler in due for config in crawler.configs)))
+            now = time.time()
+            for crawler in due:
+                fingerprint = fingerprints.get(crawler.name)
+                changed = schedule.record(crawler.name, fingerprint, now)
+                state = "실패" if fingerprint is None else "변경" if changed else "변경 없음"
+                print(f"{crawler.config.company_name}: {state} — 다음 폴링 {format_interval(schedule.state[crawler.name]['interval'])} 후")
+            schedule.save()
+            write_run_report(metrics_path)
+        stop.wait(max(0.0, schedule.next_at() - time.time()))
+    print("데몬 종료")
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="모든 회사 채용 공고를 한 프로세스에서 수집합니다.")
+    parser.add_argument("crawlers", nargs="*", help="실행할 크롤러 (예: toss, naver_crawler). 생략 시 전체")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="전체 동시 fetch 수 (1 = 순차)")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST, help="API 호스트당 동시 fetch 수")
+    parser.add_argument("--force", action="store_true", help="변경 사항이 없어도 시트를 다시 씀")
+    parser.add_argument("--full-replace", action="store_true", help="변경분 대신 시트 전체를 지우고 다시 씀 (정렬 포함)")
+    parser.add_argument("--offline", action="store_true", help="로컬 저장소만 갱신 (시트는 다음 온라인 실행 때 반영)")
+    parser.add_argument("--fake-sheets", action="store_true", help="메모리 내 가짜 Google Sheets에 기록 (인증 불필요)")
+    parser.add_argument("--compact-archive", action="store_true",
+                        help="크롤링 대신 대상 스프레드시트의 Archive 탭을 중복 제거·파티션별로 다시 씀")
+    parser.add_argument("--sink", action="append", metavar="NAME",
+                        help="출력 대상 (sheets, jsonl, csv, parquet; 반복 또는 쉼표로 여러 개). 기본값: CRAWLER_SINKS 또는 sheets")
+    parser.add_argument("--output-dir", metavar="DIR", help="로컬 출력 파일 디렉터리 (기본값: CRAWLER_OUTPUT_DIR 또는 output)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Google Sheets 없이 로컬 출력만 기록 (저장소 사본 사용 — 저장소·캐시는 바뀌지 않음)")
+    parser.add_argument("--metrics", default=METRICS_PATH, metavar="PATH",
+                        help="실행 보고서 경로 (.prom → Prometheus 텍스트, 그 외 JSON, - → 표준 출력). "
+                             "기본값: CRAWLER_METRICS 환경변수")
+    parser.add_argument("--daemon", action="store_true", help="상주하며 회사별 간격으로 반복 수집 (변경이 잦은 곳은 자주)")
+    parser.add_argument("--min-interval", type=parse_interval, default=DAEMON_MIN_INTERVAL, metavar="DURATION",
+                        help="--daemon 최소 폴링 간격 (예: 15m, 기본값 15분)")
+    parser.add_argument("--max-interval", type=parse_interval, default=DAEMON_MAX_INTERVAL, metavar="DURATION",
+                        help="--daemon 최대 폴링 간격 (예: 1d, 기본값 1일)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    METRICS.timing = bool(args.metrics)
+    crawlers = discover_crawlers(args.crawlers or None)
+    if not crawlers:
+        print("실행할 크롤러가 없습니다.")
+        return 1
+
+    try:
+        use_sinks([name for value in args.sink for name in value.split(",")] if args.sink else None,
+                  args.output_dir)
+        sheets = SheetsSink.name in sink_names()
+    except ValueError as error:
+        print(error)
+        return 1
+    if args.dry_run:
+        if args.compact_archive:
+            print("--dry-run과 --compact-archive는 함께 쓸 수 없습니다.")
+            return 1
+        state_dir = start_dry_run()
+        print(f"드라이런: 출력 {', '.join(sink_names())}, 저장소 사본 {state_dir}")
+        sheets = False
+
+    env_vars = list(dict.fromkeys(config.spreadsheet_env_var for crawler in crawlers for config in crawler.configs))
+    if args.fake_sheets:
+        from fake_sheets import FakeClient
+
+        use_google_client(FakeClient())
+        for env_var in env_vars:
+            os.environ.setdefault(env_var, f"fake-{env_var}")
+
+    if args.compact_archive:
+        if args.daemon:
+            print("--daemon과 --compact-archive는 함께 쓸 수 없습니다.")
+            return 1
+        status = compact_archives(env_vars)
+        write_run_report(args.metrics)
+        return status
+
+    if args.daemon:
+        try:
+            schedule = PollSchedule(base.CACHE_DIR / "schedule.json", [crawler.name for crawler in crawlers],
+                                    args.min_interval, args.max_interval)
+        except ValueError as error:
+            print(error)
+            return 1
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+        run_daemon(crawlers, schedule, stop, workers=args.workers, per_host=args.per_host, force=args.force,
+                   full_replace=args.full_replace, offline=args.offline, summaries=sheets and not args.offline,
+                   metrics_path=args.metrics)
+        return 0
+
+    failed = run_all(crawlers, workers=args.workers, per_host=args.per_host, force=args.force,
+                     full_replace=args.full_replace, offline=args.offline)
+    summary_failed = sync_summaries(env_vars) if sheets and not args.offline else []
+    print(f"\n전체 {len(crawlers)}개 중 {len(crawlers) - len(failed)}개 성공")
+    if sheets:
+        print(f"Sheets API 호출: {sum(API_CALLS.values())}회 {dict(API_CALLS)}")
+    write_run_report(args.metrics)
+    if failed:
+        print(f"실패: {', '.join(failed)}")
+    if summary_failed:
+        print(f"Summary 갱신 실패: {', '.join(summary_failed)}")
+    return 1 if failed or summary_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,107 @@
+"""Google service-account client for the Sheets sink, with its OAuth token cached across runs.
+
+Authorizing costs a token round-trip (a signed JWT exchanged at Google's
+token endpoint), and gspread's open_by_key fetches the spreadsheet's
+metadata before returning. Neither is needed when the previous run is
+recent enough:
+
+- the access token (valid for an hour) is kept in CACHE_DIR with its expiry
+  and reused by any process started before it expires. google-auth still
+  refreshes it on expiry or when the API answers 401, and every refresh is
+  written back (CachedCredentials);
+- open_by_key returns a handle that fetches nothing (SpreadsheetHandle);
+  sheets_io.SheetIO reads the tab metadata it needs once and caches it
+  across runs as well.
+
+Imported by base.get_google_client only when a Sheets sink first needs a
+client, so local-only runs never load gspread or google-auth.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import gspread
+from google.oauth2.service_account import Credentials
+
+
+class CachedCredentials(Credentials):
+    """Service-account credentials that reuse and persist their access token.
+
+    Attributes:
+        token_path: JSON file holding {"key", "token", "expiry"}; None disables the cache.
+    """
+    token_path: Path | None = None
+
+    @property
+    def cache_key(self) -> str:
+        """Identifies the account, key and scopes a cached token was issued for."""
+        identity = "\n".join([self.service_account_email, self._signer.key_id or "", *sorted(self.scopes or [])])
+        return hashlib.sha256(identity.encode()).hexdigest()
+
+    def load_token(self) -> bool:
+        """Adopt the cached token if it was issued for these credentials; returns whether it is still valid."""
+        if self.token_path is None:
+            return False
+        try:
+            cached = json.loads(self.token_path.read_text())
+            if cached["key"] != self.cache_key:
+                return False
+            self.token = cached["token"]
+            self.expiry = datetime.fromisoformat(cached["expiry"])  # naive UTC, like google-auth
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        return self.valid
+
+    def refresh(self, request) -> None:
+        super().refresh(request)
+        self.save_token()
+
+    def save_token(self) -> None:
+        """Write the current token to token_path (owner-only, replaced atomically)."""
+        if self.token_path is None or not self.token or not self.expiry:
+            return
+        body = json.dumps({"key": self.cache_key, "token": self.token, "expiry": self.expiry.isoformat()})
+        self.token_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.token_path.with_name(self.token_path.name + ".tmp")
+        with os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as file:
+            file.write(body)
+        os.replace(tmp, self.token_path)
+
+
+class SpreadsheetHandle(gspread.Spreadsheet):
+    """A gspread Spreadsheet that does not fetch metadata when opened.
+
+    SheetIO only needs the ID and the batch methods; the handle's title and
+    other properties are not loaded (see sheets_io.SheetIO.sheets for the
+    tab metadata). A wrong ID or missing permission surfaces on the first
+    call instead of at open time.
+    """
+
+    def __init__(self, http_client, properties: dict):
+        self.client = http_client
+        self._properties = properties
+
+
+class CachedClient(gspread.Client):
+    """gspread Client whose open_by_key returns a SpreadsheetHandle (no round-trip)."""
+
+    def open_by_key(self, key: str) -> SpreadsheetHandle:
+        return SpreadsheetHandle(self.http_client, {"id": key})
+
+
+def authorize(credentials_json: str, scopes: list[str], token_path: Path | None) -> CachedClient:
+    """Build a client from a service-account JSON key, reusing the token cached at *token_path*.
+
+    Args:
+        credentials_json: The service account's JSON key (GOOGLE_CREDENTIALS).
+        scopes: OAuth scopes to request.
+        token_path: Token cache file; None to always fetch a new token.
+    """
+    credentials = CachedCredentials.from_service_account_info(json.loads(credentials_json), scopes=scopes)
+    credentials.token_path = token_path
+    if credentials.load_token():
+        print("Google 인증: 캐시된 토큰 사용")
+    return CachedClient(auth=credentials)
@@ -0,0 +1,426 @@
+"""Batched Google Sheets I/O — one read and one write per company run.
+
+A naive sync costs a round-trip per gspread helper (worksheet lookup, header
+check, get_all_values, append_rows, clear, update). SheetIO instead:
+
+- reads every needed range in a single `values_batch_get`, using sheet
+  metadata that is fetched once per spreadsheet and, with use_metadata_cache,
+  kept across runs (a run whose request is rejected as stale refetches it and
+  retries once);
+- queues all writes (archive append, data rows, blanking of leftover rows) and
+  commits them in a single `values_batch_update`, preceded by one structural
+  `batch_update` only when a tab must be created or grown. Very large writes
+  are committed in chunks of SHEETS_CHUNK_CELLS cells, one request each, so
+  such a write is not atomic as a whole (see SheetIO.commit).
+
+Because the data tab is overwritten in place rather than cleared first, it is
+never observed empty by readers such as the Apps Script newsletter.
+
+Every API call goes through SCHEDULER, which enforces a token-bucket request
+rate below the Sheets per-minute quota and retries 429/5xx responses with
+backoff, and is counted in API_CALLS (process-wide, by method name) and in
+METRICS (per company; reads and writes as the "read" / "write" stages, waits
+for the rate limit or a retry as "throttle").
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from metrics import METRICS
+
+if TYPE_CHECKING:  # gspread is imported on the first call, so local-only runs never load it
+    from gspread.exceptions import APIError
+
+# Process-wide Sheets API call counts, by Spreadsheet method name
+API_CALLS: Counter = Counter()
+
+# Sheets API quota: 60 requests/min per user — stay just under it
+SHEETS_REQUESTS_PER_MINUTE = 55
+SHEETS_BURST = 10
+SHEETS_RETRIES = 5
+SHEETS_BACKOFF = 2.0  # seconds; doubles per attempt, plus up to the same amount of jitter
+SHEETS_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Methods timed as the "read" stage; every other call is a "write"
+READ_METHODS = frozenset({"fetch_sheet_metadata", "values_batch_get"})
+
+# spreadsheet ID → {tab title → {"sheetId", "rowCount", "columnCount"}}
+_metadata_cache: dict[str, dict[str, dict]] = {}
+# File keeping _metadata_cache across runs (see use_metadata_cache), and the
+# spreadsheets whose cached metadata was read from it rather than fetched
+_metadata_path: Path | None = None
+_metadata_from_disk: set[str] = set()
+_metadata_lock = threading.Lock()
+
+NEW_SHEET_ROWS = 1000  # grid size for newly created tabs (Sheets UI default)
+
+# Queued cells that trigger an early commit — keeps large writes (first run,
+# full replace) in bounded memory and well under the request size limit
+SHEETS_CHUNK_CELLS = 50_000
+
+
+class SheetsScheduler:
+    """Token-bucket rate limiter and retry policy shared by all Sheets API calls.
+
+    Calls are admitted at *per_minute* on average with bursts of up to *burst*.
+    An APIError with a status in SHEETS_RETRY_STATUSES is retried up to
+    *retries* times, waiting for Retry-After when the response carries one,
+    otherwise for an exponentially growing, jittered delay. Retries are
+    counted in `retried` by status code.
+    """
+
+    def __init__(
+        self,
+        per_minute: float = SHEETS_REQUESTS_PER_MINUTE,
+        burst: int = SHEETS_BURST,
+        retries: int = SHEETS_RETRIES,
+        backoff: float = SHEETS_BACKOFF,
+        sleep=time.sleep,
+    ):
+        self.rate = per_minute / 60
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.sleep = sleep
+        self.retried: Counter = Counter()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> None:
+        """Block until a request token is available."""
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                with METRICS.stage("throttle"):
+                    self.sleep((1 - self._tokens) / self.rate)
+
+    def _delay(self, error: "APIError", attempt: int) -> float:
+        retry_after = error.response.headers.get("Retry-After") if error.response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * 2 ** attempt + random.uniform(0, self.backoff)
+
+    def call(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) under the rate limit, retrying quota and server errors."""
+        from gspread.exceptions import APIError
+
+        for attempt in range(self.retries + 1):
+            self._acquire()
+            try:
+                return fn(*args, **kwargs)
+            except APIError as error:
+                status = error.response.status_code if error.response is not None else None
+                if status not in SHEETS_RETRY_STATUSES or attempt == self.retries:
+                    raise
+                delay = self._delay(error, attempt)
+                self.retried[status] += 1
+                METRICS.count("sheets_retries", status=str(status))
+                print(f"Sheets API {status} 응답 — {delay:.1f}초 후 재시도 ({attempt + 1}/{self.retries})")
+                with METRICS.stage("throttle"):
+                    self.sleep(delay)
+
+
+# Process-wide scheduler; every gspread call in the crawler should go through it
+SCHEDULER = SheetsScheduler()
+
+
+def use_metadata_cache(path: Path | None) -> None:
+    """Keep tab metadata in *path* across runs (None: for this process only)."""
+    global _metadata_path
+    _metadata_path = path
+
+
+def forget_metadata(spreadsheet_id: str | None = None) -> None:
+    """Drop the cached tab metadata of one spreadsheet (all with None), in memory and on disk."""
+    with _metadata_lock:
+        if spreadsheet_id is None:
+            _metadata_cache.clear()
+            _metadata_from_disk.clear()
+        else:
+            _metadata_cache.pop(spreadsheet_id, None)
+            _metadata_from_disk.discard(spreadsheet_id)
+        if _metadata_path is None:
+            return
+        try:
+            saved = json.loads(_metadata_path.read_text())
+        except (OSError, ValueError):
+            return
+        if isinstance(saved, dict) and spreadsheet_id is not None:
+            saved.pop(spreadsheet_id, None)
+        else:
+            saved = {}
+        _write_metadata(saved)
+
+
+def _load_metadata(spreadsheet_id: str) -> dict[str, dict] | None:
+    """Adopt the metadata saved for *spreadsheet_id* by an earlier run, if any."""
+    if _metadata_path is None:
+        return None
+    try:
+        cached = json.loads(_metadata_path.read_text()).get(spreadsheet_id)
+    except (OSError, ValueError, AttributeError):
+        return None
+    if cached is not None:
+        _metadata_cache[spreadsheet_id] = cached
+        _metadata_from_disk.add(spreadsheet_id)
+    return cached
+
+
+def _save_metadata() -> None:
+    """Merge _metadata_cache into the file (other spreadsheets' entries are kept), replacing it atomically."""
+    if _metadata_path is None:
+        return
+    with _metadata_lock:
+        try:
+            saved = json.loads(_metadata_path.read_text())
+        except (OSError, ValueError):
+            saved = {}
+        if not isinstance(saved, dict):
+            saved = {}
+        saved.update(_metadata_cache)
+        _write_metadata(saved)
+
+
+def _write_metadata(saved: dict) -> None:
+    _metadata_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _metadata_path.with_name(_metadata_path.name + ".tmp")
+    tmp.write_text(json.dumps(saved, ensure_ascii=False))
+    os.replace(tmp, _metadata_path)
+
+
+def column_letter(number: int) -> str:
+    """Return the A1 column letter for a 1-based column number (1 → A, 27 → AA)."""
+    letters = ""
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def a1_range(title: str, cells: str) -> str:
+    """Qualify an A1 range with a quoted sheet title, e.g. 'Archive'!A1:J3."""
+    return "'" + title.replace("'", "''") + "'!" + cells
+
+
+class SheetIO:
+    """Batched reader/writer for the tabs of one spreadsheet.
+
+    Usage:
+        io = SheetIO(spreadsheet, width=10)
+        io.load({"카카오": "A:J", "Archive": "I:I"})   # 1 API call
+        io.write_rows("카카오", 2, rows)
+        io.append("Archive", closed_rows)
+        io.commit()                                     # 1 API call (+1 if a tab is created)
+    """
+
+    def __init__(
+        self,
+        spreadsheet,
+        width: int,
+        counter: Counter = API_CALLS,
+        scheduler: SheetsScheduler | None = None,
+        chunk_cells: int = SHEETS_CHUNK_CELLS,
+    ):
+        self.spreadsheet = spreadsheet
+        self.width = width
+        self.counter = counter
+        self.scheduler = scheduler
+        self.chunk_cells = chunk_cells
+        self.calls: Counter = Counter()  # calls made by this instance
+        self.cells = 0  # cells written by this instance
+        self._values: dict[str, list[list[str]]] = {}
+        self._row_counts: dict[str, int] = {}
+        self._reserved: dict[str, int] = {}
+        self._widths: dict[str, int] = {}
+        self._pending: list[dict] = []
+        self._pending_cells = 0
+        self._pending_rows = 0
+
+    def _call(self, method: str, *args, **kwargs):
+        self.calls[method] += 1
+        self.counter[method] += 1
+        METRICS.count("sheets_api_calls", method=method)
+        scheduler = self.scheduler or SCHEDULER
+        with METRICS.stage("read" if method in READ_METHODS else "write"):
+            return scheduler.call(getattr(self.spreadsheet, method), *args, **kwargs)
+
+    def sheets(self) -> dict[str, dict]:
+        """Return {title: properties} for the spreadsheet, fetching metadata only when not cached."""
+        cached = _metadata_cache.get(self.spreadsheet.id)
+        if cached is None:
+            cached = _load_metadata(self.spreadsheet.id)
+        if cached is None:
+            metadata = self._call("fetch_sheet_metadata")
+            cached = {}
+            for sheet in metadata.get("sheets", []):
+                properties = sheet["properties"]
+                grid = properties.get("gridProperties", {})
+                cached[properties["title"]] = {
+                    "sheetId": properties["sheetId"],
+                    "rowCount": grid.get("rowCount", 0),
+                    "columnCount": grid.get("columnCount", 0),
+                }
+            _metadata_cache[self.spreadsheet.id] = cached
+            _save_metadata()
+        return cached
+
+    def _refetching_stale(self, operation):
+        """Run operation(); if it fails with 400 on metadata read from disk, refetch the metadata and retry once.
+
+        Cached metadata goes stale when someone edits the spreadsheet by hand
+        (a tab renamed or deleted, rows removed); Sheets then rejects the
+        ranges or grid requests built from it with 400.
+        """
+        from gspread.exceptions import APIError
+
+        try:
+            return operation()
+        except APIError as error:
+            if error.response.status_code != 400 or self.spreadsheet.id not in _metadata_from_disk:
+                raise
+            print("Sheets 메타데이터 캐시가 오래됨 — 다시 읽고 재시도합니다.")
+            forget_metadata(self.spreadsheet.id)
+            return operation()
+
+    def load(self, ranges: dict[str, str]) -> None:
+        """Read {title: A1 cell range} for all tabs in one values_batch_get.
+
+        Tabs that do not exist yet read as empty and are created on commit()
+        if anything is written to them.
+        """
+        self._refetching_stale(lambda: self._load(ranges))
+
+    def _load(self, ranges: dict[str, str]) -> None:
+        sheets = self.sheets()
+        existing = [title for title in ranges if title in sheets]
+        for title in ranges:
+            self._values[title] = []
+
+        if existing:
+            response = self._call("values_batch_get", [a1_range(title, ranges[title]) for title in existing])
+            for title, value_range in zip(existing, response.get("valueRanges", [])):
+                self._values[title] = value_range.get("values", [])
+
+        for title in ranges:
+            self._row_counts[title] = len(self._values[title])
+
+    def rows(self, title: str) -> list[list[str]]:
+        """Rows loaded for *title* (Sheets omits trailing empty rows and cells)."""
+        return self._values[title]
+
+    def row_count(self, title: str) -> int:
+        """Number of rows in use in *title*, including rows queued by append()."""
+        return self._row_counts[title]
+
+    def set_row_count(self, title: str, rows: int) -> None:
+        """Declare the rows in use in *title* without reading it (e.g. as tracked by the job store)."""
+        self._row_counts[title] = rows
+
+    def reserve(self, title: str, rows: int) -> None:
+        """Declare that *title* will use *rows* rows, so the grid is grown once before chunked writes."""
+        self._reserved[title] = max(self._reserved.get(title, 0), rows)
+
+    def write_rows(self, title: str, start_row: int, values: list[list[str]]) -> None:
+        """Queue a write of rows starting at 1-based *start_row*, column A.
+
+        Rows are *width* cells wide unless the tab's rows are wider (e.g. the Delta tab).
+        """
+        if not values:
+            return
+        end_row = start_row + len(values) - 1
+        width = max(self.width, max(len(row) for row in values))
+        self._widths[title] = max(self._widths.get(title, 0), width)
+        cells = f"A{start_row}:{column_letter(width)}{end_row}"
+        self._pending.append({"range": a1_range(title, cells), "values": values})
+        self._pending_cells += sum(len(row) for row in values)
+        self._pending_rows += len(values)
+        self._row_counts[title] = max(self._row_counts.get(title, 0), end_row)
+        if self._pending_cells >= self.chunk_cells:
+            self.commit()
+
+    def append(self, title: str, values: list[list[str]]) -> None:
+        """Queue *values* after the last row in use in *title*."""
+        self.write_rows(title, self._row_counts[title] + 1, values)
+
+    def commit(self) -> int:
+        """Apply all queued writes; returns the number of cells written by this instance so far.
+
+        Creates missing tabs and grows grids first (one batch_update, only when
+        needed), then writes every queued range in one values_batch_update.
+        Each batch is atomic on the Sheets side, so while a 429 retry is pending
+        the tabs still hold their previous, complete contents — nothing is
+        cleared ahead of the write. Writes larger than *chunk_cells* are
+        committed early by write_rows(), in several batches; if a later batch
+        fails for good, the earlier ones stay applied and the tabs are left
+        part-written (SheetsSink.write then has the next run re-read them).
+        The stale-metadata retry repeats only the failed batch.
+        """
+        if not self._pending:
+            return self.cells
+
+        def write() -> None:
+            self._ensure_grids()
+            self._call("values_batch_update", {"valueInputOption": "USER_ENTERED", "data": self._pending})
+
+        self._refetching_stale(write)
+        self.cells += self._pending_cells
+        METRICS.count("cells_written", self._pending_cells)
+        METRICS.count("rows_written", self._pending_rows)
+        self._pending = []
+        self._pending_cells = 0
+        self._pending_rows = 0
+        return self.cells
+
+    def _ensure_grids(self) -> None:
+        """Create new tabs and append grid rows so every queued range fits."""
+        sheets = self.sheets()
+        requests = []
+        needed = {title: max(count, self._reserved.get(title, 0)) for title, count in self._row_counts.items()}
+        new_tabs = [title for title, count in self._row_counts.items() if count and title not in sheets]
+        for title in new_tabs:
+            requests.append({"addSheet": {"properties": {
+                "title": title,
+                "gridProperties": {
+                    "rowCount": max(NEW_SHEET_ROWS, needed[title]),
+                    "columnCount": self._widths.get(title, self.width),
+                },
+            }}})
+        grown = {}
+        for title, properties in sheets.items():
+            rows = needed.get(title, 0)
+            if rows > properties["rowCount"]:
+                requests.append({"appendDimension": {
+                    "sheetId": properties["sheetId"],
+                    "dimension": "ROWS",
+                    "length": rows - properties["rowCount"],
+                }})
+                grown[title] = rows
+
+        if not requests:
+            return
+
+        response = self._call("batch_update", {"requests": requests})
+        for title, row_count in grown.items():
+            sheets[title]["rowCount"] = row_count
+        for reply in response.get("replies", []):
+            properties = reply.get("addSheet", {}).get("properties")
+            if properties:
+                grid = properties.get("gridProperties", {})
+                sheets[properties["title"]] = {
+                    "sheetId": properties["sheetId"],
+                    "rowCount": grid.get("rowCount", 0),
+                    "columnCount": grid.get("columnCount", 0),
+                }
+        _save_metadata()
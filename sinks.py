@@ -0,0 +1,158 @@
+"""Output sinks — where a company's run goes once the job store has recorded it.
+
+sync_rows() stages a crawl into the store, then hands the run to every
+selected sink: before the store records it (prepare) and after (write).
+Google Sheets is one sink (base.SheetsSink, the default); the local file
+sinks below need neither the network nor the Google client libraries, which
+are only imported when a Sheets sink is used.
+
+    jsonl   — append-only change log, `<tab>.jsonl`: one line per new /
+              reopened / closed posting per run; a new log starts with the
+              open postings (event "open")
+    csv     — snapshot of the open postings, `<tab>.csv`, in sheet layout (HEADER)
+    parquet — the same snapshot as a columnar `<tab>.parquet` (needs pyarrow)
+
+Snapshots are replaced atomically, so a reader never sees a partial file.
+Every sink is built per company tab and run (base.make_sinks) and has its own
+fingerprint, so adding a sink writes it on the next run even when the fetched
+data is unchanged.
+"""
+
+import csv
+import json
+import os
+from pathlib import Path
+
+from job_store import DATA_COLUMNS, ROW_COLUMNS, JobStore, RunDelta, chunked
+
+# Directory of the local sink files (CRAWLER_OUTPUT_DIR)
+OUTPUT_DIR = Path(os.environ.get("CRAWLER_OUTPUT_DIR", "output"))
+
+PARQUET_BATCH_ROWS = 10_000  # rows per Parquet record batch — bounds memory for large tabs
+
+
+class Sink:
+    """One output of sync_rows() for one company tab.
+
+    Attributes:
+        name: Name selecting the sink (CRAWLER_SINKS, run_all.py --sink).
+        remote: Whether the sink needs the network; offline and dry runs skip it.
+        source: Store source (= company tab) the sink writes.
+    """
+    name = ""
+    remote = False
+
+    def __init__(self, source: str):
+        self.source = source
+
+    @classmethod
+    def check(cls) -> None:
+        """Raise ValueError if the sink cannot be used here (e.g. a missing optional dependency)."""
+
+    @property
+    def key(self) -> str:
+        """Key of the fingerprint saved after a successful write (see base.load_fingerprint)."""
+        return f"{self.name}:{self.source}"
+
+    def prepare(self, store: JobStore, now: str, full_replace: bool = False) -> None:
+        """Called before the run is recorded in the store; nothing by default."""
+
+    def write(self, store: JobStore, delta: RunDelta, now: str, full_replace: bool = False) -> None:
+        """Write the run the store recorded at *now*."""
+        raise NotImplementedError
+
+
+class FileSink(Sink):
+    """A sink writing `<directory>/<tab><suffix>`."""
+    suffix = ""
+
+    def __init__(self, source: str, directory: Path, header: list[str]):
+        super().__init__(source)
+        self.path = Path(directory) / f"{source}{self.suffix}"
+        self.header = header
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}:{self.path}"
+
+    def _replace(self, write) -> None:
+        """Write the file through write(tmp_path), then move it into place."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        write(tmp)
+        os.replace(tmp, self.path)
+
+
+class JsonlSink(FileSink):
+    name = "jsonl"
+    suffix = ".jsonl"
+
+    def write(self, store: JobStore, delta: RunDelta, now: str, full_replace: bool = False) -> None:
+        if self.path.exists():
+            lines = ({"run_at": now, "event": kind, **dict(zip(DATA_COLUMNS, values))}
+                     for kind, *values in store.run_events(self.source, delta))
+        else:
+            lines = ({"run_at": now, "event": "open", **dict(zip(DATA_COLUMNS, values))}
+                     for values in store.open_rows(self.source))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with self.path.open("a", encoding="utf-8") as file:
+            for line in lines:
+                file.write(json.dumps(line, ensure_ascii=False) + "\n")
+                count += 1
+        print(f"JSONL 기록: {self.path} ({count}줄 추가)")
+
+
+class CsvSink(FileSink):
+    name = "csv"
+    suffix = ".csv"
+
+    def write(self, store: JobStore, delta: RunDelta, now: str, full_replace: bool = False) -> None:
+        count = 0
+
+        def write(path: Path) -> None:
+            nonlocal count
+            # utf-8-sig: Excel이 한글을 깨뜨리지 않고 열도록 BOM 포함
+            with path.open("w", encoding="utf-8-sig", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(self.header)
+                for row in store.open_rows(self.source):
+                    writer.writerow(row)
+                    count += 1
+
+        self._replace(write)
+        print(f"CSV 저장: {self.path} ({count}건)")
+
+
+class ParquetSink(FileSink):
+    name = "parquet"
+    suffix = ".parquet"
+
+    @classmethod
+    def check(cls) -> None:
+        try:
+            import pyarrow  # noqa: F401 — optional dependency, imported only when this sink is selected
+        except ImportError as error:
+            raise ValueError("parquet 출력에는 pyarrow가 필요합니다 (pip install pyarrow).") from error
+
+    def write(self, store: JobStore, delta: RunDelta, now: str, full_replace: bool = False) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([(column, pa.string()) for column in ROW_COLUMNS])
+        count = 0
+
+        def write(path: Path) -> None:
+            nonlocal count
+            with pq.ParquetWriter(path, schema) as writer:
+                for batch in chunked(store.open_rows(self.source), PARQUET_BATCH_ROWS):
+                    writer.write_batch(pa.RecordBatch.from_arrays(
+                        [pa.array(column, pa.string()) for column in zip(*batch)], schema=schema))
+                    count += len(batch)
+
+        self._replace(write)
+        print(f"Parquet 저장: {self.path} ({count}건)")
+
+
+# Local sinks by name; base.SINK_TYPES adds "sheets"
+LOCAL_SINKS: dict[str, type[FileSink]] = {sink.name: sink for sink in (JsonlSink, CsvSink, ParquetSink)}
@@ -0,0 +1,31 @@
+"""Shared fixtures: every test runs offline, against fake_sheets and a throwaway CACHE_DIR."""
+
+import pytest
+
+import base
+import sheets_io
+from fake_sheets import FakeClient
+from sheets_io import SheetsScheduler
+
+
+@pytest.fixture
+def sheets(tmp_path, monkeypatch):
+    """A FakeClient installed as the Sheets client, with run state under *tmp_path*.
+
+    The spreadsheet ID of the tests' configs is read from $TEST_SPREADSHEET_ID.
+    """
+    client = FakeClient()
+    monkeypatch.setattr(base, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(base, "ARCHIVE_PARTITION", "none")
+    monkeypatch.setattr(base, "SINKS", "sheets")
+    # 가짜 시트에는 쿼터가 없으므로 속도 제한 없이, 재시도 대기만 짧게
+    scheduler = SheetsScheduler(per_minute=10**6, burst=10**6, backoff=0.01)
+    monkeypatch.setattr(sheets_io, "SCHEDULER", scheduler)
+    monkeypatch.setattr(base, "SCHEDULER", scheduler)  # base imports it by name (get_google_spreadsheet)
+    monkeypatch.setenv("TEST_SPREADSHEET_ID", "test")
+    base.use_google_client(client)
+    yield client.open_by_key("test")
+    base.use_google_client(None)
+    if base._store is not None:
+        base._store.close()
+        base._store = None
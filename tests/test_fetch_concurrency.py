@@ -0,0 +1,20 @@
+"""Concurrent fetch stage (run_all.fetch_concurrently) against bench's stub server with artificial latency."""
+
+import bench
+from run_all import DEFAULT_PER_HOST, DEFAULT_WORKERS
+
+LATENCY = 0.1  # 요청당 지연(초): 속도 차이가 잡음보다 충분히 크도록
+
+
+def test_concurrent_fetch_is_faster_and_returns_the_same_rows():
+    with bench.stub_server(latency=LATENCY, jobs=25) as (server, crawlers):
+        sequential, expected = bench.fetch_results(crawlers, workers=1, per_host=1)
+        sequential_requests = server.request_count
+        concurrent, actual = bench.fetch_results(crawlers, workers=DEFAULT_WORKERS, per_host=DEFAULT_PER_HOST)
+        concurrent_requests = server.request_count - sequential_requests
+
+    assert set(expected) == {config.sheet_name for crawler in crawlers for config in crawler.configs}
+    assert actual == expected
+    assert concurrent_requests == sequential_requests
+    # 순차 실행은 모든 요청 지연의 합 — 동시 실행은 호스트당 제한이 있어도 1.5배 이상 빨라야 함 (실측 약 2배)
+    assert concurrent * 1.5 < sequential, (sequential, concurrent)
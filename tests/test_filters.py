@@ -0,0 +1,91 @@
+"""compile_filter: which jobs each Condition keeps and which it excludes."""
+
+from dataclasses import replace
+
+import pytest
+
+import bench
+import naver_crawler
+from base import Condition, Profile, Source, compile_filter, contains, equals, one_of, text
+
+JOBS = [
+    {"id": 1, "title": "Sales Manager", "type": "정규직", "location": {"name": "Seoul"}},
+    {"id": 2, "title": "Backend Engineer", "type": "계약직", "location": {"name": "Busan"}},
+    {"id": 3, "title": "Business Ops", "type": "정규직", "location": None},
+    {"id": 4, "title": None, "type": "인턴", "tags": ["biz"]},
+]
+
+
+def kept(conditions) -> list[int]:
+    keep = compile_filter(conditions)
+    return [job["id"] for job in JOBS if keep(job)]
+
+
+def test_equals():
+    assert kept([equals("type", "정규직")]) == [1, 3]
+
+
+def test_one_of():
+    assert kept([one_of("type", ["계약직", "인턴"])]) == [2, 4]
+
+
+def test_contains_one_keyword():
+    assert kept([contains("title", "Engineer")]) == [2]
+
+
+def test_contains_any_of_several_keywords():
+    # 겹치는 키워드("Bus" / "Business")도 한 번의 검색으로 판정
+    assert kept([contains("title", "Bus", "Business", "Sales")]) == [1, 3]
+
+
+def test_nested_path_through_missing_or_null_parent():
+    assert kept([equals("location.name", "Seoul")]) == [1]
+    assert kept([contains("location.name", "u")]) == [1, 2]
+
+
+def test_plain_paths_compare_the_decoded_json_value():
+    # 경로 값은 문자열로 바꾸지 않으므로 숫자 ID는 숫자로 비교
+    assert kept([equals("id", 2)]) == [2]
+    assert kept([equals("id", "2")]) == []
+
+
+def test_getter_and_list_index_paths():
+    assert kept([equals(text("tags.0"), "biz")]) == [4]
+    assert kept([equals("tags.0", "biz")]) == [4]
+    assert kept([contains(lambda job: (job["title"] or "").upper(), "OPS")]) == [3]
+
+
+def test_all_conditions_must_hold():
+    assert kept([equals("type", "정규직"), contains("title", "Sales", "Backend")]) == [1]
+    assert kept([equals("type", "정규직"), equals("type", "계약직")]) == []
+
+
+def test_no_client_side_conditions():
+    assert compile_filter([]) is None
+
+
+def test_unknown_op_is_rejected():
+    with pytest.raises(ValueError, match="Unknown filter op"):
+        compile_filter([Condition("bad", "title", "startswith", ("S",))])
+
+
+def test_pushed_down_conditions_become_query_params():
+    source = naver_crawler.SOURCE
+    assert source.params["empTypeCdArr"] == "0010"
+    assert "subJobCdArr" in source.params
+    assert [output.keep for output in source.outputs] == [None]
+
+
+def test_server_only_condition_must_be_shared_by_every_profile():
+    spec = replace(naver_crawler.SPEC, profiles=(Profile("네이버-기타", (equals("empTypeCdNm", "정규직"),)),))
+    with pytest.raises(ValueError, match="서버 전용 조건"):
+        Source(spec)
+
+
+def test_source_filters_applied_to_fetched_jobs():
+    # 스텁 서버의 토스 공고는 홀수 번째만 Sales 직군 (bench._toss)
+    with bench.stub_server(latency=0, jobs=20) as (_, crawlers):
+        toss = [crawler for crawler in crawlers if crawler.name == "toss_crawler"]
+        _, results = bench.fetch_results(toss, workers=1, per_host=1)
+    (rows,) = results.values()
+    assert [row[8] for row in rows] == [str(5000 + i) for i in range(1, 20, 2)]
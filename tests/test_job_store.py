@@ -0,0 +1,159 @@
+"""JobStore run transitions — new, closed, reopened, changed — and their projection to the sheet."""
+
+import pytest
+
+import base
+from base import HEADER, CrawlerConfig
+from job_store import JobStore
+
+SOURCE = "탭"
+CONFIG = CrawlerConfig("회사", SOURCE, "TEST_SPREADSHEET_ID", "id")
+
+
+def job_row(job: dict) -> list[str]:
+    return ["회사", job["title"], "2025-01-01", "상시채용", f"https://example.com/{job['id']}",
+            "", "서울", "정규직", str(job["id"]), "ignored"]
+
+
+def record(store: JobStore, jobs: list[dict], now: str):
+    store.stage_run(job_row(job) for job in jobs)
+    return store.record_run(SOURCE, now)
+
+
+def open_titles(store: JobStore) -> dict[str, str]:
+    return {row[8]: row[1] for row in store.open_rows(SOURCE)}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    yield store
+    store.close()
+
+
+def test_first_run_records_new_postings(store):
+    delta = record(store, [{"id": 1, "title": "a"}, {"id": 2, "title": "b"}], "2025-01-01 09:00:00")
+
+    assert (delta.new, delta.closed, delta.reopened) == (2, 0, 0)
+    assert [event[0] for event in store.run_events(SOURCE, delta)] == ["new", "new"]
+    assert [row[9] for row in store.open_rows(SOURCE)] == ["2025-01-01 09:00:00"] * 2
+
+
+def test_posting_missing_from_a_run_is_closed(store):
+    record(store, [{"id": 1, "title": "a"}, {"id": 2, "title": "b"}], "2025-01-01 09:00:00")
+    delta = record(store, [{"id": 1, "title": "a"}], "2025-01-02 09:00:00")
+
+    assert (delta.new, delta.closed, delta.reopened) == (0, 1, 0)
+    assert [(event[0], event[9]) for event in store.run_events(SOURCE, delta)] == [("closed", "2")]
+    assert open_titles(store) == {"1": "a"}
+
+
+def test_closed_posting_that_reappears_is_reopened(store):
+    record(store, [{"id": 1, "title": "a"}, {"id": 2, "title": "b"}], "2025-01-01 09:00:00")
+    record(store, [{"id": 1, "title": "a"}], "2025-01-02 09:00:00")
+    delta = record(store, [{"id": 1, "title": "a"}, {"id": 2, "title": "b"}], "2025-01-03 09:00:00")
+
+    assert (delta.new, delta.closed, delta.reopened) == (0, 0, 1)
+    assert [event[0] for event in store.run_events(SOURCE, delta)] == ["reopened"]
+    # 수집일시는 처음 본 실행 기준으로 유지
+    assert {row[8]: row[9] for row in store.open_rows(SOURCE)} == {"1": "2025-01-01 09:00:00",
+                                                                  "2": "2025-01-01 09:00:00"}
+
+
+def test_changed_posting_is_updated_and_marked_dirty(store):
+    record(store, [{"id": 1, "title": "a"}, {"id": 2, "title": "b"}], "2025-01-01 09:00:00")
+    store.conn.execute("UPDATE jobs SET dirty = 0")  # 시트에 반영된 상태
+    delta = record(store, [{"id": 1, "title": "a"}, {"id": 2, "title": "b (수정)"}], "2025-01-02 09:00:00")
+
+    assert (delta.new, delta.closed, delta.reopened) == (0, 0, 0)
+    assert open_titles(store) == {"1": "a", "2": "b (수정)"}
+    dirty = dict(store.conn.execute("SELECT job_id, dirty FROM jobs WHERE source = ?", (SOURCE,)))
+    assert dirty == {"1": 0, "2": 1}
+
+
+def test_rows_without_job_id_are_skipped_and_first_duplicate_wins(store):
+    rows = [job_row({"id": 1, "title": "a"}), job_row({"id": "", "title": "no id"}), job_row({"id": 1, "title": "dup"})]
+    assert store.stage_run(rows) == 1
+    store.record_run(SOURCE, "2025-01-01 09:00:00")
+    assert open_titles(store) == {"1": "a"}
+
+
+# -- through sync_jobs, projected to the fake sheet --------------------------------
+
+def sync(jobs: list[dict]) -> None:
+    base.sync_jobs(CONFIG, iter(jobs), job_row)
+
+
+def sheet_titles(spreadsheet, title: str = SOURCE) -> dict[str, str]:
+    values = spreadsheet.values(title)
+    assert values[0] == HEADER
+    return {row[8]: row[1] for row in values[1:] if any(row)}
+
+
+def test_sheet_follows_new_closed_reopened_and_changed(sheets):
+    sync([{"id": 1, "title": "a"}, {"id": 2, "title": "b"}])
+    assert sheet_titles(sheets) == {"1": "a", "2": "b"}
+
+    sync([{"id": 1, "title": "a"}])
+    assert sheet_titles(sheets) == {"1": "a"}
+    assert sheet_titles(sheets, base.ARCHIVE_SHEET) == {"2": "b"}
+
+    sync([{"id": 1, "title": "a (수정)"}, {"id": 2, "title": "b"}])
+    assert sheet_titles(sheets) == {"1": "a (수정)", "2": "b"}
+
+
+def test_empty_fetch_leaves_sheet_and_store_untouched(sheets, capsys):
+    sync([{"id": 1, "title": "a"}, {"id": 2, "title": "b"}])
+    before, calls = sheets.values(SOURCE), sum(sheets.calls.values())
+
+    sync([])
+
+    assert "수집된 채용 공고가 없습니다." in capsys.readouterr().out
+    assert sheets.values(SOURCE) == before
+    assert sum(sheets.calls.values()) == calls
+    assert base.ARCHIVE_SHEET not in sheets.tabs
+    assert open_titles(base.get_job_store()) == {"1": "a", "2": "b"}
+
+
+def test_unchanged_fetch_is_skipped_only_while_the_store_holds_the_source(sheets, capsys):
+    jobs = [{"id": 1, "title": "a"}, {"id": 2, "title": "b"}]
+    sync(jobs)
+    sync(jobs)
+    assert "변경 사항 없음" in capsys.readouterr().out
+
+    # fingerprints.json은 남고 저장소만 사라진 경우 (캐시 일부 유실, 스키마 변경)
+    base.get_job_store().close()
+    base._store = None
+    (base.CACHE_DIR / "jobs.sqlite3").unlink()
+    sync(jobs)
+
+    assert "변경 사항 없음" not in capsys.readouterr().out
+    assert open_titles(base.get_job_store()) == {"1": "a", "2": "b"}
+    assert sheet_titles(sheets) == {"1": "a", "2": "b"}
+
+
+def test_write_failing_between_chunks_is_repaired_by_the_next_run(sheets, monkeypatch):
+    from fake_sheets import api_error
+
+    sync([{"id": 1, "title": "a"}])
+    # 5만 셀(SHEETS_CHUNK_CELLS)을 넘는 쓰기 → 여러 values_batch_update로 나뉨; 두 번째 요청에서 실패
+    jobs = [{"id": i, "title": f"t{i}"} for i in range(1, 6001)]
+    write = sheets.values_batch_update
+    calls = []
+
+    def failing_second_chunk(body):
+        calls.append(body)
+        if len(calls) == 2:
+            raise api_error(403, "PERMISSION_DENIED")
+        return write(body)
+
+    monkeypatch.setattr(sheets, "values_batch_update", failing_second_chunk)
+    with pytest.raises(Exception, match="PERMISSION_DENIED"):
+        sync(jobs)
+    assert base.get_job_store().tab_rows("test", SOURCE) is None
+
+    monkeypatch.setattr(sheets, "values_batch_update", write)
+    jobs = jobs[::2]  # 다음 실행: 절반이 마감되고 남은 행이 이동
+    sync(jobs)
+    assert sheet_titles(sheets) == {str(job["id"]): job["title"] for job in jobs}
+    assert len([row for row in sheets.values(SOURCE)[1:] if any(row)]) == len(jobs)
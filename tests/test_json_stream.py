@@ -0,0 +1,82 @@
+"""JsonArrayStream on documents split into chunks at every possible boundary."""
+
+import json
+
+import pytest
+
+from json_stream import JsonArrayStream
+
+DOCUMENT = {
+    "resultType": "SUCCESS",
+    "meta": {"skipped": [1, 2.5e3, -7, {"nested": "]}\"{["}], "flag": True, "none": None},
+    "result": {
+        "total": 3,
+        "data": {
+            "nodes": [
+                {"id": 1, "title": "서비스 기획자", "tags": ["사업", "운영"]},
+                {"id": 2, "title": 'escaped \\ "quote" é 🚀', "score": 0.125},
+                {"id": 3, "title": "", "location": None},
+            ],
+        },
+    },
+    "trailer": "뒤에 오는 값",
+}
+NODES = DOCUMENT["result"]["data"]["nodes"]
+
+
+def _encoded(ensure_ascii: bool) -> bytes:
+    return json.dumps(DOCUMENT, ensure_ascii=ensure_ascii, indent=1).encode()
+
+
+def _split(data: bytes, *cuts: int) -> list[bytes]:
+    bounds = [0, *cuts, len(data)]
+    return [data[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+@pytest.mark.parametrize("ensure_ascii", [False, True])
+def test_every_single_split_point(ensure_ascii):
+    # 멀티바이트 한글, 이스케이프, 잘린 숫자 등 어느 위치에서 끊겨도 결과가 같아야 함
+    data = _encoded(ensure_ascii)
+    for cut in range(len(data) + 1):
+        stream = JsonArrayStream(_split(data, cut), "result.data.nodes", capture=["resultType", "trailer"])
+        assert list(stream) == NODES, cut
+        assert stream.partial == {"resultType": "SUCCESS", "trailer": "뒤에 오는 값"}, cut
+
+
+def test_one_byte_chunks():
+    data = _encoded(False)
+    stream = JsonArrayStream((data[i:i + 1] for i in range(len(data))), "result.data.nodes",
+                             capture=["result.total"])
+    assert list(stream) == NODES
+    assert stream.partial == {"result": {"total": 3}}
+
+
+def test_elements_yielded_before_the_document_ends():
+    data = _encoded(False)
+    end = data.index(b'"location"')  # 세 번째 공고 도중에서 입력이 멈춘 상태
+    chunks = iter(_split(data, end))
+    stream = iter(JsonArrayStream(chunks, "result.data.nodes"))
+    assert [next(stream), next(stream)] == NODES[:2]
+
+
+def test_number_cut_at_chunk_end():
+    data = b'{"items": [12345, 2.5e-3, -0.75]}'
+    for cut in range(len(data) + 1):
+        assert list(JsonArrayStream(_split(data, cut), "items")) == [12345, 2.5e-3, -0.75], cut
+
+
+def test_array_index_path_and_utf8_bom():
+    data = "\ufeff".encode() + json.dumps({"pages": [{"jobs": ["a"]}, {"jobs": ["b", "c"]}]}).encode()
+    assert list(JsonArrayStream(_split(data, 1, 2), "pages.1.jobs")) == ["b", "c"]
+
+
+def test_missing_path_or_non_array_yields_nothing():
+    data = json.dumps(DOCUMENT).encode()
+    assert list(JsonArrayStream([data], "result.data.missing")) == []
+    assert list(JsonArrayStream([data], "result.total")) == []
+
+
+@pytest.mark.parametrize("data", [b'{"items": [1, 2', b'{"items": [1] } extra', b'{"items": [1,, 2]}'])
+def test_malformed_input_raises(data):
+    with pytest.raises(json.JSONDecodeError):
+        list(JsonArrayStream(_split(data, len(data) // 2), "items"))
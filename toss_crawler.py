@@ -1,93 +1,99 @@
 #!/usr/bin/env python3
 """Toss job crawler — fetches postings from toss.im career API and writes to Google Sheets."""
 
-from datetime import datetime
-
-import requests
-
-from base import CrawlerConfig, format_date_iso, run_crawler
-
-CONFIG = CrawlerConfig(
-    company_name="토스",
-    sheet_name="토스",
-    spreadsheet_env_var="TOSS_SPREADSHEET_ID",
-    job_id_field="id",
-)
-
-API_URL = "https://api-public.toss.im/api/v3/ipd-eggnog/career/jobs"
+from base import CrawlerConfig, Source, SourceSpec, equals, format_date_iso, one_of
 
 TARGET_EMPLOYMENT_TYPE = "정규직"
 TARGET_JOB_CATEGORIES = {"Sales", "Sales Support"}
 
+# Metadata fields the crawler reads, by the substring that identifies them.
+# Toss metadata names are verbose and occasionally change
+# (e.g. "Employment_Type_경력/신입" vs "Employment_Type"), so a name matches a
+# field when it contains the field's substring.
+METADATA_FIELDS = ("Employment_Type", "Job Category", "소속 자회사", "클로징 일자")
 
-def fetch_all_jobs() -> list[dict]:
-    """Fetch all job postings in a single request (no pagination).
+# Raw metadata name → the METADATA_FIELDS it matches; shared by every job
+_field_names: dict[str, tuple[str, ...]] = {}
 
-    The Toss API returns all jobs at once; pagination is not supported.
-    """
-    response = requests.get(API_URL, timeout=30)
-    response.raise_for_status()
-    data = response.json()
+# The last job indexed and its index (see metadata_index)
+_last_index: tuple[dict | None, dict[str, str | None]] = (None, {})
 
-    if data.get("resultType") != "SUCCESS":
-        raise ValueError(f"API 요청 실패: {data.get('error')}")
 
-    jobs = data.get("success", [])
-    print(f"총 {len(jobs)}건의 채용 공고 조회")
-    return jobs
+def _fields_for(name: str) -> tuple[str, ...]:
+    """Return the METADATA_FIELDS that *name* matches, memoized across jobs."""
+    fields = _field_names.get(name)
+    if fields is None:
+        fields = _field_names[name] = tuple(field for field in METADATA_FIELDS if field in name)
+    return fields
 
 
-def get_metadata_value(job: dict, field_name: str) -> str | None:
-    """Extract a value from the job's metadata list by partial name match.
+def metadata_index(job: dict) -> dict[str, str | None]:
+    """Resolve the job's metadata list into {METADATA_FIELDS name: value} in one pass.
 
-    Toss metadata names are verbose and occasionally change
-    (e.g. "Employment_Type_경력/신입" vs "Employment_Type"). Substring matching
-    ('field_name in name') avoids breakage when suffixes change, at the cost of
-    potential false matches — acceptable given the small, known set of field names.
+    As with a linear scan, the first matching entry wins for each field.
+    The filter and job_to_row() see each job back to back, so the index of
+    the last job is kept aside (by identity) for them to share; the job dict
+    itself is left untouched, since it is hashed into the fingerprint.
     """
+    global _last_index
+    last_job, index = _last_index
+    if last_job is job:
+        return index
+    index = {}
     for meta in job.get("metadata", []):
-        if field_name in meta.get("name", ""):
-            return meta.get("value")
-    return None
-
-
-def filter_jobs(jobs: list[dict]) -> list[dict]:
-    """Keep only 정규직 postings in Sales / Sales Support categories."""
-    filtered = []
-    for job in jobs:
-        employment_type = get_metadata_value(job, "Employment_Type")
-        job_category = get_metadata_value(job, "Job Category")
-
-        if employment_type == TARGET_EMPLOYMENT_TYPE and job_category in TARGET_JOB_CATEGORIES:
-            filtered.append(job)
-
-    print(f"필터링 후 {len(filtered)}건 (정규직 + {TARGET_JOB_CATEGORIES})")
-    return filtered
-
-
-def job_to_row(job: dict) -> list[str]:
-    """Convert a Toss job dict to a 10-column spreadsheet row.
+        for field in _fields_for(meta.get("name", "")):
+            if field not in index:
+                index[field] = meta.get("value")
+    _last_index = (job, index)
+    return index
+
+
+def metadata(field_name: str):
+    """Field getter for a METADATA_FIELDS entry, read from the job's metadata_index()."""
+    return lambda job: metadata_index(job).get(field_name) or ""
+
+
+def closing_date(job: dict) -> str:
+    """마감일: '클로징 일자' as YYYY-MM-DD, or 상시채용 when the posting has none."""
+    value = metadata_index(job).get("클로징 일자")
+    return format_date_iso(value) if value else "상시채용"
+
+
+SPEC = SourceSpec(
+    config=CrawlerConfig(
+        company_name="토스",
+        sheet_name="토스",
+        spreadsheet_env_var="TOSS_SPREADSHEET_ID",
+        job_id_field="id",
+    ),
+    # 전체 공고를 한 번에 반환 (페이지네이션 미지원)
+    url="https://api-public.toss.im/api/v3/ipd-eggnog/career/jobs",
+    success=("resultType", "SUCCESS"),
+    error_path="error",
+    jobs_path="success",
+    # 공고마다 긴 metadata 배열이 붙은 전체 목록 — 응답을 읽으면서 공고 단위로 파싱
+    stream=True,
+    fields={
+        # 자회사(토스뱅크, 토스증권 등)가 모회사명보다 유용하므로 '소속 자회사' 우선
+        "company": lambda job: metadata_index(job).get("소속 자회사") or job.get("company_name", ""),
+        "title": "title",
+        "reg_date": lambda job: format_date_iso(job.get("first_published")),
+        "end_date": closing_date,
+        "url": "absolute_url",
+        "category": metadata("Job Category"),
+        "location": "location.name",
+        "employment_type": metadata("Employment_Type"),
+        "job_id": "id",
+    },
+    # 전체 공고가 내려오므로 클라이언트에서 필터링
+    filters=(
+        equals(metadata("Employment_Type"), TARGET_EMPLOYMENT_TYPE),
+        one_of(metadata("Job Category"), TARGET_JOB_CATEGORIES),
+    ),
+)
 
-    Uses '소속 자회사' (subsidiary) for company name when available,
-    since Toss has multiple subsidiaries (토스뱅크, 토스증권, etc.)
-    and the subsidiary is more informative than the parent company name.
-    """
-    closing_date = get_metadata_value(job, "클로징 일자")
-    subsidiary = get_metadata_value(job, "소속 자회사")
-
-    return [
-        subsidiary or job.get("company_name", ""),
-        job.get("title", ""),
-        format_date_iso(job.get("first_published")),
-        format_date_iso(closing_date) if closing_date else "상시채용",
-        job.get("absolute_url", ""),
-        get_metadata_value(job, "Job Category") or "",
-        job.get("location", {}).get("name", ""),
-        get_metadata_value(job, "Employment_Type") or "",
-        str(job.get("id", "")),
-        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-    ]
+SOURCE = Source(SPEC)
 
 
 if __name__ == "__main__":
-    run_crawler(CONFIG, fetch_all_jobs, job_to_row, filter_fn=filter_jobs)
+    SOURCE.run()